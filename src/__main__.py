@@ -0,0 +1,7 @@
+"""Allow ``python -m src`` to run the headless admission CLI."""
+
+import sys
+
+from src.cli import main
+
+sys.exit(main())
@@ -1,9 +1,42 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Dict
 
-from src.core.admission import assign_admissions
+import numpy as np
+import pandas as pd
+
+from src.core.incremental import IncrementalAdmission
 from src.core.preferences import PREFERENCE_MAPPING
+from src.core.student_table import StudentTable
+from src.core.vectorized import encode_table
+
+
+def _frame_table(frame):
+    """StudentTable over the columns the engine reads, without copying numeric data.
+
+    志愿选择 is factorized by pandas, so only its distinct values are normalised.
+    """
+    table = StudentTable(len(frame))
+    table.set_column("排名", frame["排名"].to_numpy())
+    if "志愿选择" in frame:
+        codes, uniques = pd.factorize(frame["志愿选择"], use_na_sentinel=False)
+        table.set_categorical("志愿选择", codes, list(uniques))
+    return table
+
+
+def _frame_inputs(frame):
+    """Copies of the columns the engine reads, to detect in-place edits later."""
+    choices = frame["志愿选择"].copy() if "志愿选择" in frame else None
+    return frame["排名"].to_numpy().copy(), choices
+
+
+def _same_inputs(frame, inputs):
+    ranks, choices = inputs
+    if len(frame) != ranks.shape[0] or ("志愿选择" in frame) != (choices is not None):
+        return False
+    if not np.array_equal(frame["排名"].to_numpy(), ranks):
+        return False
+    return choices is None or frame["志愿选择"].equals(choices)
 
 
 class AdmissionAlgorithm:
@@ -13,6 +46,13 @@ class AdmissionAlgorithm:
     def __init__(self, quotas):
         self.quotas = quotas.copy()
         self.remaining_quotas = quotas.copy()
+        # AdmissionMetrics of the last run, computed on first access.
+        self._metrics = None
+        # Cohort cache for incremental re-runs on the same DataFrame object,
+        # valid while its 排名 and 志愿选择 match the copies in _cohort_inputs.
+        self._cohort_frame = None
+        self._cohort_inputs = None
+        self._engine = None
     
     def process_admissions(self, student_data):
         """
@@ -25,28 +65,84 @@ class AdmissionAlgorithm:
         Returns:
             pd.DataFrame: DataFrame with admission results
         """
-        # Ranking: smaller is better.
-        sorted_students = student_data.sort_values("排名")
-        rows = sorted_students.to_dict(orient="records")
-        quotas: Dict[str, int] = {k: int(v) for k, v in self.remaining_quotas.items()}
-        result = assign_admissions(
-            rows,
-            quotas,
-            PREFERENCE_MAPPING,
-            score_key="排名",
-            sort_desc=False,
-            choice_key="志愿选择",
-        )
-
-        self.remaining_quotas = result.remaining_quotas.copy()
-
-        try:
-            import pandas as pd  # type: ignore
-
-            return pd.DataFrame(result.students)
-        except Exception:
-            # Fallback: preserve a useful structure even without pandas.
-            return result.students
+        outcome = self._run(student_data, self.remaining_quotas)
+        frame = student_data.take(self._engine.cohort.order).reset_index(drop=True)
+        frame["录取专业"] = outcome.labels()
+        return frame
+
+    def assign_column(self, student_data, categorical=True):
+        """
+        Admission labels for ``student_data`` as a column in its own row order.
+
+        The frame is neither sorted nor copied: ``df["录取专业"] = algo.assign_column(df)``.
+        Unlike ``process_admissions``, every call admits against the full
+        ``quotas`` (see ``set_quotas``), so repeated calls return the same labels;
+        ``remaining_quotas`` only reports the seats the last call left.
+        Repeated calls on the same frame only replay what a quota change affects;
+        in-place edits to its 排名 or 志愿选择 make the next call re-encode it.
+
+        Returns:
+            pd.Series: indexed like ``student_data``; categorical unless
+            ``categorical=False``.
+        """
+        outcome = self._run(student_data, self.quotas)
+        cohort = self._engine.cohort
+        codes = np.empty(len(cohort), dtype=np.int16)
+        codes[cohort.order] = outcome.assigned + 2
+        categories = outcome.label_categories()
+        if categorical:
+            values = pd.Categorical.from_codes(codes, categories)
+        else:
+            values = np.array(categories, dtype=object)[codes]
+        return pd.Series(values, index=student_data.index, name="录取专业")
+
+    def _run(self, student_data, seats):
+        """Admit ``student_data`` under ``seats``; returns the EncodedOutcome."""
+        quotas: Dict[str, int] = {k: int(v) for k, v in seats.items()}
+
+        if (
+            self._engine is None
+            or student_data is not self._cohort_frame
+            or not _same_inputs(student_data, self._cohort_inputs)
+        ):
+            # Ranking: smaller is better; ties keep the frame's row order.
+            cohort = encode_table(
+                _frame_table(student_data),
+                PREFERENCE_MAPPING,
+                score_key="排名",
+                sort_desc=False,
+                choice_key="志愿选择",
+            )
+            self._engine = IncrementalAdmission(cohort, quotas)
+            self._cohort_frame = student_data
+            self._cohort_inputs = _frame_inputs(student_data)
+        else:
+            # Same cohort: only students from the first quota-sensitive
+            # decision onwards are replayed.
+            self._engine.update_quotas(quotas)
+
+        outcome = self._engine.outcome
+        self.remaining_quotas = outcome.remaining_quotas.copy()
+        self._metrics = None
+        return outcome
+
+    @property
+    def metrics(self):
+        """AdmissionMetrics of the last run (None before the first)."""
+        if self._metrics is None and self._engine is not None:
+            self._metrics = self._engine.metrics
+        return self._metrics
+    
+    def set_quotas(self, quotas):
+        """Replace the quotas; re-running the same cohort replays only what changed."""
+        self.quotas = quotas.copy()
+        self.remaining_quotas = quotas.copy()
+    
+    def reset_cohort(self):
+        """Drop the cached cohort (edits to 排名 or 志愿选择 are detected anyway)."""
+        self._cohort_frame = None
+        self._cohort_inputs = None
+        self._engine = None
     
     def get_remaining_quotas(self):
         """Return the remaining quotas for each major."""
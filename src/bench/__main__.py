@@ -0,0 +1,7 @@
+"""Allow ``python -m src.bench`` to run the benchmark suite."""
+
+import sys
+
+from src.bench.suite import main
+
+sys.exit(main())
@@ -0,0 +1,405 @@
+"""
+Admission benchmark suite.
+
+Times each stage of an intake on synthetic cohorts (see
+:mod:`src.bench.synthetic`) at several sizes: ordering by rank with the
+GUI's tie-breakers, the pure-Python ``assign_admissions`` and the array
+engine on a ``StudentTable`` (``assign_table``) or through
+``encode_table`` + ``assign_encoded`` (``assign_encoded``),
+``AdmissionAlgorithm.process_admissions`` and ``assign_column`` on a
+DataFrame, each importer, the exporters and populating the results table.
+Every stage reports the best of ``repeat`` runs; setup (generating and
+writing input files) is not timed. Alongside the table, the run reports how
+many times faster than ``assign_admissions`` each array-engine stage was.
+
+Results are stored in a JSON baseline. A later run is compared against it
+and fails when any stage got slower than ``threshold`` times its baseline,
+so a release can be checked before intake week::
+
+    python -m src.bench --sizes 1000,10000,100000 --baseline bench_baseline.json --update
+    python -m src.bench --sizes 1000,10000,100000 --baseline bench_baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, replace
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from src.bench.synthetic import CohortProfile, cohort_quotas, generate_cohort, write_cohort
+from src.core.preferences import PREFERENCE_MAPPING
+from src.core.schema import EXPORT_HEADERS
+
+BASELINE_FORMAT = 1
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+STAGES = (
+    "sort",
+    "assign_admissions",
+    "assign_table",
+    "assign_encoded",
+    "process_admissions",
+    "assign_column",
+    "import_csv",
+    "import_xlsx",
+    "import_xls",
+    "export_csv",
+    "export_xlsx",
+    "results_table",
+)
+# Stages reported as a speedup over the pure-Python engine.
+SPEEDUP_REFERENCE = "assign_admissions"
+SPEEDUP_STAGES = ("assign_table", "assign_encoded")
+# Format limits: an .xls sheet holds at most 65536 rows including the header.
+STAGE_MAX_ROWS = {"import_xls": 65_535}
+# Stages faster than this are compared against the floor instead, so timer
+# noise on tiny inputs does not fail the run.
+MIN_SECONDS = 0.005
+
+# stage -> {rows (as a string, for JSON): best seconds}
+Results = Dict[str, Dict[str, float]]
+
+
+class _Workload:
+    """Inputs for one cohort size, built lazily and shared by the stages."""
+
+    def __init__(self, profile: CohortProfile, workdir: str) -> None:
+        self.profile = profile
+        self.workdir = workdir
+        self.quotas = cohort_quotas(profile)
+        self.table = generate_cohort(profile)
+        self._cache: Dict[str, Any] = {}
+
+    def _get(self, key: str, build: Callable[[], Any]) -> Any:
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
+
+    def input_file(self, ext: str) -> str:
+        def build() -> str:
+            path = os.path.join(self.workdir, f"cohort-{self.profile.n}{ext}")
+            write_cohort(self.table, path)
+            return path
+
+        return self._get(ext, build)
+
+    @property
+    def records(self) -> List[Dict[str, Any]]:
+        return self._get("records", self.table.to_records)
+
+    @property
+    def frame(self) -> Any:
+        def build() -> Any:
+            import pandas as pd
+
+            return pd.DataFrame({c: self.table.column(c) for c in self.table.columns})
+
+        return self._get("frame", build)
+
+    @property
+    def results(self) -> Any:
+        """Admitted cohort with 录取专业, as the GUI and exporters receive it."""
+        from src.core.vectorized import assign_admissions_vectorized
+
+        return self._get(
+            "results",
+            lambda: assign_admissions_vectorized(
+                self.table, self.quotas, PREFERENCE_MAPPING, score_key="排名", sort_desc=False
+            ).students,
+        )
+
+
+# Each stage turns a workload into the zero-argument call that is timed.
+
+
+def _sort(w: _Workload) -> Callable[[], Any]:
+    from src.core.admission import TIE_BREAK_KEYS
+    from src.core.sort_keys import prepare_sort_keys
+
+    table = w.table
+    return lambda: prepare_sort_keys(table, score_key="排名", sort_desc=False, tie_break=TIE_BREAK_KEYS).order()
+
+
+def _assign_admissions(w: _Workload) -> Callable[[], Any]:
+    from src.core.admission import assign_admissions
+
+    records = w.records
+    return lambda: assign_admissions(records, w.quotas, PREFERENCE_MAPPING, score_key="排名", sort_desc=False)
+
+
+def _assign_table(w: _Workload) -> Callable[[], Any]:
+    from src.core.vectorized import assign_admissions_vectorized
+
+    table = w.table
+    return lambda: assign_admissions_vectorized(table, w.quotas, PREFERENCE_MAPPING, score_key="排名", sort_desc=False)
+
+
+def _assign_encoded(w: _Workload) -> Callable[[], Any]:
+    from src.core.vectorized import assign_encoded, encode_table
+
+    table = w.table
+
+    def run() -> Any:
+        cohort = encode_table(table, PREFERENCE_MAPPING, score_key="排名", sort_desc=False)
+        return assign_encoded(cohort, w.quotas).labels()
+
+    return run
+
+
+def _process_admissions(w: _Workload) -> Callable[[], Any]:
+    from src.admission_algorithm import AdmissionAlgorithm
+
+    frame = w.frame
+    # A fresh instance each time: re-running on the same frame is incremental.
+    return lambda: AdmissionAlgorithm(w.quotas).process_admissions(frame)
+
+
+def _assign_column(w: _Workload) -> Callable[[], Any]:
+    from src.admission_algorithm import AdmissionAlgorithm
+
+    frame = w.frame
+    return lambda: AdmissionAlgorithm(w.quotas).assign_column(frame)
+
+
+def _importer(ext: str) -> Callable[[_Workload], Callable[[], Any]]:
+    def stage(w: _Workload) -> Callable[[], Any]:
+        from src.utils.student_io import read_students
+
+        path = w.input_file(ext)
+        # Parse every time; the import cache would turn this into a cache read.
+        return lambda: read_students(path)
+
+    return stage
+
+
+def _exporter(ext: str) -> Callable[[_Workload], Callable[[], Any]]:
+    def stage(w: _Workload) -> Callable[[], Any]:
+        from src.utils.student_io import export_results
+
+        results = w.results
+        path = os.path.join(w.workdir, f"results-{w.profile.n}{ext}")
+        return lambda: export_results(results, path)
+
+    return stage
+
+
+def _results_table(w: _Workload) -> Callable[[], Any]:
+    from src.gui.virtual_table import TableModel
+
+    results = w.results
+    n = len(results)
+
+    def populate() -> None:
+        # What the results view does after an admission: load, re-apply the
+        # sort, render the first window, then jump to the middle.
+        model = TableModel(EXPORT_HEADERS)
+        model.sort("分数", descending=True)
+        model.set_table(results)
+        model.rows(0, 40)
+        model.rows(n // 2, n // 2 + 40)
+
+    return populate
+
+
+_STAGE_SETUP: Dict[str, Callable[[_Workload], Callable[[], Any]]] = {
+    "sort": _sort,
+    "assign_admissions": _assign_admissions,
+    "assign_table": _assign_table,
+    "assign_encoded": _assign_encoded,
+    "process_admissions": _process_admissions,
+    "assign_column": _assign_column,
+    "import_csv": _importer(".csv"),
+    "import_xlsx": _importer(".xlsx"),
+    "import_xls": _importer(".xls"),
+    "export_csv": _exporter(".csv"),
+    "export_xlsx": _exporter(".xlsx"),
+    "results_table": _results_table,
+}
+
+
+def _best_of(func: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def run_suite(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    *,
+    profile: CohortProfile = CohortProfile(),
+    stages: Sequence[str] = STAGES,
+    repeat: int = 3,
+    progress: Optional[Callable[[str, int, float], None]] = None,
+) -> Results:
+    """Time ``stages`` on a cohort of each size; ``progress(stage, rows, seconds)`` per result."""
+    unknown = [s for s in stages if s not in _STAGE_SETUP]
+    if unknown:
+        raise ValueError(f"unknown stage(s): {', '.join(unknown)}")
+    results: Results = {stage: {} for stage in stages}
+    with tempfile.TemporaryDirectory(prefix="admission-bench-") as workdir:
+        for n in sizes:
+            workload = _Workload(replace(profile, n=n), workdir)
+            for stage in stages:
+                if n > STAGE_MAX_ROWS.get(stage, n):
+                    continue
+                seconds = _best_of(_STAGE_SETUP[stage](workload), repeat)
+                results[stage][str(n)] = seconds
+                if progress is not None:
+                    progress(stage, n, seconds)
+    return results
+
+
+def speedups(results: Results, reference: str = SPEEDUP_REFERENCE) -> Dict[str, Dict[str, float]]:
+    """``reference`` seconds / stage seconds for each of ``SPEEDUP_STAGES`` timed at the same size."""
+    before = results.get(reference, {})
+    return {
+        stage: {rows: before[rows] / seconds for rows, seconds in results[stage].items() if rows in before}
+        for stage in SPEEDUP_STAGES
+        if stage in results
+    }
+
+
+# ---------------------------------------------------------------- baseline
+
+
+@dataclass(frozen=True)
+class Regression:
+    stage: str
+    rows: int
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / max(self.baseline, MIN_SECONDS)
+
+
+def compare(current: Results, baseline: Results, threshold: float = 1.5) -> List[Regression]:
+    """Stages/sizes present in both runs that got slower than ``threshold`` x baseline."""
+    regressions: List[Regression] = []
+    for stage, timings in current.items():
+        for rows, seconds in timings.items():
+            before = baseline.get(stage, {}).get(rows)
+            if before is None:
+                continue
+            regression = Regression(stage, int(rows), before, seconds)
+            if seconds > MIN_SECONDS and regression.ratio > threshold:
+                regressions.append(regression)
+    return regressions
+
+
+def save_baseline(path: str, results: Results, profile: CohortProfile, repeat: int) -> None:
+    data = {
+        "format": BASELINE_FORMAT,
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "profile": asdict(profile),
+        "repeat": repeat,
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("format") != BASELINE_FORMAT:
+        raise ValueError(f"unsupported baseline format in {path}: {data.get('format')!r}")
+    return data
+
+
+def format_results(results: Results, baseline: Optional[Results] = None) -> str:
+    """Plain-text table: one row per stage, one column per size (with ratio to baseline)."""
+    sizes = sorted({int(rows) for timings in results.values() for rows in timings})
+    lines = [f"{'stage':<20}" + "".join(f"{n:>20,}" for n in sizes)]
+    for stage, timings in results.items():
+        cells = []
+        for n in sizes:
+            seconds = timings.get(str(n))
+            if seconds is None:
+                cells.append(f"{'-':>20}")
+                continue
+            cell = f"{seconds * 1000:.1f} ms"
+            before = (baseline or {}).get(stage, {}).get(str(n))
+            if before is not None:
+                cell += f" ({seconds / max(before, MIN_SECONDS):.2f}x)"
+            cells.append(f"{cell:>20}")
+        lines.append(f"{stage:<20}" + "".join(cells))
+    return "\n".join(lines)
+
+
+def _parse_list(text: str, convert: Callable[[str], Any]) -> List[Any]:
+    return [convert(part) for part in text.split(",") if part.strip()]
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.bench", description="录取流程性能基准测试")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="学生人数，逗号分隔（默认 1000,10000,100000；最多可到 1000000）")
+    parser.add_argument("--stages", default=",".join(STAGES), help="要测试的阶段，逗号分隔")
+    parser.add_argument("--repeat", type=int, default=3, help="每个阶段重复次数，取最快一次（默认3）")
+    parser.add_argument("--baseline", default="bench_baseline.json", help="基线 JSON 文件")
+    parser.add_argument("--update", action="store_true", help="把本次结果写为新的基线")
+    parser.add_argument("--threshold", type=float, default=1.5,
+                        help="慢于基线的倍数超过此值即判为退化（默认1.5）")
+    parser.add_argument("--seed", type=int, default=0, help="生成数据的随机种子")
+    parser.add_argument("--choice-skew", type=float, default=CohortProfile.choice_skew, help="志愿代码分布偏斜（Zipf 指数）")
+    parser.add_argument("--tie-rate", type=float, default=CohortProfile.tie_rate, help="与上一名并列排名的比例")
+    parser.add_argument("--invalid-rate", type=float, default=CohortProfile.invalid_rate, help="无效志愿代码比例")
+    parser.add_argument("--blank-rate", type=float, default=CohortProfile.blank_rate, help="未填志愿比例")
+    parser.add_argument("--tightness", type=float, default=CohortProfile.tightness, help="总名额与人数之比")
+    args = parser.parse_args(argv)
+
+    profile = CohortProfile(
+        choice_skew=args.choice_skew,
+        tie_rate=args.tie_rate,
+        invalid_rate=args.invalid_rate,
+        blank_rate=args.blank_rate,
+        tightness=args.tightness,
+        seed=args.seed,
+    )
+    baseline = None
+    if not args.update and os.path.exists(args.baseline):
+        data = load_baseline(args.baseline)
+        if data["profile"] != asdict(replace(profile, n=data["profile"]["n"])):
+            print(f"警告: 基线使用的数据分布不同: {data['profile']}", file=sys.stderr)
+        baseline = data["results"]
+
+    def progress(stage: str, rows: int, seconds: float) -> None:
+        print(f"{stage:<20} {rows:>10,} rows {seconds * 1000:>10.1f} ms", file=sys.stderr)
+
+    try:
+        results = run_suite(
+            _parse_list(args.sizes, lambda s: int(float(s))),
+            profile=profile,
+            stages=_parse_list(args.stages, str.strip),
+            repeat=args.repeat,
+            progress=progress,
+        )
+    except ValueError as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 2
+    print(format_results(results, baseline))
+    for stage, ratios in speedups(results).items():
+        for rows, ratio in ratios.items():
+            print(f"{stage} 比 {SPEEDUP_REFERENCE} 快 {ratio:.1f} 倍（{int(rows):,} 人）")
+
+    if baseline is None:
+        save_baseline(args.baseline, results, profile, args.repeat)
+        print(f"基线已写入 {args.baseline}")
+        return 0
+    regressions = compare(results, baseline, args.threshold)
+    for r in regressions:
+        print(f"退化: {r.stage} @ {r.rows:,} 行：{r.baseline * 1000:.1f} ms -> {r.current * 1000:.1f} ms "
+              f"({r.ratio:.2f}x)", file=sys.stderr)
+    return 1 if regressions else 0
@@ -0,0 +1,119 @@
+"""
+Synthetic cohorts for benchmarks.
+
+A :class:`CohortProfile` describes the shape of an intake rather than its
+contents: how skewed the choice codes are, how many students share a rank,
+how many codes are invalid or blank, and how tight the quotas are. The same
+profile and seed always give the same cohort, so timings from different
+releases are comparable.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Mapping
+
+import numpy as np
+
+from src.core.preferences import PREFERENCE_MAPPING
+from src.core.schema import STUDENT_COLUMNS
+from src.core.student_table import StudentTable
+
+# Codes that no preference table defines.
+INVALID_CODES = ("Z", "G", "AB")
+
+
+@dataclass(frozen=True)
+class CohortProfile:
+    n: int = 1000
+    # Zipf exponent over the choice codes in mapping order; 0 is uniform.
+    choice_skew: float = 1.0
+    # Fraction of students sharing the rank (and score) of the one above.
+    tie_rate: float = 0.05
+    invalid_rate: float = 0.01
+    blank_rate: float = 0.02
+    # Total seats per applicant; below 1 the cohort is oversubscribed.
+    tightness: float = 0.9
+    seed: int = 0
+
+
+def _majors(preference_mapping: Mapping[str, List[str]]) -> List[str]:
+    majors: Dict[str, None] = {}
+    for prefs in preference_mapping.values():
+        majors.update(dict.fromkeys(prefs))
+    return list(majors)
+
+
+def cohort_quotas(
+    profile: CohortProfile, preference_mapping: Mapping[str, List[str]] = PREFERENCE_MAPPING
+) -> Dict[str, int]:
+    """``tightness * n`` seats split evenly over the majors (remainder to the first)."""
+    majors = _majors(preference_mapping)
+    seats = int(round(profile.tightness * profile.n))
+    share, extra = divmod(seats, len(majors))
+    return {m: share + (extra if i == 0 else 0) for i, m in enumerate(majors)}
+
+
+def generate_cohort(
+    profile: CohortProfile, preference_mapping: Mapping[str, List[str]] = PREFERENCE_MAPPING
+) -> StudentTable:
+    """Student table in the importers' layout (``STUDENT_COLUMNS``), rows in file order."""
+    rng = np.random.default_rng(profile.seed)
+    n = profile.n
+
+    # Competition ranking: a tied student takes the rank of the group's first member.
+    position = np.arange(n, dtype=np.int64)
+    tied = rng.random(n) < profile.tie_rate
+    if n:
+        tied[0] = False
+    rank = np.maximum.accumulate(np.where(tied, 0, position)) + 1
+    score = np.round(100.0 - 40.0 * (rank - 1) / max(n, 1), 2)
+
+    codes = list(preference_mapping)
+    weights = 1.0 / np.arange(1, len(codes) + 1) ** profile.choice_skew
+    categories = codes + list(INVALID_CODES) + [""]
+    choice = rng.choice(len(codes), size=n, p=weights / weights.sum()).astype(np.int32)
+    roll = rng.random(n)
+    invalid = roll < profile.invalid_rate
+    choice[invalid] = len(codes) + rng.integers(0, len(INVALID_CODES), int(invalid.sum()))
+    choice[(roll >= profile.invalid_rate) & (roll < profile.invalid_rate + profile.blank_rate)] = len(categories) - 1
+
+    # Files are rarely sorted by rank.
+    shuffle = rng.permutation(n)
+    ids = np.char.add(f"B{profile.seed:02d}", np.char.zfill(np.arange(1, n + 1).astype(str), 7))
+    table = StudentTable(n)
+    table.set_column("序号", position + 1)
+    table.set_column("排名", rank[shuffle])
+    table.set_column("学号", ids.astype(object))
+    table.set_column("姓名", np.char.add("学生", (position + 1).astype(str)).astype(object))
+    table.set_column("分数", score[shuffle])
+    table.set_categorical("志愿选择", choice[shuffle], categories)
+    table.set_categorical("专业", np.zeros(n, dtype=np.int32), ["电子信息类"])
+    return table
+
+
+def write_cohort(table: StudentTable, path: str) -> None:
+    """Write a generated cohort as .csv, .xlsx or .xls input for the importers."""
+    from src.utils.student_io import write_rows_csv, write_rows_xlsx
+
+    rows = table.iter_tuples(STUDENT_COLUMNS)
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            write_rows_csv(rows, f, headers=STUDENT_COLUMNS)
+    elif ext == ".xlsx":
+        write_rows_xlsx(rows, path, headers=STUDENT_COLUMNS, sheet_title="学生名单")
+    elif ext == ".xls":
+        import xlwt
+
+        wb = xlwt.Workbook()
+        ws = wb.add_sheet("学生名单")
+        for col, header in enumerate(STUDENT_COLUMNS):
+            ws.write(0, col, header)
+        for r, row in enumerate(rows, 1):
+            for col, value in enumerate(row):
+                ws.write(r, col, value)
+        wb.save(path)
+    else:
+        raise ValueError(f"unsupported cohort format: {ext or path}")
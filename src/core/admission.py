@@ -8,17 +8,120 @@ tests, and any future CLI/API.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Mapping, Optional
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
-
-@dataclass(frozen=True)
-class AdmissionResult:
-    students: List[Dict[str, Any]]
-    remaining_quotas: Dict[str, int]
+from src.core.preferences import OpenMajors
+from src.core.spans import span
 
 ADJUST_SUFFIX = "(调剂)"
 INVALID_CHOICE_LABEL = "无效志愿"
 UNASSIGNED_LABEL = "未分配"
+ADJUST_ROUND = "调剂"
+# Tie-break columns compared as text rather than parsed as numbers.
+TEXT_SORT_KEYS: Tuple[str, ...] = ("学号",)
+# Default tie-break (column, descending): better rank first, then higher
+# score, then smaller 学号.
+TIE_BREAK_KEYS: Tuple[Tuple[str, bool], ...] = (("排名", False), ("分数", True), ("学号", False))
+
+_NUMERALS = "一二三四五六七八九十"
+
+
+def round_names(n_preferences: int) -> Tuple[str, ...]:
+    """Names of the admission rounds: one per preference position, then adjustment."""
+    names = [
+        f"第{_NUMERALS[i]}志愿" if i < len(_NUMERALS) else f"第{i + 1}志愿"
+        for i in range(n_preferences)
+    ]
+    return tuple(names) + (ADJUST_ROUND,)
+
+
+@dataclass(frozen=True)
+class AdmissionMetrics:
+    """
+    Per-major outcome counts, filled in by the engine while it assigns.
+
+    ``counts[major]`` and ``cutoffs[major]`` are indexed like ``rounds``. A
+    cutoff is the sort-key value (rank or score, whichever the run sorted by)
+    of the last student admitted into that major in that round, or None.
+    """
+
+    rounds: Tuple[str, ...]
+    counts: Dict[str, Tuple[int, ...]]
+    cutoffs: Dict[str, Tuple[Optional[float], ...]]
+    invalid: int = 0
+    unassigned: int = 0
+
+    def admitted_to(self, major: str) -> int:
+        return sum(self.counts.get(major, ()))
+
+    def adjusted_to(self, major: str) -> int:
+        counts = self.counts.get(major)
+        return counts[-1] if counts else 0
+
+    @property
+    def admitted(self) -> int:
+        return sum(sum(c) for c in self.counts.values())
+
+    @property
+    def adjusted(self) -> int:
+        return sum(c[-1] for c in self.counts.values())
+
+    @property
+    def total(self) -> int:
+        return self.admitted + self.invalid + self.unassigned
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly form used by the CLI summary and reports."""
+        return {
+            "total": self.total,
+            "admitted": self.admitted,
+            "adjusted": self.adjusted,
+            "unassigned": self.unassigned,
+            "invalid": self.invalid,
+            "majors": {
+                major: {
+                    "counts": dict(zip(self.rounds, counts)),
+                    "cutoffs": dict(zip(self.rounds, self.cutoffs[major])),
+                }
+                for major, counts in self.counts.items()
+            },
+        }
+
+
+class MetricsCollector:
+    """Accumulates :class:`AdmissionMetrics` as students are decided in rank order."""
+
+    def __init__(self, majors: Iterable[str], preference_mapping: Mapping[str, List[str]]) -> None:
+        n_pref = max((len(p) for p in preference_mapping.values()), default=0)
+        self.rounds = round_names(n_pref)
+        self.counts: Dict[str, List[int]] = {m: [0] * len(self.rounds) for m in majors}
+        self.cutoffs: Dict[str, List[Optional[float]]] = {
+            m: [None] * len(self.rounds) for m in self.counts
+        }
+        self.invalid = 0
+        self.unassigned = 0
+
+    def admit(self, major: str, round_index: int, key: float) -> None:
+        self.counts[major][round_index] += 1
+        # Students arrive in rank order, so the latest one sets the cutoff.
+        self.cutoffs[major][round_index] = key
+
+    def build(self) -> AdmissionMetrics:
+        return AdmissionMetrics(
+            rounds=self.rounds,
+            counts={m: tuple(c) for m, c in self.counts.items()},
+            cutoffs={m: tuple(c) for m, c in self.cutoffs.items()},
+            invalid=self.invalid,
+            unassigned=self.unassigned,
+        )
+
+
+@dataclass(frozen=True)
+class AdmissionResult:
+    # Sorted, assigned records: a list of dicts, or a StudentTable from the array engine.
+    students: Sequence[Mapping[str, Any]]
+    remaining_quotas: Dict[str, int]
+    metrics: Optional[AdmissionMetrics] = None
 
 
 def _norm_choice(value: Any) -> str:
@@ -27,6 +130,82 @@ def _norm_choice(value: Any) -> str:
     return str(value).strip().upper()
 
 
+def _parse_score(value: Any) -> float:
+    try:
+        return float(value)
+    except Exception:
+        return 0.0
+
+
+def _key_text(value: Any) -> str:
+    """Text form of an ID used as a sort key (Excel's 1001.0 compares as "1001")."""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _decide(
+    raw_choice: Any,
+    open_majors: OpenMajors,
+    preference_mapping: Mapping[str, List[str]],
+    *,
+    adjust_suffix: str,
+    invalid_choice_label: str,
+    unassigned_label: str,
+    metrics: Optional[MetricsCollector] = None,
+    key: float = 0.0,
+) -> str:
+    """Assign one student (in rank order), consuming a seat from ``open_majors``."""
+    choice = _norm_choice(raw_choice)
+
+    # Distinguish between "blank choice" and "invalid code".
+    # Blank: treat as no preferences, but still eligible for adjustment.
+    # Invalid: mark explicitly.
+    if choice and choice not in preference_mapping:
+        if metrics is not None:
+            metrics.invalid += 1
+        return invalid_choice_label
+
+    if choice:
+        for i, major in enumerate(preference_mapping[choice]):
+            if open_majors.is_open(major):
+                open_majors.take(major)
+                if metrics is not None:
+                    metrics.admit(major, i, key)
+                return major
+
+    # Adjustment: first major (in quota order) with a remaining slot.
+    major = open_majors.first_open()
+    if major is None:
+        if metrics is not None:
+            metrics.unassigned += 1
+        return unassigned_label
+    open_majors.take(major)
+    if metrics is not None:
+        metrics.admit(major, len(metrics.rounds) - 1, key)
+    return f"{major}{adjust_suffix}"
+
+
+def _label_when_full(
+    raw_choice: Any,
+    preference_mapping: Mapping[str, List[str]],
+    invalid_choice_label: str,
+    unassigned_label: str,
+    metrics: Optional[MetricsCollector] = None,
+) -> str:
+    """Outcome for a student ranked after every quota has been exhausted."""
+    choice = _norm_choice(raw_choice)
+    if choice and choice not in preference_mapping:
+        if metrics is not None:
+            metrics.invalid += 1
+        return invalid_choice_label
+    if metrics is not None:
+        metrics.unassigned += 1
+    return unassigned_label
+
+
 def assign_admissions(
     students: Iterable[Mapping[str, Any]],
     quotas: Mapping[str, int],
@@ -39,15 +218,22 @@ def assign_admissions(
     adjust_suffix: str = ADJUST_SUFFIX,
     invalid_choice_label: str = INVALID_CHOICE_LABEL,
     unassigned_label: str = UNASSIGNED_LABEL,
+    tie_break: Sequence[Tuple[str, bool]] = (),
 ) -> AdmissionResult:
     """
     Assign admissions for students sorted by score (descending).
 
+    Students with equal ``score_key`` are ordered by the ``tie_break`` keys
+    (``(column, descending)`` pairs, e.g. ``TIE_BREAK_KEYS``)
+    and then by input order.
+
     Rules:
     - If choice code invalid => 标记为 invalid_choice_label
     - Else try 1st/2nd/3rd preference in order; assign first with remaining quota
     - Else try adjustment into any major with remaining quota (append adjust_suffix)
     - Else mark unassigned_label
+
+    ``metrics`` on the result is collected during the same pass.
     """
 
     remaining: Dict[str, int] = {k: int(v) for k, v in quotas.items()}
@@ -55,43 +241,83 @@ def assign_admissions(
     # Copy input students into mutable dicts so callers can pass in mapping/rows safely.
     items: List[Dict[str, Any]] = [dict(s) for s in students]
 
-    def score_of(s: Mapping[str, Any]) -> float:
-        try:
-            return float(s.get(score_key, 0))
-        except Exception:
-            return 0.0
-
-    items.sort(key=score_of, reverse=sort_desc)
-
-    for s in items:
-        choice = _norm_choice(s.get(choice_key))
-
-        # Distinguish between "blank choice" and "invalid code".
-        # Blank: treat as no preferences, but still eligible for adjustment.
-        # Invalid: mark explicitly.
-        if choice and choice not in preference_mapping:
-            s[assigned_key] = invalid_choice_label
-            continue
-
-        assigned_major: Optional[str] = None
-        if choice:
-            for major in preference_mapping[choice]:
-                if remaining.get(major, 0) > 0:
-                    remaining[major] -= 1
-                    assigned_major = major
-                    break
-
-        if assigned_major is not None:
-            s[assigned_key] = assigned_major
-            continue
-
-        # Adjustment: any remaining slot.
-        for major, q in list(remaining.items()):
-            if q > 0:
-                remaining[major] -= 1
-                s[assigned_key] = f"{major}{adjust_suffix}"
-                break
+    with span("sort", rows=len(items)):
+        items = _priority_sorted(items, score_key, sort_desc, tie_break)
+
+    with span("assign", rows=len(items)):
+        metrics = _assign_sorted(
+            items,
+            remaining,
+            preference_mapping,
+            score_key=score_key,
+            choice_key=choice_key,
+            assigned_key=assigned_key,
+            adjust_suffix=adjust_suffix,
+            invalid_choice_label=invalid_choice_label,
+            unassigned_label=unassigned_label,
+        )
+
+    return AdmissionResult(students=items, remaining_quotas=remaining, metrics=metrics)
+
+
+def _priority_sorted(
+    items: List[Dict[str, Any]],
+    score_key: str,
+    sort_desc: bool,
+    tie_break: Sequence[Tuple[str, bool]],
+) -> List[Dict[str, Any]]:
+    """Stable multi-key sort; each key is parsed once per student."""
+    keys = [(score_key, sort_desc)] + [
+        (name, desc) for name, desc in tie_break if name != score_key and any(name in s for s in items)
+    ]
+    order = list(range(len(items)))
+    # Least significant key first: every pass is stable.
+    for name, desc in reversed(keys):
+        if name == score_key:
+            values: List[Any] = [_parse_score(s.get(name, 0)) for s in items]
+        elif name in TEXT_SORT_KEYS:
+            values = [_key_text(s.get(name)) for s in items]
         else:
-            s[assigned_key] = unassigned_label
+            values = [_parse_score(s.get(name)) for s in items]
+        order.sort(key=values.__getitem__, reverse=desc)
+    return [items[i] for i in order]
 
-    return AdmissionResult(students=items, remaining_quotas=remaining)
+
+def _assign_sorted(
+    items: List[Dict[str, Any]],
+    remaining: Dict[str, int],
+    preference_mapping: Mapping[str, List[str]],
+    *,
+    score_key: str,
+    choice_key: str,
+    assigned_key: str,
+    adjust_suffix: str,
+    invalid_choice_label: str,
+    unassigned_label: str,
+) -> AdmissionMetrics:
+    """Label ``items`` (already in priority order) in place; ``remaining`` is consumed."""
+    open_majors = OpenMajors(remaining)
+    metrics = MetricsCollector(remaining, preference_mapping)
+    for i, s in enumerate(items):
+        if not open_majors:
+            # Every quota is exhausted: label the rest without further quota scans.
+            for rest in items[i:]:
+                rest[assigned_key] = _label_when_full(
+                    rest.get(choice_key),
+                    preference_mapping,
+                    invalid_choice_label,
+                    unassigned_label,
+                    metrics,
+                )
+            break
+        s[assigned_key] = _decide(
+            s.get(choice_key),
+            open_majors,
+            preference_mapping,
+            adjust_suffix=adjust_suffix,
+            invalid_choice_label=invalid_choice_label,
+            unassigned_label=unassigned_label,
+            metrics=metrics,
+            key=_parse_score(s.get(score_key, 0)),
+        )
+    return metrics.build()
@@ -0,0 +1,30 @@
+"""
+Cell-level helpers shared by the validation and result-diff modules.
+
+Readers leave empty cells as None, NaN or blank strings, and Excel reads
+numeric 学号 as floats; these helpers give every module the same notion of
+a blank cell and of a student ID's canonical text.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any
+
+
+def is_blank(v: Any) -> bool:
+    """Whether ``v`` is an empty cell: None, NaN or a whitespace-only string."""
+    if v is None:
+        return True
+    if isinstance(v, float):
+        return math.isnan(v)
+    return isinstance(v, str) and not v.strip()
+
+
+def normalize_id(v: Any) -> str:
+    """Canonical ID text: Excel reads numeric IDs as floats (1001.0 -> "1001")."""
+    if is_blank(v):
+        return ""
+    if isinstance(v, float) and v.is_integer():
+        v = int(v)
+    return str(v).strip()
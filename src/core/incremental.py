@@ -0,0 +1,145 @@
+"""
+Incremental re-admission for quota edits.
+
+Students ranked above the first quota-sensitive decision keep their outcome
+when quotas change, so :class:`IncrementalAdmission` stores cumulative seat
+counts every ``checkpoint_interval`` sorted positions and, on a quota edit,
+replays only from the first position where the old and new runs can diverge.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+
+from src.core.admission import AdmissionMetrics
+from src.core.vectorized import (
+    EncodedCohort,
+    EncodedOutcome,
+    _major_universe,
+    _resolve,
+    outcome_metrics,
+)
+
+
+class IncrementalAdmission:
+    """An encoded cohort plus its current outcome, cheap to re-run under new quotas."""
+
+    def __init__(
+        self,
+        cohort: EncodedCohort,
+        quotas: Mapping[str, int],
+        *,
+        checkpoint_interval: int = 1024,
+    ) -> None:
+        if checkpoint_interval <= 0:
+            raise ValueError("checkpoint_interval must be positive")
+        self.cohort = cohort
+        self.checkpoint_interval = checkpoint_interval
+        self._recompute(quotas)
+
+    # ------------------------------------------------------------------ state
+
+    def _recompute(self, quotas: Mapping[str, int]) -> None:
+        self.quotas: Dict[str, int] = {k: int(v) for k, v in quotas.items()}
+        self.majors, remaining = _major_universe(self.cohort, self.quotas)
+        index = {m: i for i, m in enumerate(self.majors)}
+        self._pref_idx = [[index[m] for m in prefs] for prefs in self.cohort.preferences]
+        self.assigned = _resolve(self.cohort.choices, self._pref_idx, remaining, len(self.quotas))
+        n_blocks = -(-len(self.cohort) // self.checkpoint_interval)
+        self._counts = np.zeros((n_blocks + 1, len(self.majors)), dtype=np.int64)
+        self._rebuild_checkpoints(0)
+
+    def _seat_major(self, outcome: np.ndarray) -> np.ndarray:
+        """Major index that consumed a seat (-1 for invalid/unassigned)."""
+        n_majors = len(self.majors)
+        return np.where(outcome >= n_majors, outcome - n_majors, outcome)
+
+    def _rebuild_checkpoints(self, block: int) -> None:
+        """Recompute cumulative seat counts for every checkpoint after ``block``."""
+        k = self.checkpoint_interval
+        n_majors = len(self.majors)
+        start = block * k
+        seat = self._seat_major(self.assigned[start:])
+        taken = seat >= 0
+        bins = (np.arange(start, len(self.cohort))[taken] // k - block) * n_majors + seat[taken]
+        n_rows = self._counts.shape[0] - 1 - block
+        per_block = np.bincount(bins, minlength=n_rows * n_majors).reshape(n_rows, n_majors)
+        self._counts[block + 1 :] = self._counts[block] + np.cumsum(per_block, axis=0)
+
+    def _used_before(self, pos: int) -> np.ndarray:
+        """Seats consumed per major by students strictly before sorted position ``pos``."""
+        block = pos // self.checkpoint_interval
+        seat = self._seat_major(self.assigned[block * self.checkpoint_interval : pos])
+        return self._counts[block] + np.bincount(seat[seat >= 0], minlength=len(self.majors))
+
+    def _taker_position(self, major: int, k: int) -> Optional[int]:
+        """Sorted position of the ``k``-th (0-based) student who took a seat in ``major``."""
+        col = self._counts[:, major]
+        if k >= col[-1]:
+            return None
+        block = int(np.searchsorted(col, k, side="right")) - 1
+        start = block * self.checkpoint_interval
+        seat = self._seat_major(self.assigned[start : start + self.checkpoint_interval])
+        hits = np.flatnonzero(seat == major)
+        return start + int(hits[k - col[block]])
+
+    # ------------------------------------------------------------------ API
+
+    @property
+    def outcome(self) -> EncodedOutcome:
+        used = self._counts[-1]
+        remaining = {m: q - int(used[i]) for i, (m, q) in enumerate(self.quotas.items())}
+        return EncodedOutcome(assigned=self.assigned, majors=self.majors, remaining_quotas=remaining)
+
+    @property
+    def metrics(self) -> AdmissionMetrics:
+        """Per-major, per-round counts and cutoffs of the current outcome."""
+        return outcome_metrics(self.cohort, self.outcome)
+
+    def divergence_point(self, quotas: Mapping[str, int]) -> int:
+        """First sorted position whose outcome may differ under ``quotas``."""
+        n = len(self.cohort)
+        if list(quotas) != list(self.quotas):
+            return 0
+        start = n
+        for m, (old_q, new_q) in enumerate(zip(self.quotas.values(), quotas.values())):
+            new_q = int(new_q)
+            if new_q == old_q or (old_q <= 0 and new_q <= 0):
+                continue
+            if new_q < old_q:
+                # The first student who loses their seat in this major.
+                pos = self._taker_position(m, max(new_q, 0))
+            elif old_q <= 0:
+                pos = 0
+            else:
+                # The major reopens right after the student who filled it.
+                last = self._taker_position(m, old_q - 1)
+                pos = None if last is None or self._counts[-1, m] < old_q else last + 1
+            if pos is not None:
+                start = min(start, pos)
+        return start
+
+    def update_quotas(self, quotas: Mapping[str, int]) -> int:
+        """
+        Re-run admissions under new quotas.
+
+        Returns the first sorted position whose outcome was recomputed; every
+        student before it is guaranteed unchanged (``len(cohort)`` if none).
+        """
+        start = self.divergence_point(quotas)
+        if start == 0:
+            self._recompute(quotas)
+            return 0
+        self.quotas = {k: int(v) for k, v in quotas.items()}
+        if start >= len(self.cohort):
+            return len(self.cohort)
+        remaining = np.zeros(len(self.majors), dtype=np.int64)
+        remaining[: len(self.quotas)] = list(self.quotas.values())
+        remaining -= self._used_before(start)
+        self.assigned[start:] = _resolve(
+            self.cohort.choices[start:], self._pref_idx, remaining, len(self.quotas)
+        )
+        self._rebuild_checkpoints(start // self.checkpoint_interval)
+        return start
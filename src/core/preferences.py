@@ -4,7 +4,8 @@ Preference definitions shared across CLI/GUI and algorithm layers.
 
 from __future__ import annotations
 
-from typing import Dict, List
+import json
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
 
 
 # A-F map to ordered major preferences.
@@ -17,3 +18,125 @@ PREFERENCE_MAPPING: Dict[str, List[str]] = {
     "F": ["通信工程", "电磁场与无线技术", "电子信息工程"],
 }
 
+
+class PreferenceError(ValueError):
+    """Raised when a preference mapping or config fails validation."""
+
+
+class PreferenceTable(Mapping[str, List[str]]):
+    """
+    Validated preference mapping.
+
+    Behaves as a read-only ``code -> [major, ...]`` mapping, so it can be
+    passed anywhere a ``preference_mapping`` is accepted. Supports any number
+    of majors and preference lists of any length.
+    """
+
+    def __init__(
+        self,
+        mapping: Mapping[str, Sequence[str]],
+        majors: Optional[Sequence[str]] = None,
+    ) -> None:
+        if not mapping:
+            raise PreferenceError("志愿映射为空")
+        known = None if majors is None else list(majors)
+        if known is not None and len(set(known)) != len(known):
+            raise PreferenceError("专业列表中存在重复专业")
+
+        order: Dict[str, int] = {m: i for i, m in enumerate(known or [])}
+        lists: Dict[str, List[str]] = {}
+        for code, prefs in mapping.items():
+            if not isinstance(code, str) or not code or code != code.strip().upper():
+                # Choices are normalised with strip().upper() before lookup.
+                raise PreferenceError(f"志愿代码 {code!r} 必须为非空的大写字符串")
+            prefs = list(prefs)
+            if not prefs:
+                raise PreferenceError(f"志愿代码 {code} 的专业列表为空")
+            if len(set(prefs)) != len(prefs):
+                raise PreferenceError(f"志愿代码 {code} 中存在重复专业")
+            for major in prefs:
+                if major not in order:
+                    if known is not None:
+                        raise PreferenceError(f"志愿代码 {code} 包含未知专业 {major!r}")
+                    order[major] = len(order)
+            lists[code] = prefs
+
+        self.codes: Tuple[str, ...] = tuple(mapping)
+        self.majors: Tuple[str, ...] = tuple(order)
+        self._lists = lists
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "PreferenceTable":
+        """Build from ``{"majors": [...], "preferences": {"A": [...], ...}}``."""
+        if "preferences" not in data:
+            raise PreferenceError("配置缺少 preferences 字段")
+        return cls(data["preferences"], data.get("majors"))
+
+    @classmethod
+    def from_config(cls, path: str) -> "PreferenceTable":
+        """Load a JSON config file (see ``from_dict`` for the layout)."""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, Mapping) and "preferences" not in data:
+            # A bare ``{"A": [...]}`` mapping is accepted as well.
+            return cls(data)
+        return cls.from_dict(data)
+
+    @property
+    def depth(self) -> int:
+        return max(len(prefs) for prefs in self._lists.values())
+
+    def __getitem__(self, code: str) -> List[str]:
+        return self._lists[code]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.codes)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __contains__(self, code: object) -> bool:
+        return code in self._lists
+
+
+class OpenMajors:
+    """
+    Remaining-quota tracker with O(1) "first open major" lookup.
+
+    Majors keep the quota-dict order (the adjustment order). A bitmask holds
+    which majors still have seats; the lowest set bit is the next major an
+    adjusted student goes to. ``remaining`` is updated in place.
+    """
+
+    __slots__ = ("remaining", "_names", "_index", "_mask")
+
+    def __init__(self, remaining: Dict[str, int]) -> None:
+        self.remaining = remaining
+        self._names = list(remaining)
+        self._index = {m: i for i, m in enumerate(self._names)}
+        self._mask = 0
+        for i, q in enumerate(remaining.values()):
+            if q > 0:
+                self._mask |= 1 << i
+
+    def __bool__(self) -> bool:
+        return self._mask != 0
+
+    def is_open(self, major: str) -> bool:
+        i = self._index.get(major)
+        return i is not None and bool(self._mask >> i & 1)
+
+    def first_open(self) -> Optional[str]:
+        if not self._mask:
+            return None
+        return self._names[(self._mask & -self._mask).bit_length() - 1]
+
+    def take(self, major: str) -> None:
+        """Consume one seat of an open major."""
+        self.remaining[major] -= 1
+        if self.remaining[major] <= 0:
+            self._mask &= ~(1 << self._index[major])
+
+
+# Validated form of the built-in mapping.
+DEFAULT_PREFERENCE_TABLE = PreferenceTable(PREFERENCE_MAPPING)
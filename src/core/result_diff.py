@@ -0,0 +1,263 @@
+"""
+Differences between two admission runs.
+
+A :class:`ResultIndex` keys one run's outcome by normalised 学号 (a hash map
+from ID to row) and keeps the 录取专业 labels as integer codes. Diffing a new
+run against it is one dict lookup per student plus a few array passes, so
+an index built once for a saved baseline can be compared with many later
+runs cheaply. :class:`ResultDiff` lists every student whose outcome changed
+and the admitted count per major on both sides. Rows without a 学号 cannot be
+matched across runs, so they are listed on their own as 缺少学号.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from src.core.admission import ADJUST_SUFFIX, INVALID_CHOICE_LABEL, UNASSIGNED_LABEL
+from src.core.student_table import StudentTable
+from src.core.cells import is_blank, normalize_id
+
+# Change kinds (user-facing), in report order.
+NEWLY_ADMITTED = "新录取"
+NEWLY_UNASSIGNED = "新未录取"
+MOVED = "专业变动"
+STATUS_CHANGED = "未录取原因变动"  # e.g. 未分配 -> 无效志愿
+ADDED = "新增学生"
+REMOVED = "移除学生"
+MISSING_ID = "缺少学号"  # blank 学号: never matched, listed from both runs
+CHANGE_KINDS: Tuple[str, ...] = (
+    NEWLY_ADMITTED,
+    NEWLY_UNASSIGNED,
+    MOVED,
+    STATUS_CHANGED,
+    ADDED,
+    REMOVED,
+    MISSING_ID,
+)
+
+DIFF_HEADERS: Tuple[str, ...] = ("学号", "姓名", "变动", "原结果", "新结果")
+MAJOR_DIFF_HEADERS: Tuple[str, ...] = ("专业", "原录取人数", "新录取人数", "变化")
+
+# Code of a student missing from one side.
+_ABSENT = -1
+
+
+def admitted_major(label: Any) -> Optional[str]:
+    """Major a 录取专业 label admits into (adjustment included), or None."""
+    if is_blank(label):
+        return None
+    text = str(label).strip()
+    if text in (INVALID_CHOICE_LABEL, UNASSIGNED_LABEL):
+        return None
+    return text[: -len(ADJUST_SUFFIX)] if text.endswith(ADJUST_SUFFIX) else text
+
+
+class ResultIndex:
+    """One run's 录取专业 by 学号; build once, diff against many runs.
+
+    ``students`` is an ``AdmissionResult``, a ``StudentTable`` or student
+    mappings. Blank labels (a result file with empty cells) count as not
+    admitted. If a 学号 repeats, its first row is used; rows with a blank
+    学号 are left out of the lookup.
+    """
+
+    def __init__(
+        self,
+        students: Any,
+        *,
+        id_key: str = "学号",
+        name_key: str = "姓名",
+        label_key: str = "录取专业",
+    ) -> None:
+        students = getattr(students, "students", students)
+        if not isinstance(students, StudentTable):
+            records = list(students)
+            students = StudentTable.from_records(records, columns=[id_key, name_key, label_key])
+        if id_key not in students or label_key not in students:
+            raise ValueError(f"结果中缺少“{id_key}”或“{label_key}”列")
+        self.table = students
+        self.name_key = name_key if name_key in students else None
+
+        ids = students.column(id_key).tolist()
+        if all(type(v) is str for v in ids):
+            self.ids: List[str] = [v.strip() for v in ids]
+        else:
+            self.ids = [normalize_id(v) for v in ids]
+        # Reversed so the first occurrence of a repeated ID wins.
+        n = len(self.ids)
+        self.position: Dict[str, int] = dict(zip(reversed(self.ids), range(n - 1, -1, -1)))
+        self.position.pop("", None)
+        self.blank = np.fromiter((not k for k in self.ids), dtype=bool, count=n)
+        self._first = np.zeros(n, dtype=bool)
+        self._first[list(self.position.values())] = True
+
+        if students.is_categorical(label_key):
+            codes, categories = students.codes(label_key)
+        else:
+            codes, categories = _factorize_labels(students.column(label_key))
+        self.codes = np.asarray(codes, dtype=np.int64)
+        self.labels: List[Optional[str]] = [None if is_blank(c) else str(c).strip() for c in categories]
+        self.major_counts = self._count_majors()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _count_majors(self) -> Dict[str, int]:
+        per_label = np.bincount(self.codes, minlength=len(self.labels)).tolist()
+        counts: Dict[str, int] = {}
+        for label, count in zip(self.labels, per_label):
+            major = admitted_major(label)
+            if major is not None and count:
+                counts[major] = counts.get(major, 0) + count
+        return counts
+
+    def names(self, rows: np.ndarray) -> List[Any]:
+        if self.name_key is None:
+            return [""] * rows.shape[0]
+        return self.table.column(self.name_key)[rows].tolist()
+
+    def diff(self, new: Any) -> "ResultDiff":
+        """Changes from this (baseline) run to ``new`` (a ``ResultIndex`` or anything it accepts)."""
+        other = new if isinstance(new, ResultIndex) else ResultIndex(new)
+        # One label space for both runs; _ABSENT marks a missing student.
+        union: Dict[Any, int] = {}
+        base_lut = np.array([union.setdefault(v, len(union)) for v in self.labels], dtype=np.int64)
+        new_lut = np.array([union.setdefault(v, len(union)) for v in other.labels], dtype=np.int64)
+        labels = list(union)
+        # Trailing False: indexing with _ABSENT (-1) reads "not admitted".
+        admitted = np.array([admitted_major(v) is not None for v in labels] + [False])
+
+        position = self.position
+        pos = np.fromiter((position.get(k, -1) for k in other.ids), dtype=np.intp, count=len(other))
+        found = pos >= 0
+        after = new_lut[other.codes]
+        before = np.full(len(other), _ABSENT, dtype=np.int64)
+        before[found] = base_lut[self.codes[pos[found]]]
+
+        kind = np.full(len(other), -1, dtype=np.int8)
+        changed = found & (before != after)
+        adm_before, adm_after = admitted[before], admitted[after]
+        kind[changed & ~adm_before & adm_after] = 0
+        kind[changed & adm_before & ~adm_after] = 1
+        # Admitted on both sides: a different major or round (通信工程 ->
+        # 通信工程(调剂)) is a move.
+        same_status = changed & (adm_before == adm_after)
+        kind[same_status & adm_after] = 2
+        kind[same_status & ~adm_after] = 3
+        kind[~found] = 4
+        kind[other.blank] = 6
+
+        rows = np.flatnonzero(kind >= 0)
+        # Baseline students nobody in the new run matched, then its rows
+        # without a 学号.
+        removed = self._first.copy()
+        removed[pos[found]] = False
+        gone = np.concatenate((np.flatnonzero(removed), np.flatnonzero(self.blank)))
+        gone_kind = np.where(self.blank[gone], 6, 5).astype(np.int8)
+
+        ids = [other.ids[i] for i in rows.tolist()] + [self.ids[i] for i in gone.tolist()]
+        names = other.names(rows) + self.names(gone)
+        kinds = np.concatenate((kind[rows], gone_kind))
+        # Label codes shifted by one so 0 is "absent" (shown as blank).
+        outside = [""] + ["" if v is None else v for v in labels]
+        old = np.concatenate((before[rows], base_lut[self.codes[gone]])) + 1
+        new_codes = np.concatenate((after[rows], np.full(gone.shape[0], _ABSENT))) + 1
+
+        changes = StudentTable(len(ids))
+        changes.set_column(DIFF_HEADERS[0], ids)
+        changes.set_column(DIFF_HEADERS[1], names)
+        changes.set_categorical(DIFF_HEADERS[2], kinds, CHANGE_KINDS)
+        changes.set_categorical(DIFF_HEADERS[3], old, outside)
+        changes.set_categorical(DIFF_HEADERS[4], new_codes, outside)
+
+        majors = list(dict.fromkeys(list(self.major_counts) + list(other.major_counts)))
+        return ResultDiff(
+            changes=changes,
+            major_counts={
+                m: (self.major_counts.get(m, 0), other.major_counts.get(m, 0)) for m in majors
+            },
+            unchanged=int(found.sum() - changed.sum()),
+        )
+
+
+def _factorize_labels(values: np.ndarray) -> Tuple[np.ndarray, List[Any]]:
+    index: Dict[Any, int] = {}
+    items = values.tolist()
+    codes = np.fromiter(
+        (index.setdefault(v, len(index)) for v in items), dtype=np.int64, count=len(items)
+    )
+    return codes, list(index)
+
+
+@dataclass(frozen=True)
+class ResultDiff:
+    """Students whose outcome changed, plus admitted counts per major."""
+
+    # One row per change (``DIFF_HEADERS``): students of the new run in its
+    # order, then students only in the baseline, then the baseline's rows
+    # without a 学号.
+    changes: StudentTable
+    # major -> (admitted in baseline, admitted in new run), adjustment included.
+    major_counts: Dict[str, Tuple[int, int]]
+    unchanged: int
+
+    def __len__(self) -> int:
+        return len(self.changes)
+
+    def counts(self) -> Dict[str, int]:
+        """Number of students per change kind (every kind listed)."""
+        codes, _ = self.changes.codes("变动")
+        return dict(zip(CHANGE_KINDS, np.bincount(codes, minlength=len(CHANGE_KINDS)).tolist()))
+
+    def ids(self, kind: str) -> List[str]:
+        """学号 of the students with change ``kind``."""
+        codes, _ = self.changes.codes("变动")
+        rows = np.flatnonzero(codes == CHANGE_KINDS.index(kind))
+        return self.changes.column("学号")[rows].tolist()
+
+    @property
+    def moved(self) -> List[str]:
+        return self.ids(MOVED)
+
+    @property
+    def newly_admitted(self) -> List[str]:
+        return self.ids(NEWLY_ADMITTED)
+
+    @property
+    def newly_unassigned(self) -> List[str]:
+        return self.ids(NEWLY_UNASSIGNED)
+
+    @property
+    def major_deltas(self) -> Dict[str, int]:
+        return {m: after - before for m, (before, after) in self.major_counts.items()}
+
+    def summary(self) -> str:
+        """Short multi-line text for a message box or stderr."""
+        lines = [f"结果变动 {len(self)} 人，未变 {self.unchanged} 人"]
+        lines.extend(f"  {kind}：{n} 人" for kind, n in self.counts().items() if n)
+        if self.major_counts:
+            lines.append("")
+            lines.extend(
+                f"  {m}：{before} → {after}（{after - before:+d}）"
+                for m, (before, after) in self.major_counts.items()
+            )
+        return "\n".join(lines)
+
+    def rows(self) -> Iterator[Tuple[Any, ...]]:
+        """Changes as ``DIFF_HEADERS`` tuples, for the exporters."""
+        return self.changes.iter_tuples(DIFF_HEADERS)
+
+    def major_rows(self) -> List[Tuple[Any, ...]]:
+        """Per-major counts as ``MAJOR_DIFF_HEADERS`` tuples."""
+        return [(m, before, after, after - before) for m, (before, after) in self.major_counts.items()]
+
+
+def diff_results(baseline: Any, new: Any) -> ResultDiff:
+    """Changes from ``baseline`` to ``new`` (results, tables, mappings or indexes)."""
+    index = baseline if isinstance(baseline, ResultIndex) else ResultIndex(baseline)
+    return index.diff(new)
+
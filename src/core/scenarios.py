@@ -0,0 +1,127 @@
+"""
+Batch quota-scenario sweeps.
+
+A cohort is sorted and encoded once, then many candidate quota vectors are
+evaluated against it. The encoded arrays are shipped once per worker of the
+process pool, through the pool initializer, and then shared read-only by
+every batch that worker runs.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.core.admission import TIE_BREAK_KEYS
+from src.core.vectorized import EncodedCohort, EncodedOutcome, assign_encoded, encode_students
+
+
+@dataclass(frozen=True)
+class ScenarioSummary:
+    """Aggregate outcome of one quota vector."""
+
+    quotas: Dict[str, int]
+    admitted: Dict[str, int]
+    adjusted: Dict[str, int]
+    unassigned: int
+    invalid: int
+    # 1-based sorted rank of the last student placed in each major (None if empty).
+    cutoff_ranks: Dict[str, Optional[int]]
+
+
+def summarize_outcome(outcome: EncodedOutcome, quotas: Mapping[str, int]) -> ScenarioSummary:
+    """Reduce per-student outcome codes to per-major counts and cutoffs."""
+    n_majors = len(outcome.majors)
+    counts = np.bincount(outcome.assigned.astype(np.intp) + 2, minlength=2 * n_majors + 2)
+    seat = outcome.assigned
+    seat = np.where(seat >= n_majors, seat - n_majors, seat)
+    admitted: Dict[str, int] = {}
+    adjusted: Dict[str, int] = {}
+    cutoffs: Dict[str, Optional[int]] = {}
+    for m in quotas:
+        i = outcome.majors.index(m)
+        admitted[m] = int(counts[i + 2])
+        adjusted[m] = int(counts[n_majors + i + 2])
+        hits = np.flatnonzero(seat == i)
+        cutoffs[m] = int(hits[-1]) + 1 if hits.shape[0] else None
+    return ScenarioSummary(
+        quotas={k: int(v) for k, v in quotas.items()},
+        admitted=admitted,
+        adjusted=adjusted,
+        unassigned=int(counts[1]),
+        invalid=int(counts[0]),
+        cutoff_ranks=cutoffs,
+    )
+
+
+def run_scenario(cohort: EncodedCohort, quotas: Mapping[str, int]) -> ScenarioSummary:
+    """Evaluate a single quota vector."""
+    return summarize_outcome(assign_encoded(cohort, quotas), quotas)
+
+
+# The cohort of a pool worker process, set by ``_init_worker``.
+_worker_cohort: Optional[EncodedCohort] = None
+
+
+def _init_worker(cohort: EncodedCohort) -> None:
+    global _worker_cohort
+    _worker_cohort = cohort
+
+
+def _run_batch(batch: List[Dict[str, int]]) -> List[ScenarioSummary]:
+    assert _worker_cohort is not None
+    return [run_scenario(_worker_cohort, q) for q in batch]
+
+
+def sweep_quotas(
+    students: Union[EncodedCohort, Iterable[Mapping[str, Any]]],
+    quota_vectors: Sequence[Mapping[str, int]],
+    preference_mapping: Optional[Mapping[str, List[str]]] = None,
+    *,
+    score_key: str = "分数",
+    sort_desc: bool = True,
+    choice_key: str = "志愿选择",
+    tie_break: Sequence[Tuple[str, bool]] = TIE_BREAK_KEYS,
+    max_workers: Optional[int] = None,
+    batch_size: Optional[int] = None,
+) -> List[ScenarioSummary]:
+    """
+    Evaluate every quota vector against one cohort.
+
+    ``students`` is either an already encoded cohort or student mappings (then
+    ``preference_mapping`` is required). Students tied on ``score_key`` are
+    ordered by ``tie_break``, by default as in the GUI, CLI and batch runner.
+    Summaries come back in input order. ``max_workers=1`` runs in-process.
+    """
+    if isinstance(students, EncodedCohort):
+        cohort = students
+    else:
+        if preference_mapping is None:
+            raise ValueError("preference_mapping is required when passing raw students")
+        items = students if isinstance(students, list) else list(students)
+        cohort = encode_students(
+            items,
+            preference_mapping,
+            score_key=score_key,
+            sort_desc=sort_desc,
+            choice_key=choice_key,
+            tie_break=tie_break,
+        )
+
+    vectors = [{k: int(v) for k, v in q.items()} for q in quota_vectors]
+    workers = max_workers or os.cpu_count() or 1
+    if workers <= 1 or len(vectors) <= 1:
+        return [run_scenario(cohort, q) for q in vectors]
+
+    size = batch_size or max(1, -(-len(vectors) // (workers * 4)))
+    batches = [vectors[i : i + size] for i in range(0, len(vectors), size)]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cohort,)) as pool:
+        results: List[ScenarioSummary] = []
+        for part in pool.map(_run_batch, batches):
+            results.extend(part)
+        return results
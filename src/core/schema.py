@@ -0,0 +1,19 @@
+"""
+Column names shared by importers, the engine, views and exporters.
+
+Kept free of third-party imports so lightweight entry points (CLI) can use
+them without loading NumPy.
+"""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+# Column layout produced by the importers.
+STUDENT_COLUMNS: Tuple[str, ...] = ("序号", "排名", "学号", "姓名", "分数", "志愿选择", "专业")
+# Low-cardinality text columns stored as codes + categories.
+CATEGORICAL_COLUMNS: Tuple[str, ...] = ("志愿选择", "专业", "录取专业")
+# Columns written by the result exporters.
+EXPORT_HEADERS: Tuple[str, ...] = ("序号", "学号", "姓名", "分数", "志愿选择", "录取专业")
+# Source line of each row (header is line 1), added by lenient imports for validation.
+SOURCE_ROW_COLUMN: str = "行号"
@@ -0,0 +1,209 @@
+"""
+Sort-key preparation and priority ordering.
+
+Ordering a cohort is split into two steps. :func:`prepare_sort_keys` parses
+the primary key (rank or score) and any tie-breakers once into typed arrays.
+:meth:`SortKeys.order` then computes the stable priority permutation.
+
+Ranks are usually bounded integers. Distinct ranks are placed by a
+counting sort (one bucket per value, no comparisons); ranks with ties go
+through an LSD radix sort over 16-bit digits. Other keys fall back to a
+comparison sort. Students tied on the primary key are re-ordered by the tie-breakers
+(the apps pass ``TIE_BREAK_KEYS``: rank, then score, then 学号) and finally by
+input position.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.core.admission import TEXT_SORT_KEYS, _key_text, _parse_score
+from src.core.student_table import StudentTable
+
+# A counting sort allocates one bucket per value in the key range; wider
+# integer ranges go through the radix sort instead.
+COUNTING_SORT_MAX_RANGE_FACTOR = 4
+_RADIX_MAX_RANGE = 1 << 32
+
+
+def parse_key_column(raw: Sequence[Any]) -> np.ndarray:
+    """Parse a key column like ``assign_admissions`` does (unparsable => 0.0)."""
+    arr = np.asarray(raw) if len(raw) else np.empty(0, dtype=np.float64)
+    if arr.ndim == 1 and arr.dtype.kind in "biuf":
+        return arr.astype(np.float64, copy=False)
+    return np.fromiter(map(_parse_score, raw), dtype=np.float64, count=len(raw))
+
+
+def _text_keys(values: np.ndarray) -> np.ndarray:
+    """ID-like tie-breaker values as comparable text (see ``_key_text``)."""
+    if values.dtype.kind in "iu":
+        return values.astype(str)
+    items = values.tolist()
+    if set(map(type, items)) <= {str}:
+        return np.char.strip(np.array(items, dtype=str))
+    return np.array([_key_text(v) for v in items], dtype=str)
+
+
+# ---------------------------------------------------------------- sorting
+
+
+def _integer_offsets(keys: np.ndarray, descending: bool) -> Optional[np.ndarray]:
+    """Non-negative integer offsets preserving the key order, or None if not integral."""
+    if not keys.shape[0] or not np.isfinite(keys).all() or not (keys == np.trunc(keys)).all():
+        return None
+    low, high = keys.min(), keys.max()
+    if high - low >= _RADIX_MAX_RANGE:
+        return None
+    return (high - keys if descending else keys - low).astype(np.uint32)
+
+
+def counting_order(offsets: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Sort permutation of distinct integer ``offsets`` given their bucket ``counts``.
+
+    Every student is scattered straight to the start of its bucket.
+    """
+    starts = np.cumsum(counts) - counts
+    order = np.empty(offsets.shape[0], dtype=np.intp)
+    order[starts[offsets]] = np.arange(offsets.shape[0])
+    return order
+
+
+def radix_order(offsets: np.ndarray) -> np.ndarray:
+    """Stable sort permutation of integer offsets below 2**32.
+
+    Least-significant-digit radix sort over two 16-bit digits; NumPy's stable
+    argsort of ``uint16`` keys is itself a radix sort.
+    """
+    low = (offsets & 0xFFFF).astype(np.uint16)
+    order = np.argsort(low, kind="stable")
+    high = (offsets >> 16).astype(np.uint16)[order]
+    if not high.any():
+        return order
+    return order[np.argsort(high, kind="stable")]
+
+
+def _comparison_order(keys: np.ndarray, descending: bool) -> np.ndarray:
+    keys = -keys if descending else keys
+    n = keys.shape[0]
+    # An unstable quicksort is several times faster than a stable merge sort;
+    # only tied runs need re-ordering by input position afterwards.
+    order = np.argsort(keys, kind="quicksort")
+    sorted_keys = keys[order]
+    same = sorted_keys[1:] == sorted_keys[:-1]
+    if not same.any():
+        return order
+    group = np.concatenate(([0], np.cumsum(~same)))
+    return order[np.argsort(group * n + order, kind="quicksort")]
+
+
+def sort_order(scores: np.ndarray, *, sort_desc: bool = True) -> np.ndarray:
+    """Stable sort permutation matching ``list.sort(key=..., reverse=sort_desc)``.
+
+    Bounded integer keys (ranks) use a counting or radix sort.
+    """
+    n = scores.shape[0]
+    offsets = _integer_offsets(scores, sort_desc)
+    if offsets is None:
+        return _comparison_order(scores, sort_desc)
+    key_range = int(offsets.max()) + 1
+    if key_range <= COUNTING_SORT_MAX_RANGE_FACTOR * n + 1024:
+        counts = np.bincount(offsets, minlength=key_range)
+        if counts.max() <= 1:
+            return counting_order(offsets, counts)
+    # Tied or widely spread ranks.
+    return radix_order(offsets)
+
+
+# ---------------------------------------------------------------- keys
+
+
+@dataclass(frozen=True)
+class SortKeys:
+    """Typed sort columns in input order."""
+
+    primary: np.ndarray  # float64
+    descending: bool
+    # (values, descending) applied in turn to students tied on the primary key.
+    # Text columns (学号) stay raw and are converted for tied students only.
+    tie_breakers: Tuple[Tuple[np.ndarray, bool], ...] = ()
+
+    def __len__(self) -> int:
+        return self.primary.shape[0]
+
+    def order(self) -> np.ndarray:
+        """Stable priority permutation: primary key, then tie-breakers, then input order."""
+        order = sort_order(self.primary, sort_desc=self.descending)
+        if not self.tie_breakers or len(self) < 2:
+            return order
+        ranked = self.primary[order]
+        same = ranked[1:] == ranked[:-1]
+        if not same.any():
+            return order
+        # Only positions inside a tied run are re-sorted, grouped by run.
+        tied = np.zeros(len(self), dtype=bool)
+        tied[1:] |= same
+        tied[:-1] |= same
+        positions = np.flatnonzero(tied)
+        run = np.concatenate(([0], np.cumsum(~same)))[positions]
+        members = order[positions]
+        keys = [run]
+        for values, descending in self.tie_breakers:
+            column = values[members]
+            if column.dtype.kind != "f":
+                column = _text_keys(column)
+            if descending:
+                column = -column if column.dtype.kind == "f" else -np.unique(column, return_inverse=True)[1]
+            keys.append(column)
+        # np.lexsort is stable and treats its last key as the primary one.
+        order[positions] = members[np.lexsort(keys[::-1])]
+        return order
+
+
+def _tie_columns(score_key: str, tie_break: Sequence[Tuple[str, bool]], present: Any) -> list:
+    return [(name, desc) for name, desc in tie_break if name != score_key and present(name)]
+
+
+def prepare_sort_keys(
+    students: Any,
+    *,
+    score_key: str = "分数",
+    sort_desc: bool = True,
+    tie_break: Sequence[Tuple[str, bool]] = (),
+) -> SortKeys:
+    """Parse the primary key and tie-breakers of a ``StudentTable`` or mappings once.
+
+    Tie-breakers naming the primary key or a missing column are skipped.
+    """
+    if isinstance(students, StudentTable):
+        n = len(students)
+        primary = parse_key_column(students.column(score_key)) if score_key in students else np.zeros(n)
+        ties = [
+            (_tie_column(name, students.column(name)), desc)
+            for name, desc in _tie_columns(score_key, tie_break, students.__contains__)
+        ]
+        return SortKeys(primary, sort_desc, tuple(ties))
+
+    records: Sequence[Mapping[str, Any]] = students
+    primary = parse_key_column([s.get(score_key, 0) for s in records])
+    present = lambda name: any(name in s for s in records)  # noqa: E731
+    ties = [
+        (_tie_column(name, _object_column([s.get(name) for s in records])), desc)
+        for name, desc in _tie_columns(score_key, tie_break, present)
+    ]
+    return SortKeys(primary, sort_desc, tuple(ties))
+
+
+def _object_column(values: Sequence[Any]) -> np.ndarray:
+    column = np.empty(len(values), dtype=object)
+    column[:] = values
+    return column
+
+
+def _tie_column(name: str, values: np.ndarray) -> np.ndarray:
+    """Numbers for numeric keys; ID columns are kept as they are (non-float)."""
+    if name in TEXT_SORT_KEYS:
+        return values if values.dtype.kind != "f" else values.astype(object)
+    return parse_key_column(values)
@@ -0,0 +1,188 @@
+"""
+Timing spans for the hot paths.
+
+``with span("import") as s: ...; s.set_rows(n)`` records the duration, row
+count and (optionally) peak traced memory of a stage. Nothing is recorded
+until :func:`enable` installs a recorder; while disabled, ``span`` returns a
+shared no-op context manager, so instrumented code pays one global lookup.
+
+Finished spans are kept in a bounded history (the GUI status bar reads the
+latest ones) and logged as one JSON object per line on the ``SPAN_LOGGER``
+logger for machine-readable timing logs.
+
+Peak memory uses :mod:`tracemalloc` (NumPy reports its buffers to it), which
+slows allocation-heavy Python code noticeably, so it is opt-in. Peaks are
+per thread of nesting; spans overlapping on different threads can see each
+other's allocations.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+import tracemalloc
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Deque, Dict, List, Optional
+
+SPAN_LOGGER = "admission.spans"
+
+_log = logging.getLogger(SPAN_LOGGER)
+
+
+@dataclass(frozen=True)
+class SpanRecord:
+    name: str
+    seconds: float
+    rows: Optional[int] = None
+    # Peak traced memory above the level at entry; None without memory tracing.
+    peak_bytes: Optional[int] = None
+    # Wall-clock time at entry (epoch seconds) and the recording thread.
+    started: float = 0.0
+    thread: str = ""
+
+    @property
+    def rows_per_second(self) -> Optional[float]:
+        if self.rows is None or self.seconds <= 0:
+            return None
+        return self.rows / self.seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class SpanRecorder:
+    """Bounded history of finished spans."""
+
+    def __init__(self, history: int = 256, trace_memory: bool = False) -> None:
+        self.trace_memory = trace_memory
+        self._records: Deque[SpanRecord] = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def add(self, record: SpanRecord) -> None:
+        with self._lock:
+            self._records.append(record)
+        if _log.isEnabledFor(logging.INFO):
+            _log.info(json.dumps(record.to_dict(), ensure_ascii=False))
+
+    def records(self) -> List[SpanRecord]:
+        with self._lock:
+            return list(self._records)
+
+    def latest(self, name: str) -> Optional[SpanRecord]:
+        """Most recent finished span called ``name``."""
+        with self._lock:
+            for record in reversed(self._records):
+                if record.name == name:
+                    return record
+        return None
+
+    def stack(self) -> List["Span"]:
+        """Open spans of the calling thread (outermost first)."""
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+
+class Span:
+    """An open span; created by :func:`span` while a recorder is installed."""
+
+    __slots__ = ("name", "rows", "_recorder", "_t0", "_started", "_base", "_peak")
+
+    def __init__(self, name: str, rows: Optional[int], recorder: SpanRecorder) -> None:
+        self.name = name
+        self.rows = rows
+        self._recorder = recorder
+
+    def set_rows(self, rows: int) -> None:
+        self.rows = int(rows)
+
+    def __enter__(self) -> "Span":
+        recorder = self._recorder
+        if recorder.trace_memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            # Hand the peak so far to the enclosing spans before resetting it.
+            for outer in recorder.stack():
+                outer._peak = max(outer._peak, peak)
+            tracemalloc.reset_peak()
+            self._base = self._peak = current
+        else:
+            self._base = self._peak = -1
+        recorder.stack().append(self)
+        self._started = time.time()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        seconds = time.perf_counter() - self._t0
+        recorder = self._recorder
+        stack = recorder.stack()
+        peak_bytes = None
+        if self._base >= 0 and tracemalloc.is_tracing():
+            peak = tracemalloc.get_traced_memory()[1]
+            for open_span in stack:
+                open_span._peak = max(open_span._peak, peak)
+            peak_bytes = max(self._peak - self._base, 0)
+        if stack and stack[-1] is self:
+            stack.pop()
+        recorder.add(
+            SpanRecord(
+                self.name,
+                seconds,
+                self.rows,
+                peak_bytes,
+                self._started,
+                threading.current_thread().name,
+            )
+        )
+
+
+class _NullSpan:
+    """Shared stand-in while spans are disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+    def set_rows(self, rows: int) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+_recorder: Optional[SpanRecorder] = None
+
+
+def span(name: str, rows: Optional[int] = None) -> Any:
+    """Context manager timing one stage (a no-op unless spans are enabled)."""
+    recorder = _recorder
+    if recorder is None:
+        return _NULL_SPAN
+    return Span(name, rows, recorder)
+
+
+def enable(trace_memory: bool = False, history: int = 256) -> SpanRecorder:
+    """Install a recorder (replacing any previous one) and return it."""
+    global _recorder
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _recorder = SpanRecorder(history, trace_memory)
+    return _recorder
+
+
+def disable() -> None:
+    global _recorder
+    if _recorder is not None and _recorder.trace_memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _recorder = None
+
+
+def get_recorder() -> Optional[SpanRecorder]:
+    return _recorder
@@ -0,0 +1,262 @@
+"""
+Streaming / out-of-core admissions.
+
+``assign_admissions`` materialises the whole cohort before sorting. The
+helpers here instead consume an iterator: already-ranked input is assigned
+lazily one record at a time, and unsorted input larger than memory is first
+put through an external merge sort over pickled spill files.
+"""
+
+from __future__ import annotations
+
+import heapq
+import os
+import pickle
+import tempfile
+from itertools import count
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from src.core.admission import (
+    ADJUST_SUFFIX,
+    INVALID_CHOICE_LABEL,
+    TEXT_SORT_KEYS,
+    UNASSIGNED_LABEL,
+    AdmissionMetrics,
+    MetricsCollector,
+    _decide,
+    _key_text,
+    _label_when_full,
+    _parse_score,
+)
+from src.core.preferences import OpenMajors
+
+DEFAULT_CHUNK_SIZE = 200_000
+
+# (sort key, input sequence number, record). Sequence numbers are unique, so
+# tuples compare without reaching the record and equal keys keep input order.
+# The sort key is a float, or a tuple of values when tie-breakers are given.
+_Keyed = Tuple[Any, int, Dict[str, Any]]
+
+
+class _Descending:
+    """Text sort value with reversed ordering (descending text tie-breakers)."""
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    def __lt__(self, other: "_Descending") -> bool:
+        return self.text > other.text
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and self.text == other.text
+
+
+def _priority_key(
+    score_key: str, sort_desc: bool, tie_break: Sequence[Tuple[str, bool]]
+) -> Callable[[Mapping[str, Any]], Any]:
+    """Ascending sort key giving ``assign_admissions``' order for the same ``tie_break``."""
+    sign = -1.0 if sort_desc else 1.0
+    ties = [(name, desc) for name, desc in tie_break if name != score_key]
+    if not ties:
+        return lambda s: sign * _parse_score(s.get(score_key, 0))
+
+    def part(name: str, desc: bool) -> Callable[[Mapping[str, Any]], Any]:
+        if name in TEXT_SORT_KEYS:
+            if desc:
+                return lambda s: _Descending(_key_text(s.get(name)))
+            return lambda s: _key_text(s.get(name))
+        factor = -1.0 if desc else 1.0
+        return lambda s: factor * _parse_score(s.get(name))
+
+    parts = [part(name, desc) for name, desc in ties]
+    return lambda s: (sign * _parse_score(s.get(score_key, 0)), *(p(s) for p in parts))
+
+
+def _spill(chunk: List[_Keyed], spill_dir: Optional[str]) -> str:
+    chunk.sort()
+    fd, path = tempfile.mkstemp(prefix="admission-", suffix=".spill", dir=spill_dir)
+    with os.fdopen(fd, "wb") as f:
+        # One self-contained pickle per record: a shared Pickler memoises every
+        # object it writes, and clearing that memo between records leaves the
+        # reader's back-references pointing at earlier records.
+        for item in chunk:
+            pickle.dump(item, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def _read_spill(path: str) -> Iterator[_Keyed]:
+    with open(path, "rb") as f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
+
+
+def external_sort(
+    students: Iterable[Mapping[str, Any]],
+    *,
+    score_key: str = "分数",
+    sort_desc: bool = True,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    spill_dir: Optional[str] = None,
+    tie_break: Sequence[Tuple[str, bool]] = (),
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield copies of ``students`` in the order ``assign_admissions`` would use
+    (with the same ``tie_break``).
+
+    At most ``chunk_size`` records are held in memory; sorted runs are spilled
+    to temporary files and k-way merged. Input that fits in a single chunk is
+    sorted in memory without touching disk. Spill files are removed once the
+    generator is exhausted or closed.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    key = _priority_key(score_key, sort_desc, tie_break)
+    seq = count()
+    chunk: List[_Keyed] = []
+    spills: List[str] = []
+    try:
+        for s in students:
+            chunk.append((key(s), next(seq), dict(s)))
+            if len(chunk) >= chunk_size:
+                spills.append(_spill(chunk, spill_dir))
+                chunk = []
+
+        if not spills:
+            chunk.sort()
+            for item in chunk:
+                yield item[2]
+            return
+
+        if chunk:
+            spills.append(_spill(chunk, spill_dir))
+            chunk = []
+        runs = [_read_spill(p) for p in spills]
+        for item in heapq.merge(*runs):
+            yield item[2]
+    finally:
+        for path in spills:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class StreamingAdmission:
+    """
+    Lazily assign an iterator of students that is already in rank order.
+
+    Iterate it once to receive assigned copies of each record;
+    ``remaining_quotas`` and ``metrics`` reflect the students seen so far.
+    """
+
+    def __init__(
+        self,
+        sorted_students: Iterable[Mapping[str, Any]],
+        quotas: Mapping[str, int],
+        preference_mapping: Mapping[str, List[str]],
+        *,
+        score_key: str = "分数",
+        choice_key: str = "志愿选择",
+        assigned_key: str = "录取专业",
+        adjust_suffix: str = ADJUST_SUFFIX,
+        invalid_choice_label: str = INVALID_CHOICE_LABEL,
+        unassigned_label: str = UNASSIGNED_LABEL,
+    ) -> None:
+        self._students = sorted_students
+        self.remaining_quotas: Dict[str, int] = {k: int(v) for k, v in quotas.items()}
+        self.preference_mapping = preference_mapping
+        self.score_key = score_key
+        self.choice_key = choice_key
+        self.assigned_key = assigned_key
+        self._labels = dict(
+            adjust_suffix=adjust_suffix,
+            invalid_choice_label=invalid_choice_label,
+            unassigned_label=unassigned_label,
+        )
+        self.processed = 0
+        self._metrics = MetricsCollector(self.remaining_quotas, preference_mapping)
+
+    @property
+    def metrics(self) -> AdmissionMetrics:
+        return self._metrics.build()
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        open_majors = OpenMajors(self.remaining_quotas)
+        for s in self._students:
+            record = dict(s)
+            if open_majors:
+                label = _decide(
+                    record.get(self.choice_key),
+                    open_majors,
+                    self.preference_mapping,
+                    **self._labels,
+                    metrics=self._metrics,
+                    key=_parse_score(record.get(self.score_key, 0)),
+                )
+            else:
+                label = _label_when_full(
+                    record.get(self.choice_key),
+                    self.preference_mapping,
+                    self._labels["invalid_choice_label"],
+                    self._labels["unassigned_label"],
+                    self._metrics,
+                )
+            record[self.assigned_key] = label
+            self.processed += 1
+            yield record
+
+
+def assign_admissions_stream(
+    students: Iterable[Mapping[str, Any]],
+    quotas: Mapping[str, int],
+    preference_mapping: Mapping[str, List[str]],
+    *,
+    presorted: bool = False,
+    score_key: str = "分数",
+    sort_desc: bool = True,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    spill_dir: Optional[str] = None,
+    choice_key: str = "志愿选择",
+    assigned_key: str = "录取专业",
+    adjust_suffix: str = ADJUST_SUFFIX,
+    invalid_choice_label: str = INVALID_CHOICE_LABEL,
+    unassigned_label: str = UNASSIGNED_LABEL,
+    tie_break: Sequence[Tuple[str, bool]] = (),
+) -> StreamingAdmission:
+    """
+    Streaming counterpart of ``assign_admissions`` with bounded memory.
+
+    With ``presorted=True`` the input must already be in rank order and is
+    consumed lazily; otherwise it is first ordered by ``external_sort``
+    (equal keys ordered by ``tie_break``, as in ``assign_admissions``). The
+    returned object yields the same records, in the same order, as
+    ``assign_admissions(...).students``.
+    """
+    ordered = (
+        students
+        if presorted
+        else external_sort(
+            students,
+            score_key=score_key,
+            sort_desc=sort_desc,
+            chunk_size=chunk_size,
+            spill_dir=spill_dir,
+            tie_break=tie_break,
+        )
+    )
+    return StreamingAdmission(
+        ordered,
+        quotas,
+        preference_mapping,
+        score_key=score_key,
+        choice_key=choice_key,
+        assigned_key=assigned_key,
+        adjust_suffix=adjust_suffix,
+        invalid_choice_label=invalid_choice_label,
+        unassigned_label=unassigned_label,
+    )
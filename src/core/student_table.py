@@ -0,0 +1,251 @@
+"""
+Columnar student records.
+
+``StudentTable`` keeps one NumPy array per column instead of one dict per
+student. Low-cardinality text columns (志愿选择, 专业, 录取专业) are stored as
+integer codes plus a small category list. Rows are exposed as lightweight
+read-only ``Mapping`` views, so code written against list-of-dicts (including
+``assign_admissions``) keeps working unchanged.
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.core.schema import CATEGORICAL_COLUMNS
+
+
+def _to_array(values: Union[np.ndarray, Sequence[Any]]) -> np.ndarray:
+    """Keep numeric and fixed-width text arrays unboxed; everything else
+    becomes an object array."""
+    if isinstance(values, np.ndarray) and values.ndim == 1:
+        return values if values.dtype.kind in "biufUO" else values.astype(object)
+    arr = np.asarray(values) if len(values) else np.empty(0, dtype=object)
+    if arr.ndim == 1 and arr.dtype.kind in "biuf":
+        return arr
+    out = np.empty(len(values), dtype=object)
+    out[:] = list(values)
+    return out
+
+
+def _factorize(values: Union[np.ndarray, Sequence[Any]]) -> Tuple[np.ndarray, List[Any]]:
+    """Encode values as (codes, categories) preserving first-seen order."""
+    if isinstance(values, np.ndarray):
+        values = values.tolist()
+    index: Dict[Any, int] = {}
+    codes = np.fromiter(
+        (index.setdefault(v, len(index)) for v in values), dtype=np.int32, count=len(values)
+    )
+    return codes, list(index)
+
+
+class StudentRow(Mapping[str, Any]):
+    """Read-only view of one table row; behaves like the old per-student dict."""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "StudentTable", index: int) -> None:
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        return self._table.value(key, self._index)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._table.columns)
+
+    def __len__(self) -> int:
+        return len(self._table.columns)
+
+    def __repr__(self) -> str:
+        return f"StudentRow({dict(self)!r})"
+
+
+class StudentTable(Sequence[StudentRow]):
+    """Array-backed student cohort shared by importers, engine, views and exporters."""
+
+    def __init__(self, length: int = 0) -> None:
+        self._length = int(length)
+        self._order: List[str] = []
+        self._plain: Dict[str, np.ndarray] = {}
+        self._codes: Dict[str, np.ndarray] = {}
+        self._categories: Dict[str, List[Any]] = {}
+
+    # ------------------------------------------------------------ construction
+
+    @classmethod
+    def from_columns(
+        cls,
+        columns: Mapping[str, Union[np.ndarray, Sequence[Any]]],
+        *,
+        categorical: Sequence[str] = CATEGORICAL_COLUMNS,
+    ) -> "StudentTable":
+        lengths = {len(v) for v in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"列长度不一致: {sorted(lengths)}")
+        table = cls(lengths.pop() if lengths else 0)
+        for name, values in columns.items():
+            if name in categorical:
+                codes, categories = _factorize(values)
+                table.set_categorical(name, codes, categories)
+            else:
+                table.set_column(name, values)
+        return table
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Sequence[Mapping[str, Any]],
+        columns: Optional[Sequence[str]] = None,
+        *,
+        categorical: Sequence[str] = CATEGORICAL_COLUMNS,
+    ) -> "StudentTable":
+        if columns is None:
+            names: Dict[str, None] = {}
+            for r in records:
+                names.update(dict.fromkeys(r))
+            columns = list(names)
+        return cls.from_columns(
+            {c: [r.get(c) for r in records] for c in columns}, categorical=categorical
+        )
+
+    @classmethod
+    def from_frame(cls, frame: Any, *, categorical: Sequence[str] = ()) -> "StudentTable":
+        """Wrap a DataFrame's column arrays (numeric columns are not copied)."""
+        return cls.from_columns(
+            {str(c): frame[c].to_numpy() for c in frame.columns}, categorical=categorical
+        )
+
+    # ------------------------------------------------------------ columns
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._order)
+
+    def __contains__(self, name: object) -> bool:  # type: ignore[override]
+        return name in self._plain or name in self._codes
+
+    def _register(self, name: str, length: int) -> None:
+        if length != self._length:
+            raise ValueError(f"列 {name} 长度 {length} 与表长度 {self._length} 不一致")
+        self._plain.pop(name, None)
+        self._codes.pop(name, None)
+        self._categories.pop(name, None)
+        if name not in self._order:
+            self._order.append(name)
+
+    def set_column(self, name: str, values: Union[np.ndarray, Sequence[Any]]) -> None:
+        arr = _to_array(values)
+        self._register(name, arr.shape[0])
+        self._plain[name] = arr
+
+    def set_categorical(self, name: str, codes: np.ndarray, categories: Sequence[Any]) -> None:
+        """Store a column as integer codes into ``categories`` (no per-row objects)."""
+        codes = np.asarray(codes)
+        self._register(name, codes.shape[0])
+        self._codes[name] = codes
+        self._categories[name] = list(categories)
+
+    def is_categorical(self, name: str) -> bool:
+        return name in self._codes
+
+    def codes(self, name: str) -> Tuple[np.ndarray, List[Any]]:
+        """(codes, categories) of a categorical column."""
+        return self._codes[name], self._categories[name]
+
+    def column(self, name: str) -> np.ndarray:
+        """Column values in row order (categoricals are decoded)."""
+        if name in self._plain:
+            return self._plain[name]
+        categories = np.empty(len(self._categories[name]), dtype=object)
+        categories[:] = self._categories[name]
+        return categories[self._codes[name]]
+
+    def value(self, name: str, index: int) -> Any:
+        if name in self._plain:
+            v = self._plain[name][index]
+            return v.item() if isinstance(v, np.generic) else v
+        return self._categories[name][self._codes[name][index]]
+
+    # ------------------------------------------------------------ rows
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: int) -> StudentRow:  # type: ignore[override]
+        if isinstance(index, slice):
+            raise TypeError("use take() to select multiple rows")
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(index)
+        return StudentRow(self, index)
+
+    def __iter__(self) -> Iterator[StudentRow]:
+        return (StudentRow(self, i) for i in range(self._length))
+
+    def iter_tuples(
+        self,
+        columns: Sequence[str],
+        start: int = 0,
+        stop: Optional[int] = None,
+        *,
+        chunk_size: int = 65536,
+    ) -> Iterator[tuple]:
+        """Yield plain value tuples for ``columns`` (missing columns read as "")."""
+        stop = self._length if stop is None else min(stop, self._length)
+        for lo in range(start, stop, chunk_size):
+            hi = min(lo + chunk_size, stop)
+            cols = [
+                self.column_slice(c, lo, hi).tolist() if c in self else [""] * (hi - lo)
+                for c in columns
+            ]
+            yield from zip(*cols)
+
+    def column_slice(self, name: str, start: int, stop: int) -> np.ndarray:
+        """Decoded values of rows ``[start, stop)`` without decoding the whole column."""
+        if name in self._plain:
+            return self._plain[name][start:stop]
+        categories = np.empty(len(self._categories[name]), dtype=object)
+        categories[:] = self._categories[name]
+        return categories[self._codes[name][start:stop]]
+
+    def take(self, indices: Union[np.ndarray, Sequence[int]]) -> "StudentTable":
+        """New table with rows reordered/selected by ``indices``."""
+        idx = np.asarray(indices, dtype=np.intp)
+        out = StudentTable(idx.shape[0])
+        for name in self._order:
+            if name in self._plain:
+                out.set_column(name, self._plain[name][idx])
+            else:
+                out.set_categorical(name, self._codes[name][idx], self._categories[name])
+        return out
+
+    def copy(self) -> "StudentTable":
+        """Shallow copy: column arrays are shared, but adding or replacing a
+        column only affects the copy."""
+        out = StudentTable(self._length)
+        out._order = list(self._order)
+        out._plain = dict(self._plain)
+        out._codes = dict(self._codes)
+        out._categories = dict(self._categories)
+        return out
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        cols = self.columns
+        return [dict(zip(cols, row)) for row in self.iter_tuples(cols)]
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the table, including boxed objects."""
+        total = 0
+        for arr in self._plain.values():
+            total += arr.nbytes
+            if arr.dtype == object:
+                distinct = {id(v): v for v in arr.tolist()}
+                total += sum(sys.getsizeof(v) for v in distinct.values())
+        for name, codes in self._codes.items():
+            total += codes.nbytes + sum(sys.getsizeof(v) for v in self._categories[name])
+        return total
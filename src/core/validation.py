@@ -0,0 +1,277 @@
+"""
+Whole-cohort validation.
+
+Instead of failing on the first bad cell during import, every row is checked
+in one pass over the column arrays: numeric score and rank, choice codes
+against the preference table, duplicate student IDs and missing fields.
+Checks run once per distinct value (categorical columns once per category),
+and the findings are collected into a :class:`ValidationReport` that callers
+can show or export.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from src.core.admission import _norm_choice
+from src.core.cells import is_blank, normalize_id
+from src.core.schema import SOURCE_ROW_COLUMN
+from src.core.student_table import StudentTable
+
+# Severity labels (user-facing). Errors block admission; warnings describe
+# rows the engine handles on its own (e.g. invalid codes become 无效志愿).
+ERROR = "错误"
+WARNING = "提示"
+
+REPORT_HEADERS: Tuple[str, ...] = ("行号", "学号", "列", "级别", "问题", "值", "说明")
+
+
+@dataclass(frozen=True)
+class ValidationIssue:
+    row: int  # source line number; the header is line 1
+    student_id: Any
+    column: str
+    problem: str
+    value: Any
+    severity: str
+    note: str = ""
+
+    def as_tuple(self) -> Tuple[Any, ...]:
+        return (self.row, self.student_id, self.column, self.severity, self.problem, self.value, self.note)
+
+
+@dataclass(frozen=True)
+class ValidationReport:
+    n_rows: int
+    issues: Tuple[ValidationIssue, ...]
+
+    @property
+    def errors(self) -> List[ValidationIssue]:
+        return [i for i in self.issues if i.severity == ERROR]
+
+    @property
+    def warnings(self) -> List[ValidationIssue]:
+        return [i for i in self.issues if i.severity == WARNING]
+
+    @property
+    def ok(self) -> bool:
+        """True when nothing blocks admission (warnings are allowed)."""
+        return not any(i.severity == ERROR for i in self.issues)
+
+    def counts(self) -> Dict[Tuple[str, str], int]:
+        """Number of issues per (severity, problem), in first-seen order."""
+        counts: Dict[Tuple[str, str], int] = {}
+        for i in self.issues:
+            key = (i.severity, i.problem)
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+
+    def summary(self, limit: int = 10) -> str:
+        """Short multi-line text for a message box or stderr."""
+        lines = [
+            f"共 {self.n_rows} 行：{len(self.errors)} 个错误，{len(self.warnings)} 条提示"
+        ]
+        counts = sorted(self.counts().items(), key=lambda item: item[0][0] != ERROR)
+        for (severity, problem), n in counts:
+            lines.append(f"  [{severity}] {problem}：{n} 行")
+        shown = (self.errors or self.warnings)[:limit]
+        if shown:
+            lines.append("")
+            lines.extend(
+                f"  第 {i.row} 行 {i.column}：{i.problem}"
+                + ("" if is_blank(i.value) else f"（{i.value!r}）")
+                + (f"，{i.note}" if i.note else "")
+                for i in shown
+            )
+            remaining = len(self.errors or self.warnings) - len(shown)
+            if remaining > 0:
+                lines.append(f"  …… 另有 {remaining} 条")
+        return "\n".join(lines)
+
+    def rows(self) -> Iterator[Tuple[Any, ...]]:
+        """Issues as ``REPORT_HEADERS`` tuples, for the exporters."""
+        return (i.as_tuple() for i in self.issues)
+
+
+# ---------------------------------------------------------------- cell tests
+
+
+def _is_number(v: Any) -> bool:
+    if isinstance(v, bool):
+        return False
+    try:
+        return math.isfinite(float(v))
+    except (TypeError, ValueError):
+        return False
+
+
+def _map_distinct(values: np.ndarray, func: Callable[[Any], Any], dtype: Any) -> np.ndarray:
+    """Apply ``func`` once per distinct value of an object column."""
+    items = values.tolist()
+    try:
+        memo = {v: func(v) for v in set(items)}
+    except TypeError:  # unhashable cell values
+        return np.fromiter(map(func, items), dtype=dtype, count=len(items))
+    return np.fromiter(map(memo.__getitem__, items), dtype=dtype, count=len(items))
+
+
+def _cell_map(table: StudentTable, name: str, func: Callable[[Any], Any], dtype: Any) -> np.ndarray:
+    """``func`` over a column, once per category for categorical columns."""
+    if table.is_categorical(name):
+        codes, categories = table.codes(name)
+        lut = np.fromiter(map(func, categories), dtype=dtype, count=len(categories))
+        return lut[codes]
+    values = table.column(name)
+    if values.dtype != object:
+        values = values.astype(object)
+    return _map_distinct(values, func, dtype)
+
+
+def _text_column(table: StudentTable, name: str) -> Optional[np.ndarray]:
+    """Stripped fixed-width text array when every cell is a str, else None.
+
+    High-cardinality columns (IDs) gain nothing from per-distinct-value
+    memoisation, so they go through NumPy's string routines instead.
+    """
+    if table.is_categorical(name):
+        return None
+    values = table.column(name)
+    if values.dtype.kind == "U":
+        return np.char.strip(values)
+    if values.dtype != object or not all(type(v) is str for v in values.tolist()):
+        return None
+    return np.char.strip(values.astype(str))
+
+
+def _blank_mask(table: StudentTable, name: str) -> np.ndarray:
+    if name not in table:
+        return np.ones(len(table), dtype=bool)
+    if not table.is_categorical(name):
+        values = table.column(name)
+        if values.dtype.kind in "biu":
+            return np.zeros(len(table), dtype=bool)
+        if values.dtype.kind == "f":
+            return np.isnan(values)
+        text = _text_column(table, name)
+        if text is not None:
+            return np.char.str_len(text) == 0
+    return _cell_map(table, name, is_blank, bool)
+
+
+def has_values(table: StudentTable, name: str) -> bool:
+    """Whether ``name`` is a column of ``table`` with at least one non-blank cell.
+
+    Readers fill an optional column the file lacks (such as 排名) with blanks,
+    so the column's presence alone does not mean the data has it.
+    """
+    return name in table and not _blank_mask(table, name).all()
+
+
+def _not_numeric_mask(table: StudentTable, name: str) -> np.ndarray:
+    if not table.is_categorical(name):
+        values = table.column(name)
+        if values.dtype.kind in "biu":
+            return np.zeros(len(table), dtype=bool)
+        if values.dtype.kind == "f":
+            return ~np.isfinite(values)
+    return ~_cell_map(table, name, _is_number, bool)
+
+
+# ---------------------------------------------------------------- validation
+
+
+def validate_table(
+    table: StudentTable,
+    preference_mapping: Mapping[str, List[str]],
+    *,
+    id_key: str = "学号",
+    name_key: str = "姓名",
+    score_key: str = "分数",
+    rank_key: Optional[str] = "排名",
+    choice_key: str = "志愿选择",
+) -> ValidationReport:
+    """
+    Check every row of ``table`` and collect all problems.
+
+    Errors: missing or duplicate student ID, missing or non-numeric score,
+    non-numeric rank. Warnings: missing name, blank choice (adjustment only)
+    and choice codes not in ``preference_mapping`` (marked 无效志愿).
+    Row numbers come from the ``行号`` column of lenient imports, otherwise
+    the table position plus the header line.
+    """
+    n = len(table)
+    if SOURCE_ROW_COLUMN in table:
+        lines = np.asarray(table.column(SOURCE_ROW_COLUMN), dtype=np.int64)
+    else:
+        lines = np.arange(2, n + 2, dtype=np.int64)
+    found: List[Tuple[str, str, str, np.ndarray]] = []
+
+    def flag(column: str, problem: str, severity: str, mask: np.ndarray) -> None:
+        if mask.any():
+            found.append((column, problem, severity, np.flatnonzero(mask)))
+
+    # Student IDs: missing, then duplicates of an earlier row.
+    id_blank = _blank_mask(table, id_key)
+    flag(id_key, "缺少学号", ERROR, id_blank)
+    duplicate_of: Dict[int, int] = {}
+    if id_key in table and n:
+        keys = _text_column(table, id_key)
+        if keys is None:
+            keys = _cell_map(table, id_key, normalize_id, object).astype(str)
+        _, first, inverse, counts = np.unique(
+            keys, return_index=True, return_inverse=True, return_counts=True
+        )
+        inverse = inverse.reshape(-1)
+        dup = (counts[inverse] > 1) & (first[inverse] != np.arange(n)) & ~id_blank
+        for i in np.flatnonzero(dup).tolist():
+            duplicate_of[i] = int(lines[first[inverse[i]]])
+        flag(id_key, "学号重复", ERROR, dup)
+
+    # Score and rank must be numbers for sorting.
+    score_blank = _blank_mask(table, score_key)
+    flag(score_key, "缺少分数", ERROR, score_blank)
+    if score_key in table:
+        flag(score_key, "分数不是数字", ERROR, _not_numeric_mask(table, score_key) & ~score_blank)
+    # A rank column the file did not have is all blank: rank by score instead.
+    if rank_key and has_values(table, rank_key):
+        rank_blank = _blank_mask(table, rank_key)
+        flag(rank_key, "缺少排名", ERROR, rank_blank)
+        flag(rank_key, "排名不是数字", ERROR, _not_numeric_mask(table, rank_key) & ~rank_blank)
+
+    # Choice codes against the preference table.
+    if choice_key in table:
+        choice = _cell_map(table, choice_key, _norm_choice, object)
+        codes = np.array(list(preference_mapping), dtype=object)
+        blank = choice == ""
+        flag(choice_key, "未填志愿（只参加调剂）", WARNING, blank)
+        flag(choice_key, "志愿代码无效", WARNING, ~blank & ~np.isin(choice, codes))
+    if name_key in table:
+        flag(name_key, "缺少姓名", WARNING, _blank_mask(table, name_key))
+
+    issues: List[ValidationIssue] = []
+    if choice_key not in table:
+        # A header problem: reported once, on the header line.
+        issues.append(ValidationIssue(1, None, choice_key, "缺少志愿列", None, ERROR))
+    for column, problem, severity, rows in found:
+        present = column in table
+        for i in rows.tolist():
+            note = ""
+            if problem == "学号重复":
+                note = f"首次出现于第 {duplicate_of[i]} 行"
+            issues.append(
+                ValidationIssue(
+                    row=int(lines[i]),
+                    student_id=table.value(id_key, i) if id_key in table else None,
+                    column=column,
+                    problem=problem,
+                    value=table.value(column, i) if present else None,
+                    severity=severity,
+                    note=note,
+                )
+            )
+    issues.sort(key=lambda i: (i.row, i.severity != ERROR))
+    return ValidationReport(n_rows=n, issues=tuple(issues))
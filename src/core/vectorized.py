@@ -0,0 +1,487 @@
+"""
+Vectorized admission engine.
+
+Majors and choice codes are encoded as small integers and the cohort is kept
+in NumPy arrays, so a run is one stable argsort plus a handful of bulk array
+passes instead of a per-student Python loop. Results are identical to
+:func:`src.core.admission.assign_admissions`.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from src.core.admission import (
+    ADJUST_SUFFIX,
+    INVALID_CHOICE_LABEL,
+    UNASSIGNED_LABEL,
+    AdmissionMetrics,
+    AdmissionResult,
+    _norm_choice,
+    round_names,
+)
+from src.core.sort_keys import SortKeys, parse_key_column, prepare_sort_keys
+from src.core.student_table import StudentTable
+
+# Choice encoding: non-negative values index ``EncodedCohort.choice_codes``.
+CHOICE_BLANK = -1
+CHOICE_INVALID = -2
+
+# Outcome encoding: ``m`` admitted into major m, ``n_majors + m`` adjusted into m.
+OUTCOME_UNASSIGNED = -1
+OUTCOME_INVALID = -2
+
+
+@dataclass(frozen=True)
+class EncodedCohort:
+    """A cohort sorted once and encoded as arrays (all indexed by sorted position)."""
+
+    order: np.ndarray
+    choices: np.ndarray
+    scores: np.ndarray
+    choice_codes: Tuple[str, ...]
+    preferences: Tuple[Tuple[str, ...], ...]
+
+    def __len__(self) -> int:
+        return int(self.order.shape[0])
+
+
+@dataclass(frozen=True)
+class EncodedOutcome:
+    """Per-student outcome codes (by sorted position) plus the final quotas."""
+
+    assigned: np.ndarray
+    majors: Tuple[str, ...]
+    remaining_quotas: Dict[str, int]
+
+    def label_categories(
+        self,
+        *,
+        adjust_suffix: str = ADJUST_SUFFIX,
+        invalid_choice_label: str = INVALID_CHOICE_LABEL,
+        unassigned_label: str = UNASSIGNED_LABEL,
+    ) -> List[str]:
+        """Label for each outcome code, indexed by ``code + 2``."""
+        return (
+            [invalid_choice_label, unassigned_label]
+            + list(self.majors)
+            + [f"{m}{adjust_suffix}" for m in self.majors]
+        )
+
+    def labels(self, **label_kwargs: str) -> np.ndarray:
+        """Decode outcome codes into the label strings used by ``assign_admissions``."""
+        table = np.array(self.label_categories(**label_kwargs), dtype=object)
+        return table[self.assigned.astype(np.intp) + 2]
+
+
+def _encode_choices(raw: Sequence[Any], code_index: Mapping[str, int]) -> np.ndarray:
+    """Map raw choice values to integer codes, normalising each distinct value once."""
+
+    def encode(v: Any) -> int:
+        choice = _norm_choice(v)
+        if not choice:
+            return CHOICE_BLANK
+        return code_index.get(choice, CHOICE_INVALID)
+
+    if isinstance(raw, np.ndarray):
+        raw = raw.tolist()
+    try:
+        memo = {v: encode(v) for v in set(raw)}
+    except TypeError:  # unhashable cell values
+        return np.fromiter((encode(v) for v in raw), dtype=np.int16, count=len(raw))
+    return np.fromiter(map(memo.__getitem__, raw), dtype=np.int16, count=len(raw))
+
+
+def encode_arrays(
+    scores: Sequence[Any],
+    choices: Sequence[Any],
+    preference_mapping: Mapping[str, List[str]],
+    *,
+    sort_desc: bool = True,
+) -> EncodedCohort:
+    """Encode parallel score/choice columns (in input order) into a sorted cohort."""
+    code_index = {c: i for i, c in enumerate(preference_mapping)}
+    encoded = _encode_choices(choices, code_index)
+    return _build_cohort(SortKeys(parse_key_column(scores), sort_desc), encoded, preference_mapping)
+
+
+def _build_cohort(
+    keys: SortKeys,
+    encoded: np.ndarray,
+    preference_mapping: Mapping[str, List[str]],
+) -> EncodedCohort:
+    choice_codes = tuple(preference_mapping)
+    order = keys.order()
+    return EncodedCohort(
+        order=order,
+        choices=encoded[order],
+        scores=keys.primary[order],
+        choice_codes=choice_codes,
+        preferences=tuple(tuple(preference_mapping[c]) for c in choice_codes),
+    )
+
+
+def encode_students(
+    students: Sequence[Mapping[str, Any]],
+    preference_mapping: Mapping[str, List[str]],
+    *,
+    score_key: str = "分数",
+    sort_desc: bool = True,
+    choice_key: str = "志愿选择",
+    tie_break: Sequence[Tuple[str, bool]] = (),
+) -> EncodedCohort:
+    """Encode student mappings (or a ``StudentTable``) into a sorted cohort."""
+    if isinstance(students, StudentTable):
+        return encode_table(
+            students,
+            preference_mapping,
+            score_key=score_key,
+            sort_desc=sort_desc,
+            choice_key=choice_key,
+            tie_break=tie_break,
+        )
+    keys = prepare_sort_keys(students, score_key=score_key, sort_desc=sort_desc, tie_break=tie_break)
+    code_index = {c: i for i, c in enumerate(preference_mapping)}
+    encoded = _encode_choices([s.get(choice_key) for s in students], code_index)
+    return _build_cohort(keys, encoded, preference_mapping)
+
+
+def encode_table(
+    table: StudentTable,
+    preference_mapping: Mapping[str, List[str]],
+    *,
+    score_key: str = "分数",
+    sort_desc: bool = True,
+    choice_key: str = "志愿选择",
+    tie_break: Sequence[Tuple[str, bool]] = (),
+) -> EncodedCohort:
+    """Encode a ``StudentTable`` straight from its column arrays."""
+    n = len(table)
+    keys = prepare_sort_keys(table, score_key=score_key, sort_desc=sort_desc, tie_break=tie_break)
+    code_index = {c: i for i, c in enumerate(preference_mapping)}
+    if choice_key not in table:
+        encoded = _encode_choices([None] * n, code_index)
+    elif table.is_categorical(choice_key):
+        # Only the distinct categories need normalising.
+        codes, categories = table.codes(choice_key)
+        encoded = _encode_choices(categories, code_index)[codes]
+    else:
+        encoded = _encode_choices(table.column(choice_key), code_index)
+    return _build_cohort(keys, encoded, preference_mapping)
+
+
+def _major_universe(
+    cohort: EncodedCohort, quotas: Mapping[str, int]
+) -> Tuple[Tuple[str, ...], np.ndarray]:
+    """Quota majors first (adjustment order), then preference-only majors (never open)."""
+    majors = list(quotas)
+    seen = set(majors)
+    for prefs in cohort.preferences:
+        for m in prefs:
+            if m not in seen:
+                seen.add(m)
+                majors.append(m)
+    remaining = np.zeros(len(majors), dtype=np.int64)
+    remaining[: len(quotas)] = [int(v) for v in quotas.values()]
+    return tuple(majors), remaining
+
+
+def _outcome_lut(
+    pref_idx: List[List[int]], is_open: np.ndarray, n_quota_majors: int
+) -> np.ndarray:
+    """Outcome for each choice value (shifted by +2) given the set of open majors."""
+    n_majors = is_open.shape[0]
+    adjust = OUTCOME_UNASSIGNED
+    for m in range(n_quota_majors):
+        if is_open[m]:
+            adjust = n_majors + m
+            break
+    lut = np.empty(len(pref_idx) + 2, dtype=np.int16)
+    lut[0] = OUTCOME_INVALID
+    lut[1] = adjust
+    for c, prefs in enumerate(pref_idx):
+        lut[c + 2] = adjust
+        for m in prefs:
+            if is_open[m]:
+                lut[c + 2] = m
+                break
+    return lut
+
+
+def _resolve_scan(
+    choices: np.ndarray,
+    pref_idx: List[List[int]],
+    remaining: np.ndarray,
+    n_quota_majors: int,
+) -> np.ndarray:
+    """
+    Resolve outcomes epoch by epoch.
+
+    The open-major set only shrinks, and only when some major fills. Between two
+    fills every student's outcome is a pure function of their choice code, so
+    each epoch is a table lookup followed by locating the next fill position.
+    """
+    n = choices.shape[0]
+    n_majors = remaining.shape[0]
+    out = np.empty(n, dtype=np.int16)
+    shifted = choices.astype(np.intp) + 2
+    p = 0
+    while p < n:
+        is_open = remaining > 0
+        lut = _outcome_lut(pref_idx, is_open, n_quota_majors)
+        tgt = lut[shifted[p:]]
+        if not is_open.any():
+            out[p:] = tgt
+            break
+        major_of = np.where(tgt >= n_majors, tgt - n_majors, tgt)
+        end = n
+        for m in np.flatnonzero(is_open):
+            hits = np.flatnonzero(major_of == m)
+            q = int(remaining[m])
+            if hits.shape[0] >= q:
+                end = min(end, p + int(hits[q - 1]) + 1)
+        seg = tgt[: end - p]
+        out[p:end] = seg
+        taken = seg[seg >= 0]
+        taken = np.where(taken >= n_majors, taken - n_majors, taken)
+        remaining -= np.bincount(taken, minlength=n_majors)
+        p = end
+    return out
+
+
+def _resolve_buckets(
+    choices: np.ndarray,
+    pref_idx: List[List[int]],
+    remaining: np.ndarray,
+    n_quota_majors: int,
+) -> np.ndarray:
+    """
+    Resolve outcomes from per-choice-code position buckets.
+
+    Students are grouped by choice code in rank order once. Each epoch then
+    finds where every open major fills by binary-searching the bucket
+    positions of the codes currently targeting it, so no per-epoch pass over
+    the cohort is needed. Once no major is open, the rest of the cohort is
+    labelled in one slice. Total cost after sorting is one grouping pass and
+    one labelling pass.
+    """
+    n = choices.shape[0]
+    n_majors = remaining.shape[0]
+    shifted = choices.astype(np.intp) + 2
+    n_values = len(pref_idx) + 2
+    # Stable sort on the int16 codes is a radix sort, O(n).
+    grouped = np.argsort(choices, kind="stable")
+    bounds = np.concatenate(([0], np.cumsum(np.bincount(shifted, minlength=n_values))))
+    buckets = [grouped[bounds[v] : bounds[v + 1]] for v in range(n_values)]
+
+    def taken_between(values: List[int], lo: int, hi: int) -> int:
+        return sum(
+            int(np.searchsorted(buckets[v], hi) - np.searchsorted(buckets[v], lo)) for v in values
+        )
+
+    epochs = []
+    p = 0
+    while p < n:
+        is_open = remaining > 0
+        lut = _outcome_lut(pref_idx, is_open, n_quota_majors)
+        if not is_open.any():
+            # Every quota is exhausted: one bulk slice labels the remainder.
+            epochs.append((p, n, lut))
+            break
+        target = np.where(lut >= n_majors, lut - n_majors, lut)
+        groups = {int(m): [v for v in range(n_values) if target[v] == m] for m in np.flatnonzero(is_open)}
+        end = n
+        for m, values in groups.items():
+            q = int(remaining[m])
+            if taken_between(values, p, end) < q:
+                continue
+            # Smallest hi with q seats of m taken in [p, hi).
+            lo, hi = p, end
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if taken_between(values, p, mid) >= q:
+                    hi = mid
+                else:
+                    lo = mid + 1
+            end = lo
+        for m, values in groups.items():
+            remaining[m] -= taken_between(values, p, end)
+        epochs.append((p, end, lut))
+        p = end
+
+    out = np.empty(n, dtype=np.int16)
+    for lo, hi, lut in epochs:
+        out[lo:hi] = lut[shifted[lo:hi]]
+    return out
+
+
+# Above this many choice codes the per-code buckets stop paying off.
+BUCKET_MAX_CODES = 64
+
+
+def _resolve(
+    choices: np.ndarray,
+    pref_idx: List[List[int]],
+    remaining: np.ndarray,
+    n_quota_majors: int,
+    method: str = "auto",
+) -> np.ndarray:
+    if method == "auto":
+        method = "buckets" if len(pref_idx) <= BUCKET_MAX_CODES else "scan"
+    if method == "buckets":
+        return _resolve_buckets(choices, pref_idx, remaining, n_quota_majors)
+    if method == "scan":
+        return _resolve_scan(choices, pref_idx, remaining, n_quota_majors)
+    raise ValueError(f"unknown method: {method!r}")
+
+
+def assign_encoded(
+    cohort: EncodedCohort, quotas: Mapping[str, int], *, method: str = "auto"
+) -> EncodedOutcome:
+    """
+    Run admissions on an encoded cohort without touching per-student objects.
+
+    ``method`` is ``"buckets"`` (default for small mappings), ``"scan"`` or
+    ``"auto"``; all give identical outcomes.
+    """
+    majors, remaining = _major_universe(cohort, quotas)
+    major_index = {m: i for i, m in enumerate(majors)}
+    pref_idx = [[major_index[m] for m in prefs] for prefs in cohort.preferences]
+    start = remaining.copy()
+    assigned = _resolve(cohort.choices, pref_idx, remaining, len(quotas), method)
+    used = start - remaining
+    final = {m: int(v) - int(used[i]) for i, (m, v) in enumerate(quotas.items())}
+    return EncodedOutcome(assigned=assigned, majors=majors, remaining_quotas=final)
+
+
+def outcome_metrics(cohort: EncodedCohort, outcome: EncodedOutcome) -> AdmissionMetrics:
+    """
+    Per-major, per-round counts and cutoffs from the outcome codes.
+
+    The round of a direct admission is the major's position in the student's
+    preference list; adjusted students form the last round. One ``bincount``
+    gives the counts, and ``maximum.at`` finds the last sorted position in
+    each (major, round) cell, whose score is its cutoff.
+    """
+    n_majors = len(outcome.majors)
+    n_pref = max((len(p) for p in cohort.preferences), default=0)
+    n_rounds = n_pref + 1
+    major_index = {m: i for i, m in enumerate(outcome.majors)}
+    round_lut = np.zeros((max(len(cohort.preferences), 1), n_majors), dtype=np.intp)
+    for c, prefs in enumerate(cohort.preferences):
+        # Reversed so a major listed twice counts at its first position.
+        for r, m in reversed(list(enumerate(prefs))):
+            round_lut[c, major_index[m]] = r
+
+    assigned = outcome.assigned.astype(np.intp)
+    placed = np.flatnonzero(assigned >= 0)
+    codes = assigned[placed]
+    adjusted = codes >= n_majors
+    major = np.where(adjusted, codes - n_majors, codes)
+    choice = np.maximum(cohort.choices[placed], 0)
+    rnd = np.where(adjusted, n_pref, round_lut[choice, major])
+    cell = major * n_rounds + rnd
+    counts = np.bincount(cell, minlength=n_majors * n_rounds).reshape(n_majors, n_rounds)
+    last = np.full(n_majors * n_rounds, -1, dtype=np.intp)
+    np.maximum.at(last, cell, placed)
+    cutoffs = np.full(n_majors * n_rounds, np.nan)
+    filled = last >= 0
+    cutoffs[filled] = cohort.scores[last[filled]]
+    cutoffs = cutoffs.reshape(n_majors, n_rounds)
+
+    rounds = round_names(n_pref)
+    n_quota = len(outcome.remaining_quotas)
+    return AdmissionMetrics(
+        rounds=rounds,
+        counts={m: tuple(int(v) for v in counts[i]) for i, m in enumerate(outcome.majors[:n_quota])},
+        cutoffs={
+            m: tuple(None if np.isnan(v) else float(v) for v in cutoffs[i])
+            for i, m in enumerate(outcome.majors[:n_quota])
+        },
+        invalid=int(np.count_nonzero(assigned == OUTCOME_INVALID)),
+        unassigned=int(np.count_nonzero(assigned == OUTCOME_UNASSIGNED)),
+    )
+
+
+def assign_admissions_vectorized(
+    students: Iterable[Mapping[str, Any]],
+    quotas: Mapping[str, int],
+    preference_mapping: Mapping[str, List[str]],
+    *,
+    score_key: str = "分数",
+    sort_desc: bool = True,
+    choice_key: str = "志愿选择",
+    assigned_key: str = "录取专业",
+    adjust_suffix: str = ADJUST_SUFFIX,
+    invalid_choice_label: str = INVALID_CHOICE_LABEL,
+    unassigned_label: str = UNASSIGNED_LABEL,
+    tie_break: Sequence[Tuple[str, bool]] = (),
+) -> AdmissionResult:
+    """
+    Drop-in replacement for ``assign_admissions`` backed by the array engine.
+
+    This is a compatibility wrapper; the fast entry point is ``encode_table``
+    (or ``encode_students``) once, then ``assign_encoded`` per quota set,
+    reading the labels from ``EncodedOutcome``. On 1M students that is over
+    20x faster than ``assign_admissions`` (``python -m src.bench``, stage
+    ``assign_encoded``).
+
+    A ``StudentTable`` input is not copied row by row: the result's
+    ``students`` is a reordered table with a categorical ``assigned_key``.
+    Reordering its object columns (学号, 姓名) takes most of the time, so
+    this path is only 10-15x faster (stage ``assign_table``).
+
+    Student mappings return new dicts, as ``assign_admissions`` does. Reading
+    the columns out of the mappings and copying every mapping in priority
+    order dominate that path, so it is at most about 2x faster than
+    ``assign_admissions`` (1M students: ~2 s vs ~3.4 s).
+    """
+    label_kwargs = dict(
+        adjust_suffix=adjust_suffix,
+        invalid_choice_label=invalid_choice_label,
+        unassigned_label=unassigned_label,
+    )
+    if isinstance(students, StudentTable):
+        cohort = encode_table(
+            students,
+            preference_mapping,
+            score_key=score_key,
+            sort_desc=sort_desc,
+            choice_key=choice_key,
+            tie_break=tie_break,
+        )
+        outcome = assign_encoded(cohort, quotas)
+        table = students.take(cohort.order)
+        table.set_categorical(
+            assigned_key, outcome.assigned + 2, outcome.label_categories(**label_kwargs)
+        )
+        return AdmissionResult(
+            students=table,
+            remaining_quotas=outcome.remaining_quotas,
+            metrics=outcome_metrics(cohort, outcome),
+        )
+
+    items = students if isinstance(students, list) else list(students)
+    cohort = encode_students(
+        items,
+        preference_mapping,
+        score_key=score_key,
+        sort_desc=sort_desc,
+        choice_key=choice_key,
+        tie_break=tie_break,
+    )
+    outcome = assign_encoded(cohort, quotas)
+    labels = outcome.labels(**label_kwargs)
+
+    out: List[Dict[str, Any]] = [
+        {**items[idx], assigned_key: label}
+        for idx, label in zip(cohort.order.tolist(), labels.tolist())
+    ]
+    return AdmissionResult(
+        students=out,
+        remaining_quotas=outcome.remaining_quotas,
+        metrics=outcome_metrics(cohort, outcome),
+    )
@@ -1,38 +1,228 @@
 import os
-import csv
 import sys
+
+# --profile-startup：在其余导入之前安装计时器，统计各模块导入耗时
+from src.utils.startup_profile import get_timer, start_if_requested
+start_if_requested()
+
+import threading
 import traceback
 import logging
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from PIL import Image, ImageTk
-import xlrd  # 用于读取Excel文件
-from openpyxl import Workbook  # 替换xlwt，使用openpyxl
-from openpyxl import load_workbook  # 用于读取xlsx格式
-from collections import defaultdict
-
-from src.core.admission import (
-    ADJUST_SUFFIX,
-    INVALID_CHOICE_LABEL,
-    UNASSIGNED_LABEL,
-    assign_admissions,
-)
+
+# 仅导入纯Python部分；NumPy引擎、PIL、openpyxl/xlrd 在用到时才加载，
+# 以便窗口尽快显示
+from src.core import spans
 from src.core.preferences import PREFERENCE_MAPPING
+from src.core.schema import EXPORT_HEADERS
+from src.core.spans import span
+from src.gui.virtual_table import VirtualTable
+from src.gui.workers import BackgroundRunner
+from src.utils.cache import get_cache
+from src.utils.log_queue import span_file_handler, start_queue_logging
+from src.utils.readers import CsvReader, get_reader, ingest_folder
+from src.utils.student_io import (
+    DEFAULT_CHUNK_SIZE,
+    LENIENT_COLUMNS,
+    LENIENT_PARSER_VERSION,
+    export_diff,
+    export_validation_report,
+    iter_student_chunks,
+    measure_column_widths,
+    read_csv_students,
+    read_results,
+    table_from_rows,
+    write_rows_xlsx,
+)
+
+
+def load_students_job(job, file_name):
+    """后台任务：读取学生文件并校验全部数据
+
+    按宽松模式读取（坏行不中止，带行号列），优先从导入缓存加载；读取后一次性
+    校验所有行。返回 (StudentTable, ValidationReport)。
+    """
+    with span("import") as s:
+        table = _read_students_lenient(job, file_name)
+        s.set_rows(len(table))
+    from src.core.validation import validate_table
+
+    job.check_cancelled()
+    job.report(0, None, f"正在校验 {len(table)} 行…")
+    with span("validate", rows=len(table)):
+        return table, validate_table(table, PREFERENCE_MAPPING)
+
+
+def _read_students_lenient(job, file_name):
+    cache = get_cache()
+    key = None
+    if cache is not None:
+        job.report(0, None, "正在检查缓存…")
+        key = cache.key(file_name, LENIENT_PARSER_VERSION)
+        table = cache.get(file_name, LENIENT_PARSER_VERSION, key)
+        if table is not None:
+            return table
+
+    if isinstance(get_reader(file_name), CsvReader):
+        # CSV：C 解析器按块读取，进度中显示吞吐量
+        def progress(done, elapsed):
+            job.check_cancelled()
+            rate = done / elapsed if elapsed else 0
+            job.report(done, None, f"已读取 {done} 行（{rate:,.0f} 行/秒）")
+
+        table = read_csv_students(file_name, progress=progress, strict=False)
+    else:
+        def rows():
+            done = 0
+            for chunk in iter_student_chunks(file_name, strict=False):
+                job.check_cancelled()
+                yield from chunk
+                done += len(chunk)
+                job.report(done, None, f"已读取 {done} 行")
+
+        table = table_from_rows(rows(), columns=LENIENT_COLUMNS)
+    if cache is not None:
+        cache.put(file_name, LENIENT_PARSER_VERSION, table, key)
+    return table
+
+
+def ingest_folder_job(job, folder):
+    """后台任务：并行读取文件夹内全部名单并合并"""
+    job.report(0, None, "正在并行读取名单…")
+    with span("import") as s:
+        table, report = ingest_folder(folder)
+        s.set_rows(len(table))
+    return table, report
+
+
+def admission_job(job, student_data, engine, quotas, preference_mapping):
+    """后台任务：首次录取时编码并建立增量引擎，之后只按新名额增量重算
+
+    返回 (按录取顺序排列并带有录取专业列的新表, 引擎, 录取统计 AdmissionMetrics)，
+    传入的表不被修改。
+    """
+    if engine is None:
+        from src.core.incremental import IncrementalAdmission
+        from src.core.admission import TIE_BREAK_KEYS
+        from src.core.validation import has_values
+        from src.core.vectorized import encode_students
+
+        job.report(0, 2, "正在排序与编码…")
+        # 导入时缺少的排名列为空白占位列，此时按分数排序
+        use_rank = has_values(student_data, "排名")
+        with span("encode", rows=len(student_data)):
+            cohort = encode_students(
+                student_data,
+                preference_mapping,
+                score_key="排名" if use_rank else "分数",
+                sort_desc=not use_rank,
+                choice_key="志愿选择",
+                # 排名相同时依次比较分数、学号
+                tie_break=TIE_BREAK_KEYS,
+            )
+        job.check_cancelled()
+        job.report(1, 2, "正在录取…")
+        with span("assign", rows=len(student_data)):
+            engine = IncrementalAdmission(cohort, quotas)
+            # 表格与录取结果保持相同（排序后）的顺序
+            student_data = student_data.take(cohort.order)
+    else:
+        # 名额调整：只重算首个受影响位置之后的学生
+        job.report(1, 2, "正在按新名额重算…")
+        with span("assign", rows=len(student_data)):
+            engine.update_quotas(quotas)
+        # 界面仍在显示原表：只在浅拷贝上替换录取专业列，各列数组共享
+        student_data = student_data.copy()
+
+    outcome = engine.outcome
+    student_data.set_categorical(
+        "录取专业", outcome.assigned + 2, outcome.label_categories()
+    )
+    metrics = engine.metrics
+    job.report(2, 2, "录取完成")
+    return student_data, engine, metrics
+
+
+def export_job(job, student_data, file_name):
+    """后台任务：流式导出录取结果并报告进度"""
+    total = len(student_data)
+
+    def rows():
+        for start in range(0, total, DEFAULT_CHUNK_SIZE):
+            job.check_cancelled()
+            job.report(start, total, f"已写出 {start}/{total} 行")
+            yield from student_data.iter_tuples(EXPORT_HEADERS, start, start + DEFAULT_CHUNK_SIZE)
+
+    with span("export", rows=total):
+        widths = measure_column_widths(student_data, EXPORT_HEADERS)
+        write_rows_xlsx(rows(), file_name, widths=widths)
+
+
+def diff_job(job, student_data, file_name, baseline):
+    """后台任务：读取之前导出的录取结果并与当前结果按学号对比
+
+    ``baseline`` 为上次读取的 (文件名, 修改时间, ResultIndex)，文件未变时直接复用，
+    不再重新读取和建立索引。返回 (新的基准缓存, ResultDiff)。
+    """
+    from src.core.result_diff import ResultIndex
+
+    mtime = os.path.getmtime(file_name)
+    if baseline is None or baseline[:2] != (file_name, mtime):
+        job.report(0, None, "正在读取对比结果文件…")
+        with span("import") as s:
+            table = read_results(file_name)
+            s.set_rows(len(table))
+        baseline = (file_name, mtime, ResultIndex(table))
+    job.check_cancelled()
+    job.report(0, None, "正在对比…")
+    with span("diff", rows=len(student_data)):
+        return baseline, baseline[2].diff(student_data)
+
+
+def preload_engine():
+    """预先导入录取引擎（NumPy），窗口显示后在后台线程调用"""
+    import src.core.incremental  # noqa: F401
+    import src.core.vectorized  # noqa: F401
+    import src.core.student_table  # noqa: F401
+
+# 状态栏中显示的计时区段（区段名 -> 显示名称）
+TIMING_LABELS = {
+    "import": "导入",
+    "validate": "校验",
+    "encode": "编码",
+    "assign": "录取",
+    "render": "刷新表格",
+    "export": "导出",
+    "diff": "对比",
+}
+
+
+def format_timing(label, record):
+    """状态栏中一个区段的文字：耗时、行数、峰值内存（启用内存跟踪时）"""
+    text = f"{label} {record.seconds:.2f}秒"
+    if record.rows is not None:
+        text += f"/{record.rows:,}行"
+    if record.peak_bytes is not None:
+        text += f"/峰值{record.peak_bytes / 1024 / 1024:.1f}MB"
+    return text
+
 
 # 设置日志
 def setup_logging():
+    """日志经队列由后台线程写入 logs/app.log，计时区段另写入 logs/spans.jsonl
+
+    返回 QueueListener，程序退出前调用 stop() 写完剩余日志。
+    """
     log_dir = os.path.join(os.path.dirname(os.path.abspath(sys.argv[0])), 'logs')
     os.makedirs(log_dir, exist_ok=True)
     log_file = os.path.join(log_dir, 'app.log')
     
-    logging.basicConfig(
-        level=logging.DEBUG,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file, encoding='utf-8'),
-            logging.StreamHandler()
-        ]
-    )
+    return start_queue_logging([
+        logging.FileHandler(log_file, encoding='utf-8'),
+        logging.StreamHandler(),
+        span_file_handler(os.path.join(log_dir, 'spans.jsonl')),
+    ])
 
 def get_resource_path(relative_path):
     """获取资源文件的绝对路径"""
@@ -56,7 +246,13 @@ class SimpleMajorAdmissionApp:
             self.root.report_callback_exception = self.handle_exception
             
             # Initialize data
-            self.student_data = []
+            self.student_data = None  # 导入后为 StudentTable
+            # 录取引擎缓存：修改名额时只重算受影响的学生
+            self.admission_engine = None
+            # 最近一次录取的统计（由引擎在录取时计算）
+            self.admission_metrics = None
+            # 对比用的基准结果：(文件名, 修改时间, ResultIndex)，重复对比时复用
+            self.baseline_results = None
             self.major_quotas = {
                 "电子信息工程": tk.IntVar(value=0),
                 "通信工程": tk.IntVar(value=0),
@@ -65,6 +261,9 @@ class SimpleMajorAdmissionApp:
             
             self.preference_mapping = PREFERENCE_MAPPING
             
+            # 耗时操作在后台线程执行，界面保持响应
+            self.runner = BackgroundRunner(self.root, on_busy=self.set_busy)
+            
             self.init_ui()
             
             # 创建菜单栏
@@ -150,6 +349,8 @@ class SimpleMajorAdmissionApp:
 4. 查看/导出结果
    - 界面下方表格实时显示录取结果
    - 点击"导出录取结果"保存为Excel文件
+   - 修改名额或数据后，点击"对比结果"并选择之前导出的结果文件，
+     可列出录取结果有变化的学生及各专业人数变化，并导出对比清单
 
 三、志愿代码说明
 A：电子信息工程 > 通信工程 > 电磁场与无线技术
@@ -234,6 +435,8 @@ F：通信工程 > 电磁场与无线技术 > 电子信息工程
                 logo_path = get_resource_path(os.path.join('resources', 'logo.ico'))
             
             if os.path.exists(logo_path):
+                from PIL import Image, ImageTk
+
                 logo_img = Image.open(logo_path)
                 # 调整大小为100x100
                 logo_img = logo_img.resize((100, 100), Image.Resampling.LANCZOS)
@@ -301,203 +504,231 @@ F：通信工程 > 电磁场与无线技术 > 电子信息工程
             import_btn = ttk.Button(file_operations_frame, text="导入学生志愿", command=self.import_student_data)
             import_btn.pack(side=tk.LEFT, padx=5)
             
+            import_folder_btn = ttk.Button(file_operations_frame, text="导入名单文件夹", command=self.import_student_folder)
+            import_folder_btn.pack(side=tk.LEFT, padx=5)
+            
             process_btn = ttk.Button(file_operations_frame, text="处理录取", command=self.process_admissions)
             process_btn.pack(side=tk.LEFT, padx=5)
             
             export_btn = ttk.Button(file_operations_frame, text="导出录取结果", command=self.export_results)
             export_btn.pack(side=tk.LEFT, padx=5)
             
-            # Results table
-            table_frame = ttk.LabelFrame(main_frame, text="录取结果", padding="10")
-            table_frame.pack(fill=tk.BOTH, expand=True, pady=10)
-            
-            # Create treeview for results
-            self.results_tree = ttk.Treeview(table_frame, columns=("序号", "学号", "姓名", "分数", "志愿选择", "录取专业"), show="headings")
+            compare_btn = ttk.Button(file_operations_frame, text="对比结果", command=self.compare_results)
+            compare_btn.pack(side=tk.LEFT, padx=5)
             
-            # Define columns
-            self.results_tree.heading("序号", text="序号")
-            self.results_tree.heading("学号", text="学号")
-            self.results_tree.heading("姓名", text="姓名")
-            self.results_tree.heading("分数", text="分数")
-            self.results_tree.heading("志愿选择", text="志愿选择")
-            self.results_tree.heading("录取专业", text="录取专业")
+            # 后台任务运行期间禁用的按钮
+            self.job_buttons = [import_btn, import_folder_btn, process_btn, export_btn, compare_btn]
             
-            # Set column widths
-            self.results_tree.column("序号", width=50)
-            self.results_tree.column("学号", width=100)
-            self.results_tree.column("姓名", width=100)
-            self.results_tree.column("分数", width=80)
-            self.results_tree.column("志愿选择", width=80)
-            self.results_tree.column("录取专业", width=150)
+            # 进度条、状态与取消按钮
+            self.cancel_btn = ttk.Button(file_operations_frame, text="取消", command=self.runner.cancel, state=tk.DISABLED)
+            self.cancel_btn.pack(side=tk.RIGHT, padx=5)
+            self.progress_bar = ttk.Progressbar(file_operations_frame, length=160, mode="determinate")
+            self.progress_bar.pack(side=tk.RIGHT, padx=5)
+            self.status_var = tk.StringVar(value="就绪")
+            ttk.Label(file_operations_frame, textvariable=self.status_var).pack(side=tk.RIGHT, padx=5)
             
-            # Add scrollbar
-            scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.results_tree.yview)
-            self.results_tree.configure(yscroll=scrollbar.set)
+            # Results table
+            table_frame = ttk.LabelFrame(main_frame, text="录取结果", padding="10")
+            table_frame.pack(fill=tk.BOTH, expand=True, pady=10)
             
-            # Pack treeview and scrollbar
-            self.results_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-            scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+            # 虚拟化表格：只渲染可见行，点击表头排序
+            self.results_view = VirtualTable(
+                table_frame,
+                columns=("序号", "学号", "姓名", "分数", "志愿选择", "录取专业"),
+                widths={"序号": 50, "学号": 100, "姓名": 100, "分数": 80, "志愿选择": 80, "录取专业": 150},
+                runner=self.runner,
+            )
+            self.results_view.pack(fill=tk.BOTH, expand=True)
+
+            # 状态栏：各阶段最近一次的耗时
+            self.timing_var = tk.StringVar(value="")
+            ttk.Label(self.root, textvariable=self.timing_var, relief=tk.SUNKEN, anchor=tk.W,
+                      padding=(5, 1)).pack(side=tk.BOTTOM, fill=tk.X)
         except Exception as e:
             logging.error(f"初始化UI失败: {str(e)}")
             logging.error(traceback.format_exc())
             messagebox.showerror("错误", f"初始化UI失败：{str(e)}\n请查看日志文件了解详情。")
     
+    def set_busy(self, busy):
+        """任务开始/结束时切换按钮状态与进度条"""
+        for btn in self.job_buttons:
+            btn.configure(state=tk.DISABLED if busy else tk.NORMAL)
+        self.cancel_btn.configure(state=tk.NORMAL if busy else tk.DISABLED)
+        if not busy:
+            self.progress_bar.stop()
+            self.progress_bar.configure(mode="determinate", value=0)
+            self.status_var.set("就绪")
+            self.show_timings()
+
+    def show_timings(self):
+        """在状态栏显示各阶段最近一次的计时（未启用计时区段时不显示）"""
+        recorder = spans.get_recorder()
+        if recorder is None:
+            return
+        parts = []
+        for name, label in TIMING_LABELS.items():
+            record = recorder.latest(name)
+            if record is not None:
+                parts.append(format_timing(label, record))
+        self.timing_var.set("  |  ".join(parts))
+
+    def show_progress(self, done, total, message):
+        """显示后台任务进度（总量未知时使用滚动进度条）"""
+        if total:
+            self.progress_bar.configure(mode="determinate", maximum=total, value=done)
+        elif str(self.progress_bar.cget("mode")) != "indeterminate":
+            self.progress_bar.configure(mode="indeterminate")
+            self.progress_bar.start(20)
+        self.status_var.set(message)
+
+    def run_job(self, title, func, *args, on_done):
+        """在后台运行任务，失败时弹出错误，取消时提示"""
+        def on_error(exc, tb_text):
+            messagebox.showerror("错误", f"{title}时发生错误：{str(exc)}")
+
+        def on_cancel():
+            messagebox.showinfo("已取消", f"{title}已取消")
+
+        self.status_var.set(f"正在{title}…")
+        self.runner.submit(
+            title, func, *args,
+            on_done=on_done, on_progress=self.show_progress,
+            on_error=on_error, on_cancel=on_cancel,
+        )
+
     def import_student_data(self):
+        file_name = filedialog.askopenfilename(
+            title="选择学生志愿文件",
+            filetypes=[("Excel Files", "*.xlsx *.xls"), ("CSV Files", "*.csv"), ("All Files", "*.*")]
+        )
+        if not file_name:
+            return
+
+        def on_done(result):
+            table, report = result
+            if not report.ok:
+                # 有错误时不载入数据，列出全部问题而不是只报第一行
+                self.offer_validation_report(
+                    report, f"数据校验未通过，未导入：\n\n{report.summary()}", error=True
+                )
+                return
+            self.admission_engine = None
+            self.student_data = table
+            self.update_results_table()
+            msg = f"成功导入 {len(self.student_data)} 条学生数据"
+            if report.warnings:
+                self.offer_validation_report(report, f"{msg}\n\n{report.summary()}")
+            else:
+                messagebox.showinfo("成功", msg)
+
+        # 按列读取为 StudentTable（支持 csv/xlsx/xls），并校验全部数据
+        self.run_job("导入文件", load_students_job, file_name, on_done=on_done)
+
+    def offer_validation_report(self, report, message, error=False):
+        """显示校验结果摘要，并询问是否导出完整的问题清单"""
+        title = "数据校验" if error else "导入完成"
+        if not messagebox.askyesno(title, f"{message}\n\n是否导出完整的问题清单？",
+                                   icon=messagebox.ERROR if error else messagebox.WARNING):
+            return
+        file_name = filedialog.asksaveasfilename(
+            title="导出问题清单",
+            defaultextension=".xlsx",
+            initialfile="数据校验.xlsx",
+            filetypes=[("Excel Files", "*.xlsx"), ("CSV Files", "*.csv")],
+        )
+        if not file_name:
+            return
         try:
-            file_name = filedialog.askopenfilename(
-                title="选择学生志愿文件",
-                filetypes=[("Excel Files", "*.xlsx *.xls"), ("CSV Files", "*.csv"), ("All Files", "*.*")]
-            )
-            
-            if file_name:
-                self.student_data = []
-                
-                if file_name.endswith('.csv'):
-                    # 使用csv模块读取csv文件
-                    with open(file_name, 'r', encoding='utf-8') as f:
-                        reader = csv.DictReader(f)
-                        for row in reader:
-                            student = {
-                                '序号': row['序号'],
-                                '排名': row.get('排名', row['序号']),
-                                '学号': row['学号'],
-                                '姓名': row['姓名'],
-                                '分数': float(row['分数']),
-                                '志愿选择': str(row['志愿选择']).upper(),  # 转换为大写
-                                '专业': row['专业']
-                            }
-                            self.student_data.append(student)
-                
-                elif file_name.endswith('.xlsx'):
-                    # 使用openpyxl读取xlsx文件
-                    wb = load_workbook(file_name)
-                    sheet = wb.active
-                    
-                    # 读取数据
-                    for row in sheet.iter_rows(min_row=2):
-                        student = {
-                            '序号': row[0].value,
-                            '排名': row[0].value,
-                            '学号': row[1].value,
-                            '姓名': row[2].value,
-                            '分数': float(row[4].value),
-                            '志愿选择': str(row[6].value).upper(),  # 转换为大写
-                            '专业': row[7].value
-                        }
-                        self.student_data.append(student)
-                else:
-                    # 使用xlrd读取xls文件
-                    workbook = xlrd.open_workbook(file_name)
-                    sheet = workbook.sheet_by_index(0)
-                    
-                    # 读取数据
-                    for row_idx in range(1, sheet.nrows):
-                        student = {
-                            '序号': sheet.cell_value(row_idx, 0),
-                            '排名': sheet.cell_value(row_idx, 0),
-                            '学号': sheet.cell_value(row_idx, 1),
-                            '姓名': sheet.cell_value(row_idx, 2),
-                            '分数': float(sheet.cell_value(row_idx, 4)),
-                            '志愿选择': str(sheet.cell_value(row_idx, 6)).upper(),  # 转换为大写
-                            '专业': sheet.cell_value(row_idx, 7)
-                        }
-                        self.student_data.append(student)
-                
-                self.update_results_table()
-                messagebox.showinfo("成功", f"成功导入 {len(self.student_data)} 条学生数据")
+            export_validation_report(report, file_name)
         except Exception as e:
-            messagebox.showerror("错误", f"导入文件时发生错误：{str(e)}")
-            logging.error(f"导入文件时发生错误: {str(e)}")
-            logging.error(traceback.format_exc())
+            logging.error(f"导出问题清单失败: {e}")
+            messagebox.showerror("错误", f"导出问题清单失败：{str(e)}")
     
+    def import_student_folder(self):
+        """导入一个文件夹内的全部名单（各班级名单），按学号去重合并"""
+        folder = filedialog.askdirectory(title="选择名单文件夹")
+        if not folder:
+            return
+
+        def on_done(result):
+            table, report = result
+            self.admission_engine = None
+            self.student_data = table
+            self.update_results_table()
+            msg = f"从 {len(report.files)} 个文件合并 {len(table)} 名学生"
+            if report.duplicates:
+                msg += f"\n重复学号 {len(report.duplicates)} 条（已保留先出现的记录）"
+            if report.conflicts:
+                shown = "、".join(d[0] for d in report.conflicts[:10])
+                msg += f"\n其中内容不一致 {len(report.conflicts)} 条：{shown}"
+            if report.errors:
+                failed = "\n".join(os.path.basename(p) + "：" + e for p, e in report.errors.items())
+                msg += f"\n\n以下文件读取失败：\n{failed}"
+                messagebox.showwarning("导入完成", msg)
+            else:
+                messagebox.showinfo("成功", msg)
+
+        self.run_job("导入文件夹", ingest_folder_job, folder, on_done=on_done)
+
     def process_admissions(self):
         if not self.student_data:
             messagebox.showwarning("警告", "请先导入学生数据")
             return
         
-        try:
-            # 获取当前名额
-            quotas = {major: var.get() for major, var in self.major_quotas.items()}
-            
-            # 检查是否所有专业都设置了名额
-            if all(quota == 0 for quota in quotas.values()):
-                messagebox.showwarning("警告", "请先设置专业录取名额")
-                return
-                
-            result = assign_admissions(
-                self.student_data,
-                quotas,
-                self.preference_mapping,
-                score_key=("排名" if all("排名" in s for s in self.student_data) else "分数"),
-                sort_desc=False if all("排名" in s for s in self.student_data) else True,
-                choice_key="志愿选择",
-                assigned_key="录取专业",
-            )
+        # 获取当前名额
+        quotas = {major: var.get() for major, var in self.major_quotas.items()}
+        
+        # 检查是否所有专业都设置了名额
+        if all(quota == 0 for quota in quotas.values()):
+            messagebox.showwarning("警告", "请先设置专业录取名额")
+            return
 
-            # Keep UI state consistent with assigned/sorted order.
-            self.student_data = result.students
-            remaining_quotas = result.remaining_quotas
+        engine = self.admission_engine
+        # 任务失败或取消时丢弃可能只更新了一半的引擎
+        self.admission_engine = None
+
+        def on_done(result):
+            self.student_data, self.admission_engine, self.admission_metrics = result
+            self.show_admission_summary()
+
+        self.run_job(
+            "处理录取", admission_job,
+            self.student_data, engine, quotas, self.preference_mapping,
+            on_done=on_done,
+        )
+
+    def show_admission_summary(self):
+        """刷新结果表并弹出录取统计（统计由录取引擎给出，不再遍历结果）"""
+        try:
+            remaining_quotas = self.admission_engine.outcome.remaining_quotas
+            metrics = self.admission_metrics
             
             self.update_results_table()
             
-            # 统计录取信息
-            total_students = len(self.student_data)
-            invalid_count = sum(
-                1 for s in self.student_data if s.get("录取专业", "") == INVALID_CHOICE_LABEL
-            )
-            unassigned_count = sum(
-                1 for s in self.student_data if s.get("录取专业", "") == UNASSIGNED_LABEL
-            )
-            admitted_count = total_students - invalid_count - unassigned_count
-            not_admitted_count = invalid_count + unassigned_count
-            
-            stats = {
-                '电子信息工程': {'total': 0, 'adjust': 0},
-                '通信工程': {'total': 0, 'adjust': 0},
-                '电磁场与无线技术': {'total': 0, 'adjust': 0},
-                '未分配': 0,
-                '无效志愿': 0,
-            }
-            
-            for student in self.student_data:
-                major = student.get('录取专业', '')
-                if major == UNASSIGNED_LABEL:
-                    stats['未分配'] += 1
-                    continue
-                if major == INVALID_CHOICE_LABEL:
-                    stats['无效志愿'] += 1
-                    continue
-                else:
-                    base_major = major
-                    is_adjust = False
-                    if base_major.endswith(ADJUST_SUFFIX):
-                        base_major = base_major[: -len(ADJUST_SUFFIX)]
-                        is_adjust = True
-                    if base_major in stats:
-                        stats[base_major]['total'] += 1
-                        if is_adjust:
-                            stats[base_major]['adjust'] += 1
+            not_admitted_count = metrics.invalid + metrics.unassigned
             
             # 生成详细的统计信息
             result_msg = "录取完成！\n\n"
-            result_msg += f"总人数：{total_students}人\n"
-            result_msg += f"已录取：{admitted_count}人\n"
+            result_msg += f"总人数：{metrics.total}人\n"
+            result_msg += f"已录取：{metrics.admitted}人\n"
             result_msg += f"未录取：{not_admitted_count}人\n\n"
             result_msg += "各专业录取情况：\n"
             
-            for major, data in stats.items():
-                if major != '未分配':
-                    total = data['total']
-                    adjust = data['adjust']
-                    normal = total - adjust
-                    result_msg += f"\n{major}：\n"
-                    result_msg += f"  - 总计：{total}人\n"
-                    result_msg += f"  - 正常录取：{normal}人\n"
-                    result_msg += f"  - 调剂录取：{adjust}人\n"
-                    result_msg += f"  - 剩余名额：{remaining_quotas[major]}人\n"
-            
-            result_msg += f"\n未分配人数：{stats['未分配']}人"
-            result_msg += f"\n无效志愿人数：{stats['无效志愿']}人"
+            for major, counts in metrics.counts.items():
+                total = metrics.admitted_to(major)
+                adjust = metrics.adjusted_to(major)
+                result_msg += f"\n{major}：\n"
+                result_msg += f"  - 总计：{total}人\n"
+                result_msg += f"  - 正常录取：{total - adjust}人\n"
+                # 各志愿轮次人数及最后录取者的排名（或分数）
+                for round_name, count, cutoff in zip(metrics.rounds[:-1], counts, metrics.cutoffs[major]):
+                    if count:
+                        result_msg += f"    · {round_name}：{count}人，末位 {cutoff:g}\n"
+                result_msg += f"  - 调剂录取：{adjust}人\n"
+                result_msg += f"  - 剩余名额：{remaining_quotas[major]}人\n"
+            
+            result_msg += f"\n未分配人数：{metrics.unassigned}人"
+            result_msg += f"\n无效志愿人数：{metrics.invalid}人"
             
             messagebox.showinfo("录取完成", result_msg)
             
@@ -511,85 +742,100 @@ F：通信工程 > 电磁场与无线技术 > 电子信息工程
             messagebox.showwarning("警告", "请先导入学生数据")
             return
             
-        try:
+        file_name = filedialog.asksaveasfilename(
+            title="保存录取结果",
+            defaultextension=".xlsx",
+            filetypes=[("Excel Files", "*.xlsx"), ("All Files", "*.*")]
+        )
+        if not file_name:
+            return
+
+        def on_done(_):
+            messagebox.showinfo("成功", "录取结果已成功导出")
+            
+            # 询问是否打开文件
+            if messagebox.askyesno("确认", "是否立即打开导出的文件？"):
+                os.startfile(file_name)
+
+        self.run_job("导出文件", export_job, self.student_data, file_name, on_done=on_done)
+    
+    def compare_results(self):
+        """与之前导出的录取结果文件对比，列出录取结果有变化的学生"""
+        if not self.student_data or "录取专业" not in self.student_data:
+            messagebox.showwarning("警告", "请先处理录取")
+            return
+
+        file_name = filedialog.askopenfilename(
+            title="选择之前导出的录取结果",
+            filetypes=[("Excel Files", "*.xlsx *.xls"), ("CSV Files", "*.csv"), ("All Files", "*.*")]
+        )
+        if not file_name:
+            return
+
+        def on_done(result):
+            self.baseline_results, diff = result
+            self.show_diff(diff, os.path.basename(file_name))
+
+        self.run_job(
+            "对比结果", diff_job,
+            self.student_data, file_name, self.baseline_results,
+            on_done=on_done,
+        )
+
+    def show_diff(self, diff, baseline_name):
+        """显示对比结果：变动摘要、各专业人数变化与变动学生列表，可导出"""
+        diff_window = tk.Toplevel(self.root)
+        diff_window.title(f"录取结果对比（基准：{baseline_name}）")
+        diff_window.geometry("700x550")
+        diff_window.transient(self.root)
+
+        ttk.Label(diff_window, text=diff.summary(), justify=tk.LEFT, padding=10).pack(fill=tk.X)
+
+        from src.core.result_diff import DIFF_HEADERS
+
+        # 变动学生可能很多，同样用虚拟化表格显示
+        changes_view = VirtualTable(
+            diff_window,
+            columns=DIFF_HEADERS,
+            widths={"学号": 100, "姓名": 80, "变动": 100, "原结果": 150, "新结果": 150},
+        )
+        changes_view.pack(fill=tk.BOTH, expand=True, padx=10)
+        changes_view.set_table(diff.changes)
+
+        def export():
             file_name = filedialog.asksaveasfilename(
-                title="保存录取结果",
+                parent=diff_window,
+                title="导出对比结果",
                 defaultextension=".xlsx",
-                filetypes=[("Excel Files", "*.xlsx"), ("All Files", "*.*")]
+                initialfile="录取结果对比.xlsx",
+                filetypes=[("Excel Files", "*.xlsx"), ("CSV Files", "*.csv")],
             )
-            
-            if file_name:
-                # 创建新的工作簿
-                wb = Workbook()
-                ws = wb.active
-                ws.title = '录取结果'
-                
-                # 写入表头
-                headers = ['序号', '学号', '姓名', '分数', '志愿选择', '录取专业']
-                ws.append(headers)
-                
-                # 写入数据
-                for student in self.student_data:
-                    ws.append([
-                        student['序号'],
-                        student['学号'],
-                        student['姓名'],
-                        student['分数'],
-                        student['志愿选择'],
-                        student.get('录取专业', '')
-                    ])
-                
-                # 调整列宽
-                for column in ws.columns:
-                    max_length = 0
-                    column = list(column)
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    adjusted_width = (max_length + 2)
-                    ws.column_dimensions[column[0].column_letter].width = adjusted_width
-                
-                # 保存文件
-                wb.save(file_name)
-                
-                messagebox.showinfo("成功", "录取结果已成功导出")
-                
-                # 询问是否打开文件
-                if messagebox.askyesno("确认", "是否立即打开导出的文件？"):
-                    os.startfile(file_name)
-                
-        except Exception as e:
-            messagebox.showerror("错误", f"导出文件时发生错误：{str(e)}")
-            logging.error(f"导出文件时发生错误: {str(e)}")
-            logging.error(traceback.format_exc())
-    
+            if not file_name:
+                return
+            try:
+                export_diff(diff, file_name)
+            except Exception as e:
+                logging.error(f"导出对比结果失败: {e}")
+                messagebox.showerror("错误", f"导出对比结果失败：{str(e)}", parent=diff_window)
+
+        buttons = ttk.Frame(diff_window, padding=10)
+        buttons.pack(fill=tk.X)
+        ttk.Button(buttons, text="关闭", command=diff_window.destroy).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(buttons, text="导出对比结果", command=export).pack(side=tk.RIGHT, padx=5)
+
     def update_results_table(self):
-        # 清除现有项目
-        for item in self.results_tree.get_children():
-            self.results_tree.delete(item)
-        
-        # 添加数据到树形视图
-        for student in self.student_data:
-            self.results_tree.insert(
-                "", 
-                tk.END, 
-                values=(
-                    student['序号'],
-                    student['学号'],
-                    student['姓名'],
-                    student['分数'],
-                    student['志愿选择'],
-                    student.get('录取专业', '')
-                )
-            )
+        """刷新结果表：只重绘可见行，保持当前排序"""
+        with span("render", rows=len(self.student_data or ())):
+            self.results_view.set_table(self.student_data)
+        self.show_timings()
 
 def main():
+    listener = None
     try:
         # 设置日志
-        setup_logging()
+        listener = setup_logging()
+        # 记录各阶段计时；--trace-memory 时同时记录峰值内存（会拖慢运行）
+        spans.enable(trace_memory='--trace-memory' in sys.argv)
         logging.info("程序启动")
         
         # 创建主窗口
@@ -609,6 +855,25 @@ def main():
             logging.warning(f"设置窗口图标失败: {str(e)}")
         
         app = SimpleMajorAdmissionApp(root)
+
+        # 先显示窗口，再在后台加载录取引擎
+        root.update()
+        timer = get_timer()
+        if timer is not None:
+            timer.mark("窗口显示")
+        preload = threading.Thread(target=preload_engine, name="preload-engine", daemon=True)
+        preload.start()
+        if timer is not None:
+            def _report_when_loaded():
+                if preload.is_alive():
+                    root.after(50, _report_when_loaded)
+                    return
+                timer.mark("引擎加载完成")
+                report = timer.report()
+                logging.info("启动耗时分析:\n%s", report)
+                print(report, file=sys.stderr)
+            root.after(50, _report_when_loaded)
+
         root.mainloop()
         
     except Exception as e:
@@ -616,6 +881,14 @@ def main():
         logging.error(traceback.format_exc())
         messagebox.showerror("错误", f"程序运行失败：{str(e)}\n请查看日志文件了解详情。")
         sys.exit(1)
+    finally:
+        if listener is not None:
+            listener.stop()
 
 if __name__ == "__main__":
-    main() 
+    # 打包（PyInstaller）后子进程会重新执行本程序，须先交给 multiprocessing 处理
+    import multiprocessing
+
+    multiprocessing.freeze_support()
+    main()
+
@@ -0,0 +1,290 @@
+"""
+虚拟化结果表格。
+
+Treeview 只保留与可见行数相同的条目，滚动时原地改写这些条目的值，
+因此刷新与滚动的代价只与窗口高度有关，与学生人数无关。排序通过
+NumPy 计算行序数组完成，不移动表中的数据（NumPy 在首次排序时才导入）。
+每列的秩与各方向的行序按列数据缓存，再次点击表头或录取结果刷新
+（其余列不变）时不必重新排序。
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+# 表头排序标记
+_ARROWS = {False: " ▲", True: " ▼"}
+# 行数达到此值且该列行序未缓存时，排序交给后台任务
+BACKGROUND_SORT_ROWS = 100_000
+
+
+def _rank_values(values):
+    """把一列值转换为可排序的整数秩（数字按数值、其余按文本比较）"""
+    import numpy as np
+
+    values = np.asarray(values)
+    if values.dtype == object:
+        try:
+            values = values.astype(float)
+        except (TypeError, ValueError):
+            values = values.astype(str)
+    return np.unique(values, return_inverse=True)[1].reshape(-1)
+
+
+def _order_by_rank(ranks, descending):
+    """按秩稳定排序；不同值少于 65536 个时转为 16 位键（NumPy 对其做基数排序）"""
+    import numpy as np
+
+    top = int(ranks.max()) if ranks.shape[0] else 0
+    keys = top - ranks if descending else ranks
+    if top < 1 << 16:
+        keys = keys.astype(np.uint16)
+    return np.argsort(keys, kind="stable")
+
+
+def column_order(source, descending, ranks=None):
+    """按列数据计算 (秩, 行序)；不访问 TableModel，可在工作线程中调用"""
+    import numpy as np
+
+    if ranks is None:
+        if len(source) == 2:
+            codes, categories = source
+            ranks = _rank_values(np.array(categories, dtype=object))[codes]
+        else:
+            ranks = _rank_values(source[0])
+    return ranks, _order_by_rank(ranks, descending)
+
+
+def sort_job(job, source, descending, ranks=None):
+    """后台任务：计算一列的行序（大表首次按该列排序时使用）"""
+    job.report(0, None, "正在排序…")
+    return column_order(source, descending, ranks)
+
+
+def _same_source(cached, source):
+    """列数据是否仍是同一数组（分类列还需类别相同）"""
+    return cached[0] is source[0] and cached[1:] == source[1:]
+
+
+class TableModel:
+    """结果表的数据与行序（不依赖 tkinter）"""
+
+    def __init__(self, columns):
+        self.columns = tuple(columns)
+        self.table = None
+        self.order = None  # None 表示按表内原始顺序
+        self.sort_column = None
+        self.sort_desc = False
+        # 列名 -> (列数据, 秩, {降序: 行序})；列数据未变时直接复用
+        self._sorted = {}
+
+    def __len__(self):
+        return 0 if self.table is None else len(self.table)
+
+    def set_table(self, table, keep_sort=True):
+        """更换数据源；keep_sort 为真时按当前排序列重新排序"""
+        self.table = table
+        self.order = None
+        # 只保留新表中仍是同一份数据的列的缓存，旧表的数组可以释放
+        self._sorted = {
+            column: cached
+            for column, cached in self._sorted.items()
+            if table is not None and column in table and _same_source(cached[0], self._source(column))
+        }
+        if keep_sort and self.sort_column is not None and table is not None:
+            self.sort(self.sort_column, self.sort_desc)
+        else:
+            self.sort_column = None
+
+    def sort(self, column, descending=False):
+        """按列稳定排序（降序时相等值仍保持原有先后）"""
+        if self.table is not None and column in self.table:
+            if self.cached_order(column, descending) is None:
+                source, ranks = self.sort_input(column)
+                ranks, order = column_order(source, descending, ranks)
+                self.apply_order(column, descending, source, ranks, order)
+                return
+        self._select(column, descending)
+
+    def cached_order(self, column, descending):
+        """缓存中与当前数据一致的行序，没有时返回 None"""
+        cached = self._cached(column)
+        return None if cached is None else cached[2].get(descending)
+
+    def sort_input(self, column):
+        """交给 column_order 的参数 (列数据, 已缓存的秩或 None)"""
+        cached = self._cached(column)
+        return self._source(column), None if cached is None else cached[1]
+
+    def apply_order(self, column, descending, source, ranks, order):
+        """存入 column_order 的结果并按其显示（数据已更换时结果作废，改为同步排序）"""
+        if self.table is None or column not in self.table:
+            self._select(column, descending)
+            return
+        if not _same_source(source, self._source(column)):
+            self.sort(column, descending)
+            return
+        cached = self._cached(column)
+        if cached is None:
+            cached = self._sorted[column] = (source, ranks, {})
+        cached[2][descending] = order
+        self._select(column, descending)
+
+    def _select(self, column, descending):
+        self.sort_column = column
+        self.sort_desc = descending
+        self.order = self.cached_order(column, descending)
+
+    def _cached(self, column):
+        if self.table is None or column not in self.table:
+            return None
+        cached = self._sorted.get(column)
+        if cached is None or not _same_source(cached[0], self._source(column)):
+            return None
+        return cached
+
+    def _source(self, column):
+        """排序依据的列数据：普通列为数组，分类列为 (编码, 类别)"""
+        if self.table.is_categorical(column):
+            codes, categories = self.table.codes(column)
+            return codes, tuple(categories)
+        return (self.table.column(column),)
+
+    def rows(self, start, stop):
+        """返回显示顺序中 [start, stop) 的行元组"""
+        if self.table is None:
+            return []
+        stop = min(stop, len(self))
+        if start >= stop:
+            return []
+        if self.order is None:
+            return list(self.table.iter_tuples(self.columns, start, stop))
+        window = self.table.take(self.order[start:stop])
+        return list(window.iter_tuples(self.columns))
+
+
+class VirtualTable(ttk.Frame):
+    """只渲染可见行的结果表格，支持点击表头排序
+
+    给出 ``runner``（BackgroundRunner）时，大表首次按某列排序在后台计算，
+    完成后再换上新行序，界面线程不被阻塞。
+    """
+
+    def __init__(self, parent, columns, widths=None, runner=None, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.model = TableModel(columns)
+        self.runner = runner
+        self.offset = 0
+        self.visible = 0
+
+        self.tree = ttk.Treeview(self, columns=self.model.columns, show="headings")
+        for col in self.model.columns:
+            self.tree.heading(col, text=col, command=lambda c=col: self.toggle_sort(c))
+            if widths and col in widths:
+                self.tree.column(col, width=widths[col])
+
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll_to(self.offset - 3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll_to(self.offset + 3))
+        for key, delta in (("<Up>", -1), ("<Down>", 1)):
+            self.tree.bind(key, lambda e, d=delta: self.scroll_to(self.offset + d) or "break")
+        self.tree.bind("<Prior>", lambda e: self.scroll_to(self.offset - self.visible) or "break")
+        self.tree.bind("<Next>", lambda e: self.scroll_to(self.offset + self.visible) or "break")
+
+    # ------------------------------------------------------------------ 数据
+
+    def set_table(self, table, keep_sort=True):
+        """显示新的数据表（导入后或录取结果变化后调用）"""
+        column, descending = self.model.sort_column, self.model.sort_desc
+        self.model.set_table(table, keep_sort=False)
+        if keep_sort and column is not None and table is not None:
+            self._sort(column, descending, self.offset)
+        else:
+            self._update_headings()
+            self.scroll_to(self.offset)
+
+    def toggle_sort(self, column):
+        """点击表头：首次升序，再次点击切换升降序"""
+        descending = self.model.sort_column == column and not self.model.sort_desc
+        self._sort(column, descending, 0)
+
+    def _sort(self, column, descending, offset):
+        model = self.model
+        background = (
+            self.runner is not None
+            and not self.runner.busy
+            and len(model) >= BACKGROUND_SORT_ROWS
+            and column in model.table
+            and model.cached_order(column, descending) is None
+        )
+        if not background:
+            model.sort(column, descending)
+            self._update_headings()
+            self.scroll_to(offset)
+            return
+
+        # 排序完成前先按原顺序显示
+        self._update_headings()
+        self.scroll_to(offset)
+        source, ranks = model.sort_input(column)
+
+        def on_done(result):
+            model.apply_order(column, descending, source, *result)
+            self._update_headings()
+            self.scroll_to(offset)
+
+        self.runner.submit("排序", sort_job, source, descending, ranks, on_done=on_done)
+
+    def _update_headings(self):
+        for col in self.model.columns:
+            arrow = _ARROWS[self.model.sort_desc] if col == self.model.sort_column else ""
+            self.tree.heading(col, text=col + arrow)
+
+    # ------------------------------------------------------------------ 渲染
+
+    def scroll_to(self, offset):
+        """把第 offset 行滚动到顶部并刷新可见行"""
+        total = len(self.model)
+        self.offset = max(0, min(int(offset), total - self.visible))
+        self.refresh()
+
+    def refresh(self):
+        """原地改写可见条目的值，条目数只随窗口高度变化"""
+        rows = self.model.rows(self.offset, self.offset + self.visible)
+        items = self.tree.get_children()
+        for item, values in zip(items, rows):
+            self.tree.item(item, values=values)
+        if len(items) > len(rows):
+            self.tree.delete(*items[len(rows):])
+        for values in rows[len(items):]:
+            self.tree.insert("", tk.END, values=values)
+
+        total = len(self.model)
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _on_resize(self, event):
+        style = ttk.Style(self)
+        row_height = int(style.lookup("Treeview", "rowheight") or 20)
+        # 扣除表头高度
+        visible = max(1, (event.height - row_height - 4) // row_height)
+        if visible != self.visible:
+            self.visible = visible
+            self.scroll_to(self.offset)
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(float(amount) * len(self.model))
+        elif action == "scroll":
+            step = self.visible if unit == "pages" else 1
+            self.scroll_to(self.offset + int(amount) * step)
+
+    def _on_mousewheel(self, event):
+        # Windows 每格 delta 为 120
+        self.scroll_to(self.offset - int(event.delta / 120) * 3)
@@ -0,0 +1,146 @@
+"""
+后台任务执行器。
+
+导入、录取、导出等耗时操作在工作线程中运行，界面线程通过 ``root.after``
+定时轮询线程安全队列，取回进度与结果并在主线程中回调，避免窗口“未响应”。
+tkinter 控件只能在主线程中访问，因此任务函数本身不得操作界面。
+"""
+
+import logging
+import queue
+import threading
+import traceback
+
+
+class JobCancelled(Exception):
+    """任务被用户取消"""
+
+
+class Job:
+    """交给任务函数的句柄：报告进度、检查取消"""
+
+    def __init__(self, name, events):
+        self.name = name
+        self._events = events
+        self._cancel = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        """请求取消；任务在下一次 check_cancelled 时结束"""
+        self._cancel.set()
+
+    def check_cancelled(self):
+        """若已请求取消则抛出 JobCancelled"""
+        if self._cancel.is_set():
+            raise JobCancelled(self.name)
+
+    def report(self, done, total=None, message=''):
+        """报告进度（total 为 None 表示总量未知）"""
+        self._events.put((self, 'progress', (done, total, message)))
+
+
+class BackgroundRunner:
+    """单任务后台执行器：同一时间只运行一个任务
+
+    ``root`` 只需提供 ``after(ms, callback)``；``on_busy(busy)`` 在任务开始与
+    结束时于主线程调用，用于禁用/恢复按钮。
+    """
+
+    def __init__(self, root, on_busy=None, poll_ms=50):
+        self.root = root
+        self.on_busy = on_busy
+        self.poll_ms = poll_ms
+        self._events = queue.Queue()
+        self._job = None
+        self._callbacks = {}
+
+    @property
+    def busy(self):
+        return self._job is not None
+
+    def submit(self, name, func, *args, on_done=None, on_progress=None,
+               on_error=None, on_cancel=None):
+        """在工作线程中运行 ``func(job, *args)``，返回 Job
+
+        回调均在主线程中执行：``on_done(result)``、``on_progress(done, total, message)``、
+        ``on_error(exc, tb_text)``、``on_cancel()``。
+        """
+        if self._job is not None:
+            raise RuntimeError(f"任务“{self._job.name}”仍在运行")
+        job = Job(name, self._events)
+        self._job = job
+        self._callbacks = {
+            'done': on_done,
+            'progress': on_progress,
+            'error': on_error,
+            'cancelled': on_cancel,
+        }
+        thread = threading.Thread(
+            target=self._run, args=(job, func, args), name=f"job-{name}", daemon=True
+        )
+        if self.on_busy:
+            self.on_busy(True)
+        thread.start()
+        self.root.after(self.poll_ms, self._poll)
+        return job
+
+    def cancel(self):
+        """取消当前任务（没有任务时忽略）"""
+        if self._job is not None:
+            self._job.cancel()
+
+    def _run(self, job, func, args):
+        try:
+            result = func(job, *args)
+            job.check_cancelled()
+        except JobCancelled:
+            self._events.put((job, 'cancelled', None))
+        except Exception as e:
+            self._events.put((job, 'error', (e, traceback.format_exc())))
+        else:
+            self._events.put((job, 'done', result))
+
+    def _poll(self):
+        """主线程：取出队列中的全部事件并分发"""
+        finished = False
+        latest_progress = None
+        while True:
+            try:
+                job, kind, payload = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if job is not self._job:
+                continue
+            if kind == 'progress':
+                # 只需显示最新进度
+                latest_progress = payload
+                continue
+            finished = True
+            self._finish(kind, payload)
+            break
+        if not finished:
+            if latest_progress is not None and self._callbacks.get('progress'):
+                self._callbacks['progress'](*latest_progress)
+            self.root.after(self.poll_ms, self._poll)
+
+    def _finish(self, kind, payload):
+        callbacks = self._callbacks
+        name = self._job.name
+        self._job = None
+        self._callbacks = {}
+        if self.on_busy:
+            self.on_busy(False)
+        callback = callbacks.get(kind)
+        if kind == 'error':
+            exc, tb_text = payload
+            logging.error(f"后台任务“{name}”失败: {exc}\n{tb_text}")
+            if callback:
+                callback(exc, tb_text)
+        elif kind == 'done':
+            if callback:
+                callback(payload)
+        elif callback:
+            callback()
@@ -0,0 +1,234 @@
+"""
+导入文件的本地二进制缓存。
+
+以“文件内容 SHA-256 + 解析器版本”为键，把解析得到的 StudentTable 按列
+存为 ``.npy`` 文件（每个缓存项一个目录）：数值列、分类编码与文本列
+（定长 Unicode 数组）直接内存映射，重新打开时无需再解析 Excel。分类列的
+类别与混合类型的列存为 JSON；缓存中不使用 pickle，缓存目录被改写时读取
+也不会执行任意代码。缓存目录超过
+容量上限时按最近使用时间淘汰。GUI 导入、批处理、命令行与
+``process_excel.read_excel`` 共用同一缓存。
+
+缓存目录默认为 ``~/.cache/major_admission``，可用环境变量
+``ADMISSION_CACHE_DIR`` 指定；``ADMISSION_CACHE=0`` 可关闭缓存。
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+# 缓存格式版本，格式变化时递增
+CACHE_FORMAT = 2
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+_META = 'meta.json'
+
+
+def default_cache_dir():
+    """默认缓存目录"""
+    return os.environ.get('ADMISSION_CACHE_DIR') or os.path.join(
+        os.path.expanduser('~'), '.cache', 'major_admission'
+    )
+
+
+def file_digest(path, block_size=1 << 20):
+    """按块计算文件内容的 SHA-256"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+# JSON 可原样往返的单元格类型
+_JSON_TYPES = (str, int, float, bool, type(None))
+
+
+def _save_json(path, values):
+    """把列表写为 JSON；含其他类型（如日期）时抛出 ValueError，该表不缓存"""
+    for v in values:
+        if type(v) not in _JSON_TYPES:
+            raise ValueError(f"无法缓存 {type(v).__name__} 类型的值")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(values, f, ensure_ascii=False)
+
+
+def _load_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _dir_size(path):
+    total = 0
+    for name in os.listdir(path):
+        try:
+            total += os.path.getsize(os.path.join(path, name))
+        except OSError:
+            pass
+    return total
+
+
+class TableCache:
+    """按内容寻址的 StudentTable 缓存"""
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def key(self, path, parser):
+        """缓存键：文件内容摘要 + 解析器标识（含版本）"""
+        return hashlib.sha256(f"{file_digest(path)}|{parser}|{CACHE_FORMAT}".encode()).hexdigest()
+
+    # ------------------------------------------------------------ 读取
+
+    def get(self, path, parser, key=None):
+        """命中时返回内存映射的 StudentTable，否则返回 None"""
+        entry = os.path.join(self.directory, key or self.key(path, parser))
+        if not os.path.isdir(entry):
+            return None
+        try:
+            table = self._read_entry(entry)
+            os.utime(os.path.join(entry, _META))  # 记录最近使用时间
+            return table
+        except Exception as e:
+            logging.warning(f"缓存项损坏，已删除: {entry} ({e})")
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+
+    def _read_entry(self, entry):
+        import numpy as np
+
+        from src.core.student_table import StudentTable
+
+        with open(os.path.join(entry, _META), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        table = StudentTable(meta['length'])
+        for i, col in enumerate(meta['columns']):
+            name, kind = col['name'], col['kind']
+            base = os.path.join(entry, str(i))
+            if kind == 'array':
+                # 数值列与定长 Unicode 文本列都保持内存映射
+                table.set_column(name, np.load(base + '.npy', mmap_mode='r'))
+            elif kind == 'categorical':
+                categories = _load_json(base + '.json')
+                table.set_categorical(name, np.load(base + '.npy', mmap_mode='r'), categories)
+            else:
+                table.set_column(name, _load_json(base + '.json'))
+        return table
+
+    # ------------------------------------------------------------ 写入
+
+    def put(self, path, parser, table, key=None):
+        """写入缓存（先写临时目录再原子重命名），失败只记录警告"""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            entry = os.path.join(self.directory, key or self.key(path, parser))
+            if os.path.isdir(entry):
+                return
+            tmp = tempfile.mkdtemp(prefix='.tmp-', dir=self.directory)
+            try:
+                self._write_entry(tmp, table, source=os.path.abspath(path), parser=parser)
+                os.rename(tmp, entry)
+            except (OSError, ValueError):
+                shutil.rmtree(tmp, ignore_errors=True)
+                if not os.path.isdir(entry):  # 另一进程已写入同一项时忽略
+                    raise
+            self.evict()
+        except (OSError, ValueError) as e:
+            logging.warning(f"写入导入缓存失败: {e}")
+
+    def _write_entry(self, entry, table, source, parser):
+        import numpy as np
+
+        columns = []
+        for i, name in enumerate(table.columns):
+            base = os.path.join(entry, str(i))
+            if table.is_categorical(name):
+                codes, categories = table.codes(name)
+                _save_json(base + '.json', list(categories))
+                np.save(base + '.npy', np.ascontiguousarray(codes))
+                kind = 'categorical'
+            else:
+                values = table.column(name)
+                if values.dtype == object and all(type(v) is str for v in values.tolist()):
+                    values = values.astype(str)
+                if values.dtype != object:
+                    np.save(base + '.npy', np.ascontiguousarray(values))
+                    kind = 'array'
+                else:
+                    _save_json(base + '.json', values.tolist())
+                    kind = 'values'
+            columns.append({'name': name, 'kind': kind})
+        meta = {
+            'format': CACHE_FORMAT,
+            'length': len(table),
+            'columns': columns,
+            'source': source,
+            'parser': parser,
+            'created': time.time(),
+        }
+        with open(os.path.join(entry, _META), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+    # ------------------------------------------------------------ 管理
+
+    def entries(self):
+        """[(最近使用时间, 大小, 路径)]，按最近使用时间从旧到新排列"""
+        if not os.path.isdir(self.directory):
+            return []
+        result = []
+        for name in os.listdir(self.directory):
+            entry = os.path.join(self.directory, name)
+            meta = os.path.join(entry, _META)
+            if name.startswith('.') or not os.path.isfile(meta):
+                continue
+            result.append((os.path.getmtime(meta), _dir_size(entry), entry))
+        return sorted(result)
+
+    def evict(self):
+        """淘汰最久未使用的缓存项，直到总大小不超过上限"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        """清空缓存目录"""
+        for _, _, entry in self.entries():
+            shutil.rmtree(entry, ignore_errors=True)
+
+    def load(self, path, parser, loader):
+        """命中则返回缓存，否则调用 ``loader(path)`` 解析并写入缓存"""
+        key = self.key(path, parser)
+        table = self.get(path, parser, key)
+        if table is None:
+            table = loader(path)
+            self.put(path, parser, table, key)
+        return table
+
+
+def get_cache():
+    """按当前环境变量创建默认缓存；设置 ADMISSION_CACHE=0 时返回 None"""
+    if os.environ.get('ADMISSION_CACHE', '1') == '0':
+        return None
+    return TableCache()
+
+
+def load_students(file_name, cache=None, strict=True):
+    """读取学生志愿文件，优先使用缓存（供 GUI、批处理与命令行使用）
+
+    ``strict`` 为假时按宽松模式读取（带“行号”列，供校验使用），单独缓存。
+    """
+    from src.utils.student_io import LENIENT_PARSER_VERSION, PARSER_VERSION, read_students
+
+    cache = cache or get_cache()
+    if cache is None:
+        return read_students(file_name, strict=strict)
+    parser = PARSER_VERSION if strict else LENIENT_PARSER_VERSION
+    return cache.load(file_name, parser, lambda path: read_students(path, strict=strict))
@@ -0,0 +1,51 @@
+"""
+非阻塞日志。
+
+根日志器只挂一个 ``QueueHandler``：记录日志只是把记录放入队列，由
+``QueueListener`` 的后台线程负责格式化并写入文件/控制台，界面线程不会
+因磁盘 I/O 而卡顿。
+
+计时区段（``src.core.spans``）的记录另写入一个 JSON Lines 文件，每行一个
+JSON 对象，便于用脚本分析。
+"""
+
+import logging
+import logging.handlers
+import queue
+
+from src.core.spans import SPAN_LOGGER
+
+
+class _SpanFilter(logging.Filter):
+    """只放行计时区段日志器的记录"""
+
+    def filter(self, record):
+        return record.name == SPAN_LOGGER
+
+
+def span_file_handler(file_name):
+    """计时区段 JSON Lines 文件处理器（每行只有 JSON，不加时间等前缀）"""
+    handler = logging.FileHandler(file_name, encoding='utf-8')
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    handler.addFilter(_SpanFilter())
+    return handler
+
+
+def start_queue_logging(handlers, level=logging.DEBUG, fmt='%(asctime)s - %(levelname)s - %(message)s'):
+    """把根日志器改为经队列写出，返回已启动的 QueueListener（退出前调用 stop()）
+
+    ``handlers`` 中未设置格式的处理器使用 ``fmt``；原有的根处理器被移除。
+    """
+    formatter = logging.Formatter(fmt)
+    for handler in handlers:
+        if handler.formatter is None:
+            handler.setFormatter(formatter)
+    records = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(records))
+    root.setLevel(level)
+    listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
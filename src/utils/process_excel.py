@@ -1,72 +1,297 @@
-import xlrd
-import xlwt
-from collections import defaultdict
-
-def read_excel(file_path):
-    """读取Excel文件并返回数据"""
-    workbook = xlrd.open_workbook(file_path)
-    sheet = workbook.sheet_by_index(0)
-    
-    # 获取表头
-    headers = [sheet.cell_value(0, i) for i in range(sheet.ncols)]
-    
-    # 获取数据
-    data = []
-    for row in range(1, sheet.nrows):
-        row_data = [sheet.cell_value(row, i) for i in range(sheet.ncols)]
-        data.append(dict(zip(headers, row_data)))
-    
-    return data
+"""
+志愿统计。
+
+统计各专业在第一/第二/第三志愿上的需求人数，并按排名（或成绩）分段、
+按录取专业做交叉统计。志愿既可以直接给出（第一志愿/第二志愿/第三志愿列），
+也可以由志愿代码（志愿选择/选课选项）按志愿映射展开。全部统计基于 pandas
+分组计数完成，不逐行循环；多个文件或工作表（历年数据）并行统计，结果写为
+xlsx（每张统计表一个工作表）。
+
+用法::
+
+    python -m src.utils.process_excel 2022.xlsx 2023.xlsx -o 志愿统计.xlsx --bands 5
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from src.core.admission import ADJUST_SUFFIX
+from src.core.preferences import PREFERENCE_MAPPING, PreferenceTable
+from src.utils.cache import get_cache
+from src.utils.readers import HEADER_ALIASES, get_reader
+
+# 解析器版本：读取逻辑改变时递增，使导入缓存失效
+PARSER_VERSION = 'process_excel.read_excel/3'
+
+PREFERENCE_LEVELS = ('第一志愿', '第二志愿', '第三志愿')
+# process_data 旧接口使用的键
+_LEVEL_KEYS = dict(zip(PREFERENCE_LEVELS, ('first', 'second', 'third')))
+# 录取结果列（导出的录取结果或历年名单中的“最终结果”）；“所属专业”是学生
+# 原来的专业，不是录取结果
+ADMITTED_COLUMNS = ('录取专业', '最终结果')
+
+
+def read_excel(file_path, sheet=None):
+    """读取Excel/CSV文件并返回数据（解析结果缓存在本地，再次读取同一文件时直接加载）"""
+    cache = get_cache()
+    if cache is None:
+        return _parse_excel(file_path, sheet)
+    parser = PARSER_VERSION if sheet is None else f"{PARSER_VERSION}:{sheet}"
+    table = cache.load(file_path, parser, lambda path: _parse_excel_table(path, sheet))
+    return table.to_records()
+
+
+def _parse_excel_table(file_path, sheet=None):
+    """解析Excel并按列存为 StudentTable（供缓存使用）"""
+    from src.core.student_table import StudentTable
+
+    data = _parse_excel(file_path, sheet)
+    headers = list(data[0]) if data else []
+    return StudentTable.from_records(data, headers, categorical=())
+
+
+def _parse_excel(file_path, sheet=None):
+    """按扩展名选择读取器（xls/xlsx/csv），按表头逐行解析为字典"""
+    return list(get_reader(file_path).iter_records(file_path, sheet))
+
+
+# ------------------------------------------------------------------ 统计
+
+
+def _first_present(frame, names):
+    for name in names:
+        if name in frame.columns:
+            return name
+    return None
+
+
+def preference_frame(data, preference_mapping=None):
+    """整理为每名学生一行、含第一/第二/第三志愿列的 DataFrame
+
+    已有“第N志愿”列时直接使用；否则把志愿代码列按 ``preference_mapping``
+    展开（无效代码的各级志愿为空）。
+    """
+    frame = data if isinstance(data, pd.DataFrame) else pd.DataFrame(list(data))
+    if all(level in frame.columns for level in PREFERENCE_LEVELS):
+        return frame
+    code_col = _first_present(frame, HEADER_ALIASES['志愿选择'])
+    if code_col is None:
+        raise ValueError(f"缺少志愿列：需要 {'/'.join(PREFERENCE_LEVELS)} 或志愿代码列")
+    mapping = preference_mapping or PREFERENCE_MAPPING
+    codes = frame[code_col].astype(str).str.strip().str.upper()
+    frame = frame.copy()
+    for i, level in enumerate(PREFERENCE_LEVELS):
+        frame[level] = codes.map({c: prefs[i] for c, prefs in mapping.items() if len(prefs) > i})
+    return frame
+
+
+def demand_by_level(frame):
+    """各专业在每一级志愿上的人数（行：专业；列：第一/第二/第三志愿、总人数）"""
+    levels = [level for level in PREFERENCE_LEVELS if level in frame.columns]
+    long = frame[levels].melt(var_name='志愿', value_name='专业').dropna()
+    long = long[long['专业'].astype(str).str.strip() != '']
+    table = pd.crosstab(long['专业'], long['志愿']).reindex(columns=levels, fill_value=0)
+    table['总人数'] = table.sum(axis=1)
+    table.columns.name = None
+    return table.sort_values('总人数', ascending=False)
+
+
+def _band_labels(n_bands):
+    step = 100 / n_bands
+    return [f"{round(i * step)}%-{round((i + 1) * step)}%" for i in range(n_bands)]
+
+
+def rank_bands(frame, n_bands=5):
+    """按排名（无排名时按成绩从高到低）把学生等分为 n_bands 段，返回段标签 Series"""
+    rank_col = _first_present(frame, HEADER_ALIASES['排名'])
+    if rank_col is not None:
+        values, ascending = pd.to_numeric(frame[rank_col], errors='coerce'), True
+    else:
+        score_col = _first_present(frame, HEADER_ALIASES['分数'])
+        if score_col is None:
+            raise ValueError("缺少排名或成绩列，无法分段")
+        values, ascending = pd.to_numeric(frame[score_col], errors='coerce'), False
+    pct = values.rank(method='first', ascending=ascending, pct=True).to_numpy()
+    index = (np.ceil(np.nan_to_num(pct) * n_bands).astype(int) - 1).clip(0, n_bands - 1)
+    labels = pd.Categorical.from_codes(index, _band_labels(n_bands))
+    return pd.Series(labels, index=frame.index, name='排名段').where(values.notna())
+
+
+def band_crosstab(frame, n_bands=5, level='第一志愿'):
+    """排名段 × 某一级志愿专业的人数"""
+    bands = rank_bands(frame, n_bands)
+    table = pd.crosstab(bands, frame[level], dropna=True)
+    table.columns.name = None
+    return table
+
+
+def admitted_crosstab(frame, level='第一志愿'):
+    """第一志愿专业 × 实际录取专业（调剂单独成列）；无录取结果列时返回 None"""
+    admitted_col = _first_present(frame, ADMITTED_COLUMNS)
+    if admitted_col is None:
+        return None
+    table = pd.crosstab(frame[level].fillna('无效志愿'), frame[admitted_col].fillna(''))
+    table.index.name = level
+    table.columns.name = None
+    return table
+
+
+def summarize(data, preference_mapping=None, n_bands=5):
+    """单个数据集（一年/一个工作表）的全部统计表 {表名: DataFrame}"""
+    frame = preference_frame(data, preference_mapping)
+    first = frame[PREFERENCE_LEVELS[0]]
+    report = {
+        '概况': pd.DataFrame(
+            {'人数': [len(frame), int(first.notna().sum()), int(first.isna().sum())]},
+            index=['总人数', '有效志愿', '无效志愿'],
+        ),
+        '志愿需求': demand_by_level(frame),
+    }
+    try:
+        report['排名段×第一志愿'] = band_crosstab(frame, n_bands)
+    except ValueError:
+        pass
+    admitted = admitted_crosstab(frame)
+    if admitted is not None:
+        report['第一志愿×录取专业'] = admitted
+        adjusted = frame[_first_present(frame, ADMITTED_COLUMNS)].astype(str).str.endswith(ADJUST_SUFFIX)
+        report['概况'].loc['调剂录取'] = int(adjusted.sum())
+    return report
+
 
 def process_data(data):
-    """处理数据，统计每个专业的选择情况"""
-    major_stats = defaultdict(lambda: {'first': 0, 'second': 0, 'third': 0})
-    
-    for student in data:
-        # 统计第一志愿
-        major_stats[student['第一志愿']]['first'] += 1
-        # 统计第二志愿
-        major_stats[student['第二志愿']]['second'] += 1
-        # 统计第三志愿
-        major_stats[student['第三志愿']]['third'] += 1
-    
-    return major_stats
+    """处理数据，统计每个专业的选择情况（返回 {专业: {'first','second','third'}}）
+
+    与最初的逐行统计一致：每名学生的三级志愿都计数，空白志愿计入专业 ''
+    （xlrd 读出的空单元格），专业按首次出现的顺序排列。
+    没有学生（空列表或只有表头）时返回 {}。
+    """
+    frame = data if isinstance(data, pd.DataFrame) else pd.DataFrame(list(data))
+    if frame.empty:
+        return {}
+    frame = preference_frame(frame)
+    values = frame[list(PREFERENCE_LEVELS)].astype(object)
+    values = values.where(values.notna(), '')
+    counts = {level: values[level].value_counts() for level in PREFERENCE_LEVELS}
+    # 按行展开后去重，得到逐行统计时的插入顺序
+    majors = pd.unique(values.to_numpy().ravel())
+    return {
+        major: {_LEVEL_KEYS[level]: int(counts[level].get(major, 0)) for level in PREFERENCE_LEVELS}
+        for major in majors
+    }
+
+
+# ------------------------------------------------------------------ 多年度
+
+
+def list_datasets(paths):
+    """展开输入：文件夹取其中的名单文件，多工作表的工作簿每个工作表一个数据集
+
+    返回 [(名称, 文件, 工作表)]。
+    """
+    from src.utils.readers import list_roster_files
+
+    datasets = []
+    for path in paths:
+        files = list_roster_files(path) if os.path.isdir(path) else [path]
+        for file in files:
+            base = os.path.splitext(os.path.basename(file))[0]
+            sheets = get_reader(file).sheet_names(file)
+            for sheet in sheets:
+                name = base if len(sheets) == 1 else f"{base}-{sheet}"
+                datasets.append((name, file, None if len(sheets) == 1 else sheet))
+    return datasets
+
+
+def _summarize_dataset(file, sheet, preference_mapping, n_bands):
+    """进程池任务：读取并统计一个数据集"""
+    return summarize(read_excel(file, sheet), preference_mapping, n_bands)
+
+
+def summarize_many(paths, preference_mapping=None, n_bands=5, max_workers=None):
+    """并行统计多个文件/工作表，返回 {数据集名称: 统计表字典}（按输入顺序）"""
+    datasets = list_datasets(paths)
+    workers = max_workers or min(len(datasets), os.cpu_count() or 1)
+    if workers <= 1:
+        return {
+            name: _summarize_dataset(file, sheet, preference_mapping, n_bands)
+            for name, file, sheet in datasets
+        }
+    from concurrent.futures import ProcessPoolExecutor
+
+    mapping = None if preference_mapping is None else dict(preference_mapping)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            name: pool.submit(_summarize_dataset, file, sheet, mapping, n_bands)
+            for name, file, sheet in datasets
+        }
+        return {name: future.result() for name, future in futures.items()}
+
+
+def yearly_demand(reports, level='第一志愿'):
+    """各数据集某一级志愿需求并列对比（行：专业；列：数据集）"""
+    columns = {name: report['志愿需求'][level] for name, report in reports.items()}
+    return pd.DataFrame(columns).fillna(0).astype(int)
+
+
+# ------------------------------------------------------------------ 输出
+
+
+def write_report(reports, output_file):
+    """将统计表写入xlsx：单个数据集每表一个工作表，多个数据集加“名称-”前缀并附历年对比"""
+    with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+        if len(reports) > 1:
+            yearly_demand(reports).to_excel(writer, sheet_name='历年第一志愿需求')
+        for name, report in reports.items():
+            for title, table in report.items():
+                sheet = title if len(reports) == 1 else f"{name}-{title}"
+                # Excel 工作表名最长31个字符
+                table.to_excel(writer, sheet_name=sheet[:31])
+
 
 def write_results(stats, output_file):
-    """将统计结果写入新的Excel文件"""
+    """将 process_data 的统计结果写入Excel文件（.xlsx 用 openpyxl，.xls 用 xlwt）"""
+    headers = ['专业', '第一志愿人数', '第二志愿人数', '第三志愿人数', '总人数']
+    rows = [
+        [major, counts['first'], counts['second'], counts['third'], sum(counts.values())]
+        for major, counts in stats.items()
+    ]
+    if output_file.endswith('.xlsx'):
+        pd.DataFrame(rows, columns=headers).to_excel(output_file, sheet_name='专业统计', index=False)
+        return
+
+    import xlwt
+
     wb = xlwt.Workbook()
     ws = wb.add_sheet('专业统计')
-    
-    # 写入表头
-    headers = ['专业', '第一志愿人数', '第二志愿人数', '第三志愿人数', '总人数']
     for i, header in enumerate(headers):
         ws.write(0, i, header)
-    
-    # 写入数据
-    for row, (major, counts) in enumerate(stats.items(), 1):
-        total = sum(counts.values())
-        ws.write(row, 0, major)
-        ws.write(row, 1, counts['first'])
-        ws.write(row, 2, counts['second'])
-        ws.write(row, 3, counts['third'])
-        ws.write(row, 4, total)
-    
+    for row, values in enumerate(rows, 1):
+        for col, value in enumerate(values):
+            ws.write(row, col, value)
     wb.save(output_file)
 
-def main():
-    input_file = 'data/example_students.xls'
-    output_file = 'data/major_statistics.xls'
-    
-    # 读取数据
-    data = read_excel(input_file)
-    
-    # 处理数据
-    stats = process_data(data)
-    
-    # 写入结果
-    write_results(stats, output_file)
-    
-    print(f"处理完成！结果已保存到 {output_file}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="统计各专业志愿需求（支持多个年度并行统计）")
+    parser.add_argument('inputs', nargs='*', default=['data/example_students.xls'],
+                        help="名单文件或文件夹（默认 data/example_students.xls）")
+    parser.add_argument('-o', '--output', default='data/major_statistics.xlsx', help="输出xlsx文件")
+    parser.add_argument('--mapping', help="志愿映射配置文件 (JSON)，用于展开志愿代码")
+    parser.add_argument('--bands', type=int, default=5, help="排名分段数（默认5）")
+    parser.add_argument('--workers', type=int, default=None, help="并行进程数")
+    args = parser.parse_args(argv)
+
+    mapping = PreferenceTable.from_config(args.mapping) if args.mapping else None
+    reports = summarize_many(args.inputs, mapping, args.bands, args.workers)
+    write_report(reports, args.output)
+
+    print(f"处理完成！{len(reports)} 个数据集的统计结果已保存到 {args.output}")
+    return 0
 
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,378 @@
+"""
+按表头识别列的学生名单读取器。
+
+每种文件格式一个读取器（CSV、xls、xlsx），只负责逐行产出原始单元格值
+（第一行为表头）；列的含义由表头名称及其别名决定，与列的位置无关。
+``register_reader`` 可为新的扩展名注册读取器。
+
+CSV 文件的编码由 ``detect_encoding`` 判断（UTF-8 或 GBK/GB18030）。
+
+``ingest_folder`` 并行读取一个文件夹内的全部名单（例如各班级分别提交的
+名单），按学号去重后合并为一个 StudentTable。
+"""
+
+import codecs
+import csv
+import os
+from dataclasses import dataclass, field
+
+from src.core.schema import STUDENT_COLUMNS
+
+# 标准列名 -> 可识别的表头（不区分大小写、忽略首尾空白）
+HEADER_ALIASES = {
+    '序号': ('序号', '编号', 'No', 'No.', 'index'),
+    '排名': ('排名', '名次', '综合排名', 'rank'),
+    '学号': ('学号', '学生学号', 'student_id', 'id'),
+    '姓名': ('姓名', '学生姓名', 'name'),
+    '分数': ('分数', '成绩', '绩点', 'GPA', 'score'),
+    '志愿选择': ('志愿选择', '选课选项', '志愿', '志愿代码', 'choice'),
+    '专业': ('专业', '最终结果', '所属专业', 'major'),
+}
+
+# 缺少时无法录取的列
+REQUIRED_COLUMNS = ('学号', '分数', '志愿选择')
+
+
+def _normalize_header(value):
+    return '' if value is None else str(value).strip().lower()
+
+
+_ALIAS_INDEX = {
+    _normalize_header(alias): column
+    for column, aliases in HEADER_ALIASES.items()
+    for alias in aliases
+}
+
+
+def map_headers(headers):
+    """返回 {标准列名: 列下标}；同名列出现多次时取最后一列"""
+    positions = {}
+    for i, header in enumerate(headers):
+        column = _ALIAS_INDEX.get(_normalize_header(header))
+        if column is not None:
+            positions[column] = i
+    missing = [c for c in REQUIRED_COLUMNS if c not in positions]
+    if missing:
+        raise ValueError(f"缺少必需的列: {', '.join(missing)}（表头: {list(headers)}）")
+    return positions
+
+
+def _decodes_as_utf8(block, final):
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(block, final=final)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def detect_encoding(path, sample_size=1 << 16):
+    """判断CSV文件编码
+
+    有BOM时按BOM；文件开头与结尾的样本都能按UTF-8解码时为UTF-8，否则按
+    GB18030（兼容GBK/GB2312，校园系统导出的文件多为此编码）。
+    """
+    with open(path, 'rb') as f:
+        head = f.read(sample_size)
+        if head.startswith(codecs.BOM_UTF8):
+            return 'utf-8-sig'
+        if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            return 'utf-16'
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        tail = b''
+        if size > 2 * sample_size:
+            f.seek(size - sample_size)
+            # 去掉从多字节字符中间开始的续字节
+            tail = f.read().lstrip(bytes(range(0x80, 0xC0)))
+    if _decodes_as_utf8(head, final=size <= sample_size) and _decodes_as_utf8(tail, final=True):
+        return 'utf-8'
+    return 'gb18030'
+
+
+def parse_number(value):
+    """数字文本转换为数字（整数值转为 int），其他值原样返回"""
+    if not isinstance(value, str):
+        return value
+    try:
+        number = float(value)
+    except ValueError:
+        return value
+    return int(number) if number.is_integer() else number
+
+
+class Reader:
+    """读取器基类：子类实现 ``iter_raw(path, sheet)``，逐行产出单元格值列表（首行为表头）
+
+    ``sheet`` 为工作表名称，None 表示默认（活动/第一个）工作表。
+    """
+
+    extensions = ()
+
+    def iter_raw(self, path, sheet=None):
+        raise NotImplementedError
+
+    def sheet_names(self, path):
+        """文件内的工作表名称（单表格式返回 [None]）"""
+        return [None]
+
+    def iter_records(self, path, sheet=None):
+        """按原始表头产出字典（不做列名映射）"""
+        raw = self.iter_raw(path, sheet)
+        headers = next(raw, None)
+        if headers is None:
+            return
+        headers = ['' if h is None else str(h).strip() for h in headers]
+        for row in raw:
+            yield dict(zip(headers, row))
+
+    def iter_rows(self, path, strict=True):
+        """产出与 STUDENT_COLUMNS 对应的元组
+
+        ``strict`` 为真时分数无法转换为数字即抛出 ValueError；为假时保留原值
+        （空白为 None），并在元组末尾附加源文件行号（表头为第1行），供校验使用。
+        """
+        raw = self.iter_raw(path)
+        headers = next(raw, None)
+        if headers is None:
+            return
+        pos = map_headers(headers)
+        # 缺少序号/排名时互相代替
+        pos.setdefault('序号', pos.get('排名'))
+        pos.setdefault('排名', pos.get('序号'))
+        index = [pos.get(c) for c in STUDENT_COLUMNS]
+        i_score = STUDENT_COLUMNS.index('分数')
+        i_choice = STUDENT_COLUMNS.index('志愿选择')
+        i_numeric = [STUDENT_COLUMNS.index('序号'), STUDENT_COLUMNS.index('排名')]
+        width = max(i for i in index if i is not None) + 1
+        for line, row in enumerate(raw, start=2):
+            # 跳过空行（只读模式下的格式残留、CSV 末尾空行等）
+            if not any(v is not None and v != '' for v in row):
+                continue
+            if len(row) < width:
+                row = list(row) + [None] * (width - len(row))
+            values = [None if i is None else row[i] for i in index]
+            score = values[i_score]
+            try:
+                values[i_score] = float(score)
+            except (TypeError, ValueError):
+                if strict:
+                    raise ValueError(f"第 {line} 行分数不是数字: {score!r}") from None
+                values[i_score] = None if score is None or str(score).strip() == '' else score
+            for i in i_numeric:
+                # CSV 读出的序号/排名为文本
+                values[i] = parse_number(values[i])
+            choice = values[i_choice]
+            values[i_choice] = '' if choice is None else str(choice).upper()  # 转换为大写
+            yield tuple(values) if strict else (*values, line)
+
+
+class CsvReader(Reader):
+    extensions = ('.csv',)
+
+    def iter_raw(self, path, sheet=None):
+        with open(path, 'r', encoding=detect_encoding(path), newline='') as f:
+            yield from csv.reader(f)
+
+
+class XlsxReader(Reader):
+    extensions = ('.xlsx', '.xlsm')
+
+    def iter_raw(self, path, sheet=None):
+        """以只读流式方式读取，不创建 Cell 对象"""
+        from openpyxl import load_workbook
+
+        wb = load_workbook(path, read_only=True, data_only=True)
+        try:
+            ws = wb.active if sheet is None else wb[sheet]
+            yield from ws.iter_rows(values_only=True)
+        finally:
+            # 只读工作簿会一直占用文件句柄，需显式关闭
+            wb.close()
+
+    def sheet_names(self, path):
+        from openpyxl import load_workbook
+
+        wb = load_workbook(path, read_only=True)
+        try:
+            return list(wb.sheetnames)
+        finally:
+            wb.close()
+
+
+class XlsReader(Reader):
+    extensions = ('.xls',)
+
+    def iter_raw(self, path, sheet=None):
+        import xlrd
+
+        book = xlrd.open_workbook(path, on_demand=True)
+        ws = book.sheet_by_index(0) if sheet is None else book.sheet_by_name(sheet)
+        for row_idx in range(ws.nrows):
+            yield ws.row_values(row_idx)
+
+    def sheet_names(self, path):
+        import xlrd
+
+        return xlrd.open_workbook(path, on_demand=True).sheet_names()
+
+
+_READERS = {}
+
+
+def register_reader(reader):
+    """为读取器声明的全部扩展名注册（后注册的覆盖先注册的）"""
+    for ext in reader.extensions:
+        _READERS[ext.lower()] = reader
+    return reader
+
+
+for _reader in (CsvReader(), XlsxReader(), XlsReader()):
+    register_reader(_reader)
+
+
+def get_reader(path):
+    """按扩展名返回读取器"""
+    ext = os.path.splitext(path)[1].lower()
+    try:
+        return _READERS[ext]
+    except KeyError:
+        raise ValueError(f"不支持的文件格式: {ext or path}") from None
+
+
+def supported_extensions():
+    return tuple(sorted(_READERS))
+
+
+# ------------------------------------------------------------------ 多文件合并
+
+
+@dataclass
+class IngestReport:
+    """文件夹合并结果：各文件行数、重复学号与读取失败的文件"""
+
+    files: dict = field(default_factory=dict)  # 文件 -> 行数
+    duplicates: list = field(default_factory=list)  # (学号, 保留的文件, 被丢弃的文件, 内容是否一致)
+    errors: dict = field(default_factory=dict)  # 文件 -> 错误信息
+
+    @property
+    def conflicts(self):
+        """学号相同但内容不同的记录"""
+        return [d for d in self.duplicates if not d[3]]
+
+
+def list_roster_files(folder):
+    """文件夹内所有受支持的名单文件（按文件名排序，忽略 Excel 临时文件）"""
+    exts = set(supported_extensions())
+    return [
+        os.path.join(folder, name)
+        for name in sorted(os.listdir(folder))
+        if os.path.splitext(name)[1].lower() in exts and not name.startswith('~$')
+    ]
+
+
+def _read_roster(path):
+    """线程池任务：读取一个文件（经导入缓存），返回行元组列表"""
+    from src.utils.cache import load_students
+
+    return list(load_students(path).iter_tuples(STUDENT_COLUMNS))
+
+
+def ingest_folder(folder, max_workers=None):
+    """用线程池并行读取文件夹内全部名单，按学号去重合并
+
+    读取以文件 I/O 与解析库为主，用线程而不是进程：GUI 在后台线程中调用，
+    打包后的程序中新进程会重新启动界面，在已有线程的进程中 fork 也可能死锁。
+
+    同一学号出现多次时保留文件名排序在前的记录，其余记入报告。
+    各班名单的序号、排名只在本班内有效，合并后按分数重新计算全体排名
+    （分数相同名次相同，分数缺失的排在最后），序号按合并顺序重新编号。
+    返回 (StudentTable, IngestReport)。
+    """
+    from src.utils.student_io import table_from_rows
+
+    paths = list_roster_files(folder)
+    report = IngestReport()
+    results = {}
+    workers = max_workers or min(len(paths), os.cpu_count() or 1)
+    if workers <= 1:
+        for path in paths:
+            try:
+                results[path] = _read_roster(path)
+            except Exception as e:
+                report.errors[path] = f"{type(e).__name__}: {e}"
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {path: pool.submit(_read_roster, path) for path in paths}
+            for path, future in futures.items():
+                try:
+                    results[path] = future.result()
+                except Exception as e:
+                    report.errors[path] = f"{type(e).__name__}: {e}"
+
+    i_id = STUDENT_COLUMNS.index('学号')
+    i_seq = STUDENT_COLUMNS.index('序号')
+    i_rank = STUDENT_COLUMNS.index('排名')
+    merged = []
+    seen = {}  # 学号 -> (merged 下标, 来源文件)
+    for path in paths:
+        rows = results.get(path)
+        if rows is None:
+            continue
+        report.files[path] = len(rows)
+        for row in rows:
+            sid = student_key(row[i_id])
+            if not sid:
+                merged.append(row)  # 无学号的记录无法去重，全部保留
+                continue
+            if sid not in seen:
+                seen[sid] = (len(merged), path)
+                merged.append(row)
+                continue
+            kept_index, kept_path = seen[sid]
+            kept = merged[kept_index]
+            # 各班名单的序号、排名各自编号，比较时忽略；CSV 读出的 "1" 与 Excel 的 1 视为相同
+            same = all(
+                student_key(a) == student_key(b)
+                for i, (a, b) in enumerate(zip(kept, row))
+                if i not in (i_seq, i_rank)
+            )
+            report.duplicates.append((sid, kept_path, path, same))
+    return table_from_rows(_renumber(merged)), report
+
+
+def _renumber(rows):
+    """按分数重新计算合并后名单的排名（并列同名次），序号改为 1..n"""
+    i_seq = STUDENT_COLUMNS.index('序号')
+    i_rank = STUDENT_COLUMNS.index('排名')
+    i_score = STUDENT_COLUMNS.index('分数')
+    scores = [parse_number(row[i_score]) for row in rows]
+    valid = [isinstance(v, (int, float)) and v == v for v in scores]
+    order = sorted(
+        range(len(rows)), key=lambda i: -scores[i] if valid[i] else float('inf')
+    )
+    ranks = [0] * len(rows)
+    previous = None
+    for position, i in enumerate(order, start=1):
+        key = scores[i] if valid[i] else None
+        if key is None or key != previous:
+            rank = position
+        ranks[i] = rank
+        previous = key
+    out = []
+    for seq, (row, rank) in enumerate(zip(rows, ranks), start=1):
+        row = list(row)
+        row[i_seq] = seq
+        row[i_rank] = rank
+        out.append(tuple(row))
+    return out
+
+
+def student_key(value):
+    """学号等单元格值的规范文本形式（Excel 把纯数字读成浮点数时去掉 .0）"""
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
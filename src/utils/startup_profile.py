@@ -0,0 +1,99 @@
+"""
+启动耗时分析（``--profile-startup``）。
+
+``ImportTimer`` 包装 ``builtins.__import__``，记录每个模块首次导入的
+累计耗时（含其依赖）与自身耗时，并可在启动过程中打时间点
+（如“窗口显示”），最后输出按耗时排序的报告。未启用时不安装任何钩子。
+"""
+
+import builtins
+import sys
+import threading
+import time
+from importlib.util import resolve_name
+
+
+class ImportTimer:
+    """记录各模块首次导入耗时的计时器"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.records = {}  # 模块名 -> (累计秒数, 自身秒数)
+        self.marks = []  # (标签, 距启动秒数)
+        self._local = threading.local()
+        self._original = None
+
+    def install(self):
+        """安装导入钩子（重复调用无副作用）"""
+        if self._original is None:
+            self._original = builtins.__import__
+            builtins.__import__ = self._import
+        return self
+
+    def uninstall(self):
+        """恢复原始的 __import__"""
+        if self._original is not None:
+            builtins.__import__ = self._original
+            self._original = None
+
+    def mark(self, label):
+        """记录一个启动时间点"""
+        self.marks.append((label, time.perf_counter() - self.start))
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original
+        full_name = name
+        if level:
+            try:
+                package = (globals or {}).get('__package__') or ''
+                full_name = resolve_name('.' * level + name, package)
+            except (ImportError, ValueError):
+                full_name = None
+        # 已加载的模块直接返回，不计时
+        if full_name is None or (full_name in sys.modules and not fromlist):
+            return original(name, globals, locals, fromlist, level)
+
+        was_loaded = full_name in sys.modules
+        stack = self._local.__dict__.setdefault('stack', [])
+        stack.append(0.0)
+        t0 = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - t0
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            # 首次加载的记录覆盖其初始化过程中的嵌套导入；
+            # from 包 import 子模块时子模块耗时计入包名下
+            if not was_loaded or (full_name not in self.records and elapsed - children > 1e-4):
+                self.records[full_name] = (elapsed, elapsed - children)
+
+    def report(self, top=25):
+        """生成按累计耗时排序的文本报告"""
+        lines = [f"{'累计ms':>9} {'自身ms':>9}  模块"]
+        ranked = sorted(self.records.items(), key=lambda kv: kv[1][0], reverse=True)
+        for name, (cumulative, own) in ranked[:top]:
+            lines.append(f"{cumulative * 1000:>9.1f} {own * 1000:>9.1f}  {name}")
+        total_own = sum(own for _, own in self.records.values())
+        lines.append(f"共 {len(self.records)} 个模块，导入合计 {total_own * 1000:.1f} ms")
+        for label, at in self.marks:
+            lines.append(f"{label}: {at * 1000:.1f} ms")
+        return '\n'.join(lines)
+
+
+_timer = None
+
+
+def start_if_requested(argv=None):
+    """命令行含 --profile-startup 时安装计时器并返回，否则返回 None"""
+    global _timer
+    argv = sys.argv if argv is None else argv
+    if _timer is None and '--profile-startup' in argv:
+        _timer = ImportTimer().install()
+    return _timer
+
+
+def get_timer():
+    """返回已安装的计时器（未启用时为 None）"""
+    return _timer
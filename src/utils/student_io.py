@@ -0,0 +1,438 @@
+"""
+学生志愿数据的导入与录取结果导出。
+
+各格式的读取函数（见 ``readers``，按表头识别列）逐行产出与 STUDENT_COLUMNS 对应的元组；
+``read_students`` 再按列构建 ``StudentTable``，不为每个学生创建字典。
+CSV 文件由 pandas 的 C 解析器按块读取，各列直接转换为类型化数组。
+第三方库（openpyxl、xlrd、NumPy）只在用到对应格式时才导入，
+GUI、批处理与命令行共用这些函数。
+"""
+
+import csv
+import json
+import logging
+import os
+import pickle
+import tempfile
+import time
+from itertools import islice
+
+from src.core.schema import CATEGORICAL_COLUMNS, EXPORT_HEADERS, SOURCE_ROW_COLUMN, STUDENT_COLUMNS
+from src.utils.readers import (
+    CsvReader,
+    XlsReader,
+    XlsxReader,
+    detect_encoding,
+    get_reader,
+    map_headers,
+    parse_number,
+)
+
+# 按块读取时每块的行数
+DEFAULT_CHUNK_SIZE = 10000
+# CSV 快速读取时每块的行数
+CSV_CHUNK_SIZE = 200000
+
+# 解析器版本：读取逻辑改变时递增，使导入缓存失效
+PARSER_VERSION = 'student_io/4'
+# 宽松模式（带行号列，供校验使用）单独缓存
+LENIENT_PARSER_VERSION = PARSER_VERSION + '+lenient'
+# 宽松模式的列
+LENIENT_COLUMNS = STUDENT_COLUMNS + (SOURCE_ROW_COLUMN,)
+
+
+def iter_csv_rows(file_name):
+    """逐行读取CSV格式的学生志愿文件（按表头识别列）"""
+    return CsvReader().iter_rows(file_name)
+
+
+def iter_xlsx_rows(file_name):
+    """以只读流式方式逐行读取xlsx格式的学生志愿文件（按表头识别列）"""
+    return XlsxReader().iter_rows(file_name)
+
+
+def iter_xls_rows(file_name):
+    """使用xlrd逐行读取xls格式的学生志愿文件（按表头识别列）"""
+    return XlsReader().iter_rows(file_name)
+
+
+def iter_student_rows(file_name, strict=True):
+    """根据扩展名选择读取器，逐行读取学生志愿文件（strict 见 ``Reader.iter_rows``）"""
+    return get_reader(file_name).iter_rows(file_name, strict=strict)
+
+
+def iter_student_records(file_name):
+    """逐行产出学生字典（供纯Python引擎使用）"""
+    for row in iter_student_rows(file_name):
+        yield dict(zip(STUDENT_COLUMNS, row))
+
+
+def iter_chunks(rows, chunk_size=DEFAULT_CHUNK_SIZE):
+    """将行迭代器切分为每块最多 chunk_size 行的列表"""
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_student_chunks(file_name, chunk_size=DEFAULT_CHUNK_SIZE, strict=True):
+    """按块读取学生志愿文件，每块为行元组列表"""
+    return iter_chunks(iter_student_rows(file_name, strict=strict), chunk_size)
+
+
+def table_from_rows(rows, chunk_size=DEFAULT_CHUNK_SIZE, columns=STUDENT_COLUMNS):
+    """按块转置行数据并构建 StudentTable"""
+    from src.core.student_table import StudentTable
+
+    cols = [[] for _ in columns]
+    for chunk in iter_chunks(rows, chunk_size):
+        for col, values in zip(cols, zip(*chunk)):
+            col.extend(values)
+    return StudentTable.from_columns(dict(zip(columns, cols)))
+
+
+def _csv_header(file_name, encoding):
+    with open(file_name, 'r', encoding=encoding, newline='') as f:
+        return next(csv.reader(f), None)
+
+
+def _merge_numeric(parts):
+    """合并排名/序号各块（C 解析器已推断类型）：全为整数值时为 int64，
+    全为数字时为 float64，含文本的块则整列保留为文本"""
+    import numpy as np
+
+    if any(p.dtype == object for p in parts):
+        # 与逐行读取一致：能解析为数字的单元格转换为数字
+        values = [parse_number(v if isinstance(v, str) else str(v)) for p in parts for v in p.tolist()]
+        out = np.empty(len(values), dtype=object)
+        out[:] = values
+        return out
+    values = np.concatenate(parts)
+    if values.dtype.kind == 'f' and np.isfinite(values).all() and (values == np.round(values)).all():
+        return values.astype(np.int64)
+    return values
+
+
+def read_csv_students(file_name, chunk_size=CSV_CHUNK_SIZE, progress=None, strict=True):
+    """用 pandas 的 C 解析器按块读取CSV，各列直接转换为类型化数组
+
+    编码自动识别（UTF-8/GBK）。分数为 float64，排名/序号由解析器推断为整数或
+    浮点数组（含非数字时保留文本），志愿选择与专业按块编码为分类列（大写转换
+    只作用于各块的不同取值），学号、姓名保持文本（不丢失学号前导零）。每读完
+    一块调用 ``progress(已读行数, 耗时秒)``；读完后在日志中记录吞吐量（行/秒）。
+
+    ``strict`` 为假时分数为空或不是数字的行照常读入（保留原值，分数列变为
+    object），并附加“行号”列，供 ``validate_table`` 一次报告全部问题。
+    """
+    import numpy as np
+    import pandas as pd
+
+    from src.core.student_table import StudentTable
+
+    start = time.perf_counter()
+    encoding = detect_encoding(file_name)
+    headers = _csv_header(file_name, encoding)
+    if headers is None:
+        return StudentTable.from_columns({c: [] for c in STUDENT_COLUMNS})
+    pos = map_headers(headers)
+    # 缺少序号/排名时互相代替
+    pos.setdefault('序号', pos.get('排名'))
+    pos.setdefault('排名', pos.get('序号'))
+    used = sorted({p for p in pos.values() if p is not None})
+    i_score = pos['分数']
+    numeric = {pos['序号'], pos['排名']} - {None, i_score}
+    # 分数与排名/序号交给解析器推断（遇到文本时该块为 object，可报告所在行），
+    # 其余列保持文本
+    dtypes = {p: object for p in used if p not in numeric | {i_score}}
+    lines = []
+
+    parts = {c: [] for c in STUDENT_COLUMNS}
+    categories = {c: {} for c in CATEGORICAL_COLUMNS}
+    done = 0
+    reader = pd.read_csv(
+        file_name,
+        header=None,
+        skiprows=1,
+        usecols=used,
+        dtype=dtypes,
+        keep_default_na=False,
+        na_values={p: [''] for p in numeric | {i_score}},
+        encoding=encoding,
+        engine='c',
+        chunksize=chunk_size,
+        # 保留空行，使行号与文件一致
+        skip_blank_lines=False,
+    )
+    for chunk in reader:
+        raw_score = chunk[i_score].to_numpy()
+        if raw_score.dtype == object:
+            score = pd.to_numeric(chunk[i_score], errors='coerce').to_numpy(dtype=np.float64)
+        else:
+            score = raw_score.astype(np.float64, copy=False)
+        missing = np.isnan(score)
+        if strict and missing.any() and raw_score.dtype == object:
+            bad = missing & pd.notna(raw_score)
+            if bad.any():
+                i = int(np.flatnonzero(bad)[0])
+                raise ValueError(f"第 {int(chunk.index[i]) + 2} 行分数不是数字: {raw_score[i]!r}")
+        if missing.any():
+            # 空行与只有逗号的行：所有列都为空
+            rest = chunk.loc[missing]
+            blank = (rest.isna() | (rest == '')).all(axis=1).to_numpy()
+            if strict and not blank.all():
+                line = int(chunk.index[missing][~blank][0]) + 2
+                raise ValueError(f"第 {line} 行分数为空")
+            keep = ~missing
+            keep[np.flatnonzero(missing)[~blank]] = True
+            chunk, score, raw_score = chunk[keep], score[keep], raw_score[keep]
+            missing = missing[keep]
+        if missing.any():
+            # 宽松模式：保留无法解析的原值（空白为 None）
+            score = score.astype(object)
+            score[missing] = [
+                None if pd.isna(v) or str(v).strip() == '' else v for v in raw_score[missing].tolist()
+            ]
+        lines.append(chunk.index.to_numpy() + 2)
+        n = len(score)
+        for column in STUDENT_COLUMNS:
+            p = pos.get(column)
+            if column == '分数':
+                values = score
+            elif p is None:
+                values = np.full(n, None, dtype=object)
+            elif p in numeric:
+                values = chunk[p].to_numpy()
+            else:
+                values = chunk[p].to_numpy(dtype=object)
+                # 较短的行缺少的单元格
+                if column not in categories and pd.isna(values).any():
+                    values = np.where(pd.isna(values), '', values)
+            if column in categories:
+                index = categories[column]
+                if p is None:
+                    values = np.full(n, index.setdefault(None, len(index)), dtype=np.int32)
+                else:
+                    # 每块内编码，再映射到全表统一的类别编号
+                    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+                    uniques = ['' if pd.isna(u) else str(u) for u in uniques]
+                    if column == '志愿选择':
+                        uniques = [u.upper() for u in uniques]  # 转换为大写
+                    lut = np.array([index.setdefault(u, len(index)) for u in uniques], dtype=np.int32)
+                    values = lut[codes] if len(lut) else codes.astype(np.int32)
+            parts[column].append(values)
+        done += n
+        if progress is not None:
+            progress(done, time.perf_counter() - start)
+
+    table = StudentTable(done)
+    for column in STUDENT_COLUMNS:
+        values = parts[column]
+        if column in categories:
+            codes = np.concatenate(values) if values else np.empty(0, dtype=np.int32)
+            table.set_categorical(column, codes, list(categories[column]))
+        elif not values:
+            table.set_column(column, np.empty(0, dtype=object))
+        elif pos.get(column) in numeric:
+            table.set_column(column, _merge_numeric(values))
+        else:
+            table.set_column(column, np.concatenate(values))
+    if not strict:
+        table.set_column(SOURCE_ROW_COLUMN, np.concatenate(lines) if lines else np.empty(0, dtype=np.int64))
+    elapsed = time.perf_counter() - start
+    logging.info(
+        f"读取 {os.path.basename(file_name)}（{encoding}）：{done} 行，"
+        f"{elapsed:.2f} 秒，{done / elapsed if elapsed else 0:.0f} 行/秒"
+    )
+    return table
+
+
+def read_students(file_name, strict=True):
+    """根据扩展名读取学生志愿文件，返回 StudentTable（CSV 走按块快速读取）
+
+    ``strict`` 为假时不因个别坏行中止，并附加“行号”列，供校验使用。
+    """
+    if isinstance(get_reader(file_name), CsvReader):
+        return read_csv_students(file_name, strict=strict)
+    columns = STUDENT_COLUMNS if strict else LENIENT_COLUMNS
+    return table_from_rows(iter_student_rows(file_name, strict=strict), columns=columns)
+
+
+def _text_width(value):
+    """单元格文本长度（空值按0计）"""
+    return 0 if value is None else len(str(value))
+
+
+def _spill_rows(rows, headers, chunk_size=DEFAULT_CHUNK_SIZE):
+    """边统计列宽边把行按块写入临时文件，返回 (临时文件, 列宽列表)"""
+    widths = [_text_width(h) for h in headers]
+    spill = tempfile.TemporaryFile()
+    try:
+        for chunk in iter_chunks(rows, chunk_size):
+            for i, values in enumerate(zip(*chunk)):
+                widths[i] = max(widths[i], max(map(_text_width, values)))
+            pickle.dump(chunk, spill, protocol=pickle.HIGHEST_PROTOCOL)
+        spill.seek(0)
+    except BaseException:
+        spill.close()
+        raise
+    return spill, widths
+
+
+def _replay_rows(spill):
+    """从临时文件逐块读回行数据，读完后关闭文件"""
+    with spill:
+        while True:
+            try:
+                chunk = pickle.load(spill)
+            except EOFError:
+                return
+            yield from chunk
+
+
+def measure_column_widths(table, headers=EXPORT_HEADERS, chunk_size=65536):
+    """按列计算 StudentTable 导出时的列宽
+
+    分类列只需测量出现过的类别，普通列按块转换，不生成整列的Python对象。
+    """
+    import numpy as np
+
+    widths = []
+    for h in headers:
+        width = _text_width(h)
+        if h in table and len(table):
+            if table.is_categorical(h):
+                codes, categories = table.codes(h)
+                used = np.flatnonzero(np.bincount(codes, minlength=len(categories)))
+                width = max(width, max(_text_width(categories[c]) for c in used))
+            else:
+                for lo in range(0, len(table), chunk_size):
+                    values = table.column_slice(h, lo, lo + chunk_size).tolist()
+                    width = max(width, max(map(_text_width, values)))
+        widths.append(width)
+    return widths
+
+
+def write_rows_xlsx(rows, file_name, headers=EXPORT_HEADERS, widths=None, sheet_title='录取结果'):
+    """以只写模式将行数据流式写入xlsx文件
+
+    只写工作表必须在第一行之前确定列宽；未给出 ``widths`` 时，先把行按块暂存到
+    临时文件并同时统计各列最大宽度，再回放写出。内存占用与行数无关。
+    """
+    write_sheets_xlsx([(sheet_title, rows, headers, widths)], file_name)
+
+
+def write_sheets_xlsx(sheets, file_name):
+    """将多个工作表写入同一个xlsx文件，``sheets`` 为 (名称, 行, 表头, 列宽) 列表
+
+    列宽为 None 时按 ``write_rows_xlsx`` 的方式先暂存统计。
+    """
+    from openpyxl import Workbook
+    from openpyxl.utils import get_column_letter
+
+    wb = Workbook(write_only=True)
+    for sheet_title, rows, headers, widths in sheets:
+        if widths is None:
+            spill, widths = _spill_rows(rows, headers)
+            rows = _replay_rows(spill)
+
+        ws = wb.create_sheet(sheet_title)
+
+        # 调整列宽
+        for i, width in enumerate(widths, start=1):
+            ws.column_dimensions[get_column_letter(i)].width = width + 2
+
+        # 写入表头
+        ws.append(list(headers))
+
+        # 写入数据
+        for values in rows:
+            ws.append(values)
+
+    # 保存文件
+    wb.save(file_name)
+
+
+def write_rows_csv(rows, f, headers=EXPORT_HEADERS):
+    """将行数据逐行写入已打开的文本文件"""
+    writer = csv.writer(f)
+    writer.writerow(headers)
+    writer.writerows(rows)
+
+
+def write_rows_jsonl(rows, f, headers=EXPORT_HEADERS):
+    """每行写出一个JSON对象（JSON Lines）"""
+    for values in rows:
+        f.write(json.dumps(dict(zip(headers, values)), ensure_ascii=False, default=str))
+        f.write('\n')
+
+
+def export_results_xlsx(table, file_name):
+    """将录取结果导出为xlsx文件（列宽按列预先计算，行数据直接流式写出）"""
+    widths = measure_column_widths(table, EXPORT_HEADERS)
+    write_rows_xlsx(table.iter_tuples(EXPORT_HEADERS), file_name, widths=widths)
+
+
+def export_results_csv(table, file_name):
+    """将录取结果逐行写出为CSV文件（utf-8-sig，Excel可直接打开）"""
+    with open(file_name, 'w', encoding='utf-8-sig', newline='') as f:
+        write_rows_csv(table.iter_tuples(EXPORT_HEADERS), f)
+
+
+def export_results(table, file_name):
+    """根据扩展名导出录取结果（.csv 或 .xlsx）"""
+    if file_name.endswith('.csv'):
+        export_results_csv(table, file_name)
+    else:
+        export_results_xlsx(table, file_name)
+
+
+def export_validation_report(report, file_name):
+    """将数据校验报告（ValidationReport）导出为 .csv 或 .xlsx，每个问题一行"""
+    from src.core.validation import REPORT_HEADERS
+
+    if file_name.endswith('.csv'):
+        with open(file_name, 'w', encoding='utf-8-sig', newline='') as f:
+            write_rows_csv(report.rows(), f, headers=REPORT_HEADERS)
+    else:
+        write_rows_xlsx(report.rows(), file_name, headers=REPORT_HEADERS, sheet_title='数据校验')
+
+
+def read_results(file_name):
+    """读取导出的录取结果文件（.csv/.xlsx/.xls），返回含学号、姓名、录取专业列的 StudentTable
+
+    供与新的录取结果对比；缺少“学号”或“录取专业”列时抛出 ValueError。
+    """
+    columns = ('学号', '姓名', '录取专业')
+    raw = get_reader(file_name).iter_raw(file_name)
+    headers = ['' if h is None else str(h).strip() for h in next(raw, None) or ()]
+    missing = [c for c in ('学号', '录取专业') if c not in headers]
+    if missing:
+        raise ValueError(f"{os.path.basename(file_name)} 不是录取结果文件（缺少“{'”、“'.join(missing)}”列）")
+    index = [headers.index(c) if c in headers else None for c in columns]
+
+    def rows():
+        for row in raw:
+            if not any(v is not None and v != '' for v in row):
+                continue
+            yield tuple(row[i] if i is not None and i < len(row) else None for i in index)
+
+    return table_from_rows(rows(), columns=columns)
+
+
+def export_diff(diff, file_name):
+    """将两次录取结果的对比（ResultDiff）导出为 .csv 或 .xlsx
+
+    xlsx 含“结果对比”（每个变动学生一行）与“专业人数”两个工作表；CSV 只含前者。
+    """
+    from src.core.result_diff import DIFF_HEADERS, MAJOR_DIFF_HEADERS
+
+    if file_name.endswith('.csv'):
+        with open(file_name, 'w', encoding='utf-8-sig', newline='') as f:
+            write_rows_csv(diff.rows(), f, headers=DIFF_HEADERS)
+    else:
+        write_sheets_xlsx([
+            ('结果对比', diff.rows(), DIFF_HEADERS, None),
+            ('专业人数', diff.major_rows(), MAJOR_DIFF_HEADERS, None),
+        ], file_name)
@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_import_cache(tmp_path_factory, monkeypatch):
+    """Keep the import cache out of the user's home directory during tests."""
+    monkeypatch.setenv("ADMISSION_CACHE_DIR", str(tmp_path_factory.mktemp("import-cache")))
@@ -60,3 +60,24 @@ def test_fallback_to_next_preferences_then_adjust_then_unassigned():
     r2 = assign_admissions(students, quotas2, PREFERENCE_MAPPING)
     assert r2.students[2]["录取专业"].endswith("(调剂)") is False  # still has 3rd preference available
     assert r2.students[2]["录取专业"] == "电磁场与无线技术"
+
+
+def test_metrics_count_rounds_and_cutoffs():
+    # A: 电子信息工程 > 通信工程 > 电磁场与无线技术
+    students = [
+        {"学号": "s1", "分数": 100, "志愿选择": "A"},
+        {"学号": "s2", "分数": 90, "志愿选择": "A"},
+        {"学号": "s3", "分数": 85, "志愿选择": "Z"},
+        {"学号": "s4", "分数": 80, "志愿选择": ""},
+        {"学号": "s5", "分数": 70, "志愿选择": "A"},
+    ]
+    quotas = {"电子信息工程": 1, "通信工程": 1, "电磁场与无线技术": 1}
+    m = assign_admissions(students, quotas, PREFERENCE_MAPPING).metrics
+
+    assert m.rounds == ("第一志愿", "第二志愿", "第三志愿", "调剂")
+    assert m.counts["电子信息工程"] == (1, 0, 0, 0)
+    assert m.counts["通信工程"] == (0, 1, 0, 0)
+    assert m.counts["电磁场与无线技术"] == (0, 0, 0, 1)
+    assert m.cutoffs["通信工程"] == (None, 90.0, None, None)
+    assert m.cutoffs["电磁场与无线技术"][-1] == 80.0
+    assert (m.invalid, m.unassigned, m.adjusted, m.total) == (1, 1, 1, 5)
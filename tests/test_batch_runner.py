@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import csv
+import json
+import random
+
+from src.batch_runner import CohortSpec, format_report, load_manifest, run_batch, run_cohort
+
+HEADER = ["序号", "学号", "姓名", "性别", "分数", "志愿选择", "专业"]
+
+
+def _write_cohort(path, n, seed):
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        for i in range(n):
+            writer.writerow([i + 1, f"U{seed}{i:05d}", f"学生{i}", "男", rng.randint(60, 100), rng.choice("ABCDEF"), "电子信息类"])
+
+
+def test_manifest_cohorts_run_in_parallel(tmp_path):
+    _write_cohort(tmp_path / "a.csv", 40, 1)
+    _write_cohort(tmp_path / "b.csv", 25, 2)
+    (tmp_path / "prefs.json").write_text(
+        json.dumps({"X": ["甲", "乙"], "A": ["甲"], "B": ["乙"], "C": ["乙", "甲"], "D": ["甲"], "E": ["乙"], "F": ["甲"]}),
+        encoding="utf-8",
+    )
+    manifest = {
+        "defaults": {"quotas": {"电子信息工程": 10, "通信工程": 10, "电磁场与无线技术": 10}},
+        "cohorts": [
+            {"name": "a", "input": "a.csv", "output": "out/a.csv"},
+            {"name": "b", "input": "b.csv", "output": "out/b.xlsx", "mapping": "prefs.json", "quotas": {"甲": 5, "乙": 5}},
+            {"name": "missing", "input": "nope.csv", "output": "out/nope.csv"},
+        ],
+    }
+    (tmp_path / "manifest.json").write_text(json.dumps(manifest, ensure_ascii=False), encoding="utf-8")
+
+    reports = run_batch(load_manifest(str(tmp_path / "manifest.json")), max_workers=2)
+
+    assert [r.name for r in reports] == ["a", "b", "missing"]
+    a, b, missing = reports
+    assert a.ok and a.rows == 40 and a.metrics.total == 40
+    assert a.remaining_quotas == {"电子信息工程": 0, "通信工程": 0, "电磁场与无线技术": 0}
+    assert b.ok and b.metrics.unassigned == 15
+    assert not missing.ok and "FileNotFoundError" in missing.error
+    with open(tmp_path / "out" / "a.csv", encoding="utf-8-sig") as f:
+        rows = list(csv.reader(f))
+    assert rows[0][-1] == "录取专业" and len(rows) == 41
+    assert (tmp_path / "out" / "b.xlsx").exists()
+    assert "3 cohorts (1 failed), 65 students" in format_report(reports, 1.0)
+
+
+def test_cohort_without_ranks_is_ordered_by_score(tmp_path):
+    path = tmp_path / "unranked.csv"
+    path.write_text("学号,姓名,分数,志愿选择\nU1,甲,80,A\nU2,乙,95,A\n", encoding="utf-8")
+    quotas = {"电子信息工程": 1, "通信工程": 0, "电磁场与无线技术": 0}
+    report = run_cohort(CohortSpec("c", str(path), str(tmp_path / "out.csv"), quotas))
+    assert report.ok and report.metrics.cutoffs["电子信息工程"][0] == 95.0
+    with open(tmp_path / "out.csv", encoding="utf-8-sig") as f:
+        rows = list(csv.DictReader(f))
+    assert [(r["学号"], r["录取专业"]) for r in rows] == [("U2", "电子信息工程"), ("U1", "未分配")]
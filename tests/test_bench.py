@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import json
+from dataclasses import replace
+
+import numpy as np
+
+from src.bench.suite import STAGES, compare, main, run_suite, speedups
+from src.bench.synthetic import CohortProfile, cohort_quotas, generate_cohort
+from src.core.preferences import PREFERENCE_MAPPING
+
+
+def test_generated_cohort_follows_profile():
+    profile = CohortProfile(n=5000, tie_rate=0.2, invalid_rate=0.1, blank_rate=0.05, tightness=0.5, seed=3)
+    table = generate_cohort(profile)
+    assert len(table) == 5000 and len(set(table.column("学号").tolist())) == 5000
+
+    rank = table.column("排名")
+    assert 0.15 < 1 - len(np.unique(rank)) / len(rank) < 0.25
+    # Tied ranks share a score, and a better rank never has a lower score.
+    order = np.argsort(rank, kind="stable")
+    assert np.all(np.diff(table.column("分数")[order]) <= 0)
+
+    choice = table.column("志愿选择")
+    invalid = ~np.isin(choice, list(PREFERENCE_MAPPING)) & (choice != "")
+    assert 0.08 < invalid.mean() < 0.12 and 0.03 < (choice == "").mean() < 0.07
+    # Skewed towards the first code.
+    assert (choice == "A").sum() > (choice == "F").sum()
+
+    assert sum(cohort_quotas(profile).values()) == 2500
+    again = generate_cohort(profile)
+    assert again.column("志愿选择").tolist() == choice.tolist()
+    assert generate_cohort(replace(profile, seed=4)).column("志愿选择").tolist() != choice.tolist()
+
+
+def test_suite_times_every_stage_and_flags_regressions():
+    results = run_suite([300], repeat=1)
+    assert list(results) == list(STAGES)
+    assert all(timings["300"] > 0 for timings in results.values())
+
+    assert compare(results, results) == []
+    halved = {stage: {n: s / 4 for n, s in t.items()} for stage, t in results.items()}
+    slowest = max(results, key=lambda stage: results[stage]["300"])
+    assert slowest in {r.stage for r in compare(results, halved)}
+
+
+def test_main_records_baseline_then_fails_on_regression(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    argv = ["--sizes", "200", "--stages", "import_csv,export_xlsx", "--repeat", "1", "--baseline", str(baseline)]
+    assert main(argv) == 0
+    data = json.loads(baseline.read_text(encoding="utf-8"))
+    assert set(data["results"]) == {"import_csv", "export_xlsx"}
+
+    data["results"]["export_xlsx"]["200"] /= 100
+    baseline.write_text(json.dumps(data), encoding="utf-8")
+    assert main(argv) == 1
+    assert "export_xlsx" in capsys.readouterr().err
+
+
+def test_encoded_engine_is_reported_as_speedup_over_python_engine():
+    stages = ["assign_admissions", "assign_table", "assign_encoded"]
+    results = run_suite([20000], stages=stages, repeat=3)
+    ratios = speedups(results)
+    assert set(ratios) == {"assign_table", "assign_encoded"}
+    # >20x at 1M students; a small cohort still shows most of it.
+    assert ratios["assign_encoded"]["20000"] > 5
+    assert ratios["assign_encoded"]["20000"] > ratios["assign_table"]["20000"] > 1
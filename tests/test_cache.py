@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import datetime
+import os
+import shutil
+
+import numpy as np
+
+from src.core.student_table import StudentTable
+from src.utils.cache import TableCache, load_students
+from src.utils.process_excel import _parse_excel, read_excel
+from src.utils.student_io import PARSER_VERSION, read_students
+
+HERE = os.path.dirname(__file__)
+
+
+def test_reload_is_memory_mapped_and_identical(tmp_path):
+    cache = TableCache(str(tmp_path / "cache"))
+    src = os.path.join(HERE, "test_sample.csv")
+    calls = []
+
+    def loader(path):
+        calls.append(path)
+        return read_students(path)
+
+    first = cache.load(src, PARSER_VERSION, loader)
+    second = cache.load(src, PARSER_VERSION, loader)
+    assert len(calls) == 1
+    assert second.to_records() == first.to_records()
+    assert isinstance(second.column("分数"), np.memmap)
+    assert isinstance(second.column("学号"), np.memmap) and second.column("学号").dtype.kind == "U"
+    assert second.is_categorical("志愿选择")
+    # A different parser version or different file content is a different entry.
+    assert cache.key(src, "student_io/999") != cache.key(src, PARSER_VERSION)
+    copy = tmp_path / "copy.csv"
+    shutil.copy(src, copy)
+    assert cache.key(str(copy), PARSER_VERSION) == cache.key(src, PARSER_VERSION)
+    copy.write_text(copy.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+    assert cache.key(str(copy), PARSER_VERSION) != cache.key(src, PARSER_VERSION)
+
+
+def test_entries_hold_no_pickles_and_round_trip_mixed_columns(tmp_path):
+    cache = TableCache(str(tmp_path / "cache"))
+    table = StudentTable(4)
+    table.set_column("分数", [90.5, None, "缺考", 7])
+    table.set_column("学号", ["1", "2", "", "4"])
+    table.set_categorical("志愿选择", np.array([0, 1, 1, 2], dtype=np.int8), ["A", None, 3])
+    path = tmp_path / "in.csv"
+    path.write_text("x", encoding="utf-8")
+    cache.put(str(path), PARSER_VERSION, table)
+
+    (entry,) = [e for _, _, e in cache.entries()]
+    assert not [name for name in os.listdir(entry) if name.endswith(".pkl")]
+    loaded = cache.get(str(path), PARSER_VERSION)
+    assert loaded.to_records() == table.to_records()
+    assert [type(v) for v in loaded.column("分数").tolist()] == [float, type(None), str, int]
+
+    # Values JSON cannot hold exactly are not cached at all.
+    table.set_column("考试日期", [datetime.date(2024, 6, 7)] * 4)
+    other = tmp_path / "other.csv"
+    other.write_text("y", encoding="utf-8")
+    cache.put(str(other), PARSER_VERSION, table)
+    assert cache.get(str(other), PARSER_VERSION) is None
+    assert len(os.listdir(cache.directory)) == 1
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = TableCache(str(tmp_path / "cache"), max_bytes=10**9)
+    table = read_students(os.path.join(HERE, "test_sample.csv"))
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"{i}.csv"
+        path.write_text(str(i), encoding="utf-8")
+        paths.append(str(path))
+        cache.put(paths[-1], PARSER_VERSION, table)
+        os.utime(os.path.join(cache.directory, cache.key(paths[-1], PARSER_VERSION), "meta.json"), (i, i))
+    assert cache.get(paths[0], PARSER_VERSION) is not None  # touch: now most recent
+    # One byte over budget: only the least recently used entry goes.
+    cache.max_bytes = sum(size for _, size, _ in cache.entries()) - 1
+    cache.evict()
+    assert cache.get(paths[1], PARSER_VERSION) is None
+    assert cache.get(paths[0], PARSER_VERSION) is not None
+    assert cache.get(paths[2], PARSER_VERSION) is not None
+
+
+def test_shared_by_student_and_statistics_readers(monkeypatch):
+    xls = os.path.join(HERE, "example_students.xls")
+    assert read_excel(xls) == read_excel(xls) == _parse_excel(xls)
+    table = load_students(os.path.join(HERE, "test_sample.csv"))
+    assert len(table) == 15
+    monkeypatch.setenv("ADMISSION_CACHE", "0")
+    assert load_students(os.path.join(HERE, "test_sample.csv")).to_records() == table.to_records()
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import csv
+import json
+import queue
+import subprocess
+import sys
+
+from src.cli import main
+from src.core.preferences import PREFERENCE_MAPPING
+from src.gui.simple_main import admission_job
+from src.gui.workers import Job
+from src.utils.student_io import read_students
+
+QUOTA_ARGS = ["-q", "电子信息工程=4", "-q", "通信工程=4", "-q", "电磁场与无线技术=4"]
+
+
+def test_python_and_vectorized_engines_agree(tmp_path, capsys):
+    outputs = {}
+    for engine in ("python", "vectorized"):
+        out = tmp_path / f"{engine}.jsonl"
+        assert main(["tests/test_sample.csv", *QUOTA_ARGS, "--engine", engine, "-o", str(out)]) == 0
+        outputs[engine] = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert outputs["python"] == outputs["vectorized"]
+    assert len(outputs["python"]) == 15
+
+    summary = json.loads(capsys.readouterr().err.splitlines()[-1])
+    assert summary["total"] == 15 and summary["unassigned"] == 3
+    assert summary["remaining_quotas"] == {"电子信息工程": 0, "通信工程": 0, "电磁场与无线技术": 0}
+
+
+def test_csv_output_and_bad_quota(tmp_path, capsys):
+    out = tmp_path / "out.csv"
+    assert main(["tests/test_sample.csv", *QUOTA_ARGS, "-o", str(out), "--no-summary"]) == 0
+    with open(out, encoding="utf-8-sig") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["序号", "学号", "姓名", "分数", "志愿选择", "录取专业"] and len(rows) == 16
+    assert main(["tests/test_sample.csv", "-q", "通信工程"]) == 2
+    assert "专业=人数" in capsys.readouterr().err
+
+
+def test_cli_import_does_not_load_numpy():
+    code = "import sys, src.cli; print('numpy' in sys.modules, 'openpyxl' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.split() == ["False", "False"]
+
+
+def test_cli_breaks_rank_ties_like_the_gui(tmp_path):
+    # Two students share 排名 1 for one seat: the higher 分数 is admitted.
+    path = tmp_path / "tie.csv"
+    path.write_text(
+        "序号,排名,学号,姓名,分数,志愿选择\n1,1,S1,甲,80,A\n2,1,S2,乙,95,A\n", encoding="utf-8"
+    )
+    quotas = {"电子信息工程": 1, "通信工程": 0, "电磁场与无线技术": 0}
+    table, _, _ = admission_job(Job("录取", queue.Queue()), read_students(str(path)), None, quotas, PREFERENCE_MAPPING)
+    gui = dict(zip(table.column("学号").tolist(), table.column("录取专业").tolist()))
+    assert gui == {"S2": "电子信息工程", "S1": "未分配"}
+
+    quota_args = [arg for name, seats in quotas.items() for arg in ("-q", f"{name}={seats}")]
+    for engine in ("python", "vectorized"):
+        out = tmp_path / f"{engine}.jsonl"
+        assert main([str(path), *quota_args, "--engine", engine, "-o", str(out), "--no-summary"]) == 0
+        rows = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+        assert {r["学号"]: r["录取专业"] for r in rows} == gui
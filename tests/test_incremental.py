@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import random
+
+import pandas as pd
+
+from src.admission_algorithm import AdmissionAlgorithm
+from src.core.admission import assign_admissions
+from src.core.incremental import IncrementalAdmission
+from src.core.preferences import PREFERENCE_MAPPING
+from src.core.vectorized import assign_encoded, encode_students
+
+MAJORS = ["电子信息工程", "通信工程", "电磁场与无线技术"]
+
+
+def test_quota_edits_match_full_recompute():
+    rng = random.Random(3)
+    students = [
+        {"分数": rng.randint(0, 50), "志愿选择": rng.choice(list("ABCDEF") + ["", "Z"])}
+        for _ in range(500)
+    ]
+    cohort = encode_students(students, PREFERENCE_MAPPING)
+    engine = IncrementalAdmission(cohort, dict.fromkeys(MAJORS, 100), checkpoint_interval=16)
+    for _ in range(100):
+        quotas = {m: rng.randint(-1, 220) for m in MAJORS}
+        start = engine.update_quotas(quotas)
+        expected = assign_encoded(cohort, quotas)
+        assert engine.assigned.tolist() == expected.assigned.tolist()
+        assert engine.outcome.remaining_quotas == expected.remaining_quotas
+        assert engine.metrics == assign_admissions(students, quotas, PREFERENCE_MAPPING).metrics
+        assert 0 <= start <= len(cohort)
+
+
+def test_unchanged_quotas_replay_nothing():
+    students = [{"分数": i, "志愿选择": "A"} for i in range(10)]
+    cohort = encode_students(students, PREFERENCE_MAPPING)
+    quotas = {"电子信息工程": 3, "通信工程": 3, "电磁场与无线技术": 3}
+    engine = IncrementalAdmission(cohort, quotas)
+    assert engine.update_quotas(dict(quotas)) == len(cohort)
+    # Growing the last major to fill only affects students after its filler.
+    assert engine.update_quotas({**quotas, "电磁场与无线技术": 4}) == 9
+
+
+def test_admission_algorithm_reuses_cohort_across_quota_edits():
+    rng = random.Random(5)
+    frame = pd.DataFrame(
+        {
+            "学号": [str(i) for i in range(200)],
+            "排名": rng.sample(range(1, 201), 200),
+            "志愿选择": [rng.choice("ABCDEF") for _ in range(200)],
+        }
+    )
+    algo = AdmissionAlgorithm(dict.fromkeys(MAJORS, 50))
+    for quotas in ({m: 50 for m in MAJORS}, {MAJORS[0]: 10, MAJORS[1]: 80, MAJORS[2]: 70}):
+        algo.set_quotas(quotas)
+        actual = algo.process_admissions(frame)
+        rows = frame.sort_values("排名").to_dict(orient="records")
+        ref = assign_admissions(rows, quotas, PREFERENCE_MAPPING, score_key="排名", sort_desc=False)
+        pd.testing.assert_frame_equal(actual, pd.DataFrame(ref.students))
+        assert algo.get_remaining_quotas() == ref.remaining_quotas
+
+    # In-place edits to the cached frame are picked up, not replayed stale.
+    frame.loc[0, "志愿选择"] = "C"
+    frame.loc[3, "排名"] = 0
+    frame.loc[5, "学号"] = "x"
+    algo.set_quotas(quotas)
+    fresh = AdmissionAlgorithm(quotas)
+    pd.testing.assert_frame_equal(algo.process_admissions(frame), fresh.process_admissions(frame))
+    assert algo.get_remaining_quotas() == fresh.get_remaining_quotas()
+
+
+def test_assign_column_labels_frame_in_place_order_without_copying():
+    rng = random.Random(9)
+    frame = pd.DataFrame(
+        {
+            "学号": [f"s{i}" for i in range(300)],
+            "排名": [rng.randint(1, 60) for _ in range(300)],
+            "志愿选择": [rng.choice(list("ABCDEF") + ["", None, "z"]) for _ in range(300)],
+        },
+        index=range(1000, 1300),
+    )
+    before = frame.copy()
+    quotas = {MAJORS[0]: 40, MAJORS[1]: 90, MAJORS[2]: 60}
+    algo = AdmissionAlgorithm(quotas)
+    column = algo.assign_column(frame)
+    pd.testing.assert_frame_equal(frame, before)
+    assert column.index.equals(frame.index) and column.dtype == "category"
+
+    # Ties on 排名 keep the frame's row order, as in assign_admissions.
+    rows = frame.to_dict(orient="records")
+    ref = assign_admissions(rows, quotas, PREFERENCE_MAPPING, score_key="排名", sort_desc=False)
+    expected = {s["学号"]: s["录取专业"] for s in ref.students}
+    assert column.tolist() == frame["学号"].map(expected).tolist()
+    assert algo.metrics == ref.metrics
+
+    # Calls in a row do not use up each other's seats.
+    remaining = algo.get_remaining_quotas()
+    pd.testing.assert_series_equal(algo.assign_column(frame), column)
+    assert algo.get_remaining_quotas() == remaining == ref.remaining_quotas
+    plain = algo.assign_column(frame, categorical=False)
+    assert plain.dtype != "category" and plain.tolist() == column.tolist()
+
+
+def test_assign_column_sees_in_place_edits_between_calls():
+    rng = random.Random(12)
+    frame = pd.DataFrame(
+        {
+            "学号": [f"s{i}" for i in range(200)],
+            "排名": [rng.randint(1, 80) for _ in range(200)],
+            "志愿选择": [rng.choice("ABCDEF") for _ in range(200)],
+        }
+    )
+    quotas = {MAJORS[0]: 30, MAJORS[1]: 60, MAJORS[2]: 40}
+    algo = AdmissionAlgorithm(quotas)
+    algo.assign_column(frame)
+    for row in range(5):
+        frame.loc[row, "志愿选择"] = "C"
+        frame.loc[row + 10, "排名"] = 0
+        fresh = AdmissionAlgorithm(quotas)
+        pd.testing.assert_series_equal(algo.assign_column(frame), fresh.assign_column(frame))
+        assert algo.get_remaining_quotas() == fresh.get_remaining_quotas()
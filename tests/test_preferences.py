@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import json
+import random
+
+import pytest
+
+from src.core.admission import assign_admissions
+from src.core.preferences import (
+    PREFERENCE_MAPPING,
+    OpenMajors,
+    PreferenceError,
+    PreferenceTable,
+)
+from src.core.vectorized import assign_admissions_vectorized
+
+
+def test_table_compiles_builtin_mapping():
+    table = PreferenceTable(PREFERENCE_MAPPING)
+    assert dict(table) == PREFERENCE_MAPPING
+    assert table.majors == ("电子信息工程", "通信工程", "电磁场与无线技术")
+    assert table["C"] == ["电磁场与无线技术", "电子信息工程", "通信工程"]
+    assert table.depth == 3
+
+
+@pytest.mark.parametrize(
+    "mapping, majors",
+    [
+        ({"a": ["X"]}, None),
+        ({"A": []}, None),
+        ({"A": ["X", "X"]}, None),
+        ({"A": ["X", "Y"]}, ["X"]),
+    ],
+)
+def test_invalid_mappings_are_rejected(mapping, majors):
+    with pytest.raises(PreferenceError):
+        PreferenceTable(mapping, majors)
+
+
+def test_open_majors_tracks_first_open_in_quota_order():
+    remaining = {"X": 1, "Y": 0, "Z": 2}
+    tracker = OpenMajors(remaining)
+    assert tracker.first_open() == "X"
+    tracker.take("X")
+    assert tracker.first_open() == "Z" and not tracker.is_open("Y")
+    tracker.take("Z")
+    tracker.take("Z")
+    assert not tracker and tracker.first_open() is None
+    assert remaining == {"X": 0, "Y": 0, "Z": 0}
+
+
+def test_many_majors_from_config(tmp_path):
+    rng = random.Random(2)
+    majors = [f"专业{i:02d}" for i in range(24)]
+    prefs = {f"P{i}": rng.sample(majors, 5) for i in range(40)}
+    path = tmp_path / "prefs.json"
+    path.write_text(json.dumps({"majors": majors, "preferences": prefs}), encoding="utf-8")
+    table = PreferenceTable.from_config(str(path))
+    assert len(table.majors) == 24 and table.depth == 5
+
+    students = [
+        {"分数": rng.randint(0, 100), "志愿选择": rng.choice(list(prefs) + ["", "BAD"])}
+        for _ in range(2000)
+    ]
+    quotas = {m: rng.randint(0, 90) for m in majors}
+    expected = assign_admissions(students, quotas, table)
+    assert assign_admissions(students, quotas, prefs) == expected
+    assert assign_admissions_vectorized(students, quotas, table) == expected
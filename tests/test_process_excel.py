@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+
+from src.utils.process_excel import (
+    process_data,
+    read_excel,
+    summarize,
+    summarize_many,
+    write_report,
+)
+
+HEADER = ["学号", "选课选项", "成绩", "名次", "最终结果"]
+COHORT = [
+    ["U001", "A", 95.0, 1, "电信"],
+    ["U002", "C", 90.0, 2, "通信"],
+    ["U003", "E", 85.0, 3, "电磁"],
+    ["U004", "B", 80.0, 4, "通信(调剂)"],
+    ["U005", "X", 75.0, 5, "电磁(调剂)"],
+]
+
+
+def _workbook(path, sheets):
+    wb = Workbook()
+    wb.remove(wb.active)
+    for title, rows in sheets.items():
+        ws = wb.create_sheet(title)
+        for row in [HEADER, *rows]:
+            ws.append(row)
+    wb.save(path)
+    return path
+
+
+def test_process_data_matches_row_loop():
+    blanks = [
+        {"第一志愿": "数学", "第二志愿": "", "第三志愿": None},
+        {"第一志愿": None, "第二志愿": "计算机", "第三志愿": "数学"},
+    ]
+    for data in (read_excel("tests/example_students.xls"), blanks):
+        # The original loop: every level counted, blank cells under "".
+        expected = {}
+        for row in data:
+            for key, level in (("first", "第一志愿"), ("second", "第二志愿"), ("third", "第三志愿")):
+                major = row[level] if row[level] is not None else ""
+                counts = expected.setdefault(major, {"first": 0, "second": 0, "third": 0})
+                counts[key] += 1
+        actual = process_data(data)
+        assert actual == expected and list(actual) == list(expected)
+
+
+def test_process_data_without_students_is_empty():
+    assert process_data([]) == {}
+    assert process_data(iter([])) == {}
+    assert process_data(pd.DataFrame(columns=["学号", "志愿选择"])) == {}
+    assert process_data(pd.DataFrame(columns=["学号"])) == {}
+
+
+def test_summarize_bands_and_admitted():
+    records = [dict(zip(HEADER, row)) for row in COHORT]
+    report = summarize(records, n_bands=5)
+
+    overview = report["概况"]["人数"]
+    assert overview["总人数"] == 5
+    assert overview["无效志愿"] == 1
+    assert overview["调剂录取"] == 2
+
+    demand = report["志愿需求"]
+    assert demand["总人数"].sum() == 4 * 3  # the invalid code expands to nothing
+    bands = report["排名段×第一志愿"]
+    assert bands.to_numpy().sum() == 4
+    assert bands.loc["0%-20%"].sum() == 1  # rank 1 alone in the top band
+
+    admitted = report["第一志愿×录取专业"]
+    assert admitted.loc["无效志愿", "电磁(调剂)"] == 1
+    assert admitted.to_numpy().sum() == 5
+
+    # 所属专业 is the student's current major, not an admission result.
+    current = [{k: v for k, v in r.items() if k != "最终结果"} | {"所属专业": "电信"} for r in records]
+    assert "第一志愿×录取专业" not in summarize(current)
+
+
+def test_summarize_many_sheets_and_files_in_parallel(tmp_path):
+    book = _workbook(tmp_path / "历年.xlsx", {"2022": COHORT[:3], "2023": COHORT})
+    single = _workbook(tmp_path / "2024.xlsx", {"Sheet": COHORT[1:]})
+
+    reports = summarize_many([str(book), str(single)], max_workers=2)
+    assert list(reports) == ["历年-2022", "历年-2023", "2024"]
+    assert reports["历年-2022"]["概况"]["人数"]["总人数"] == 3
+    serial = summarize_many([str(book), str(single)], max_workers=1)
+    for name, report in reports.items():
+        pd.testing.assert_frame_equal(report["志愿需求"], serial[name]["志愿需求"])
+
+    out = tmp_path / "统计.xlsx"
+    write_report(reports, out)
+    sheets = load_workbook(out, read_only=True).sheetnames
+    assert sheets[0] == "历年第一志愿需求"
+    assert "历年-2023-志愿需求" in sheets
+    assert all(len(name) <= 31 for name in sheets)
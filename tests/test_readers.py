@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import csv
+import json
+
+import pytest
+import xlwt
+from openpyxl import Workbook
+
+from src.cli import main
+from src.utils.readers import detect_encoding, get_reader, ingest_folder, map_headers
+from src.utils.student_io import iter_student_rows, read_csv_students, table_from_rows
+
+# Same roster, columns in a different order and under alias headers.
+HEADER = ["学生姓名", "学号", "选课选项", "成绩", "名次", "最终结果"]
+ROWS = [
+    ["张三", "U001", "a", 90.5, 1, "电信"],
+    ["李四", "U002", "C", 88.0, 2, "电信"],
+]
+
+
+def _write(path, header, rows):
+    ext = path.suffix
+    if ext == ".csv":
+        with open(path, "w", encoding="utf-8-sig", newline="") as f:
+            csv.writer(f).writerows([header, *rows])
+    elif ext == ".xlsx":
+        wb = Workbook()
+        for row in [header, *rows]:
+            wb.active.append(row)
+        wb.save(path)
+    else:
+        wb = xlwt.Workbook()
+        ws = wb.add_sheet("名单")
+        for r, row in enumerate([header, *rows]):
+            for c, value in enumerate(row):
+                ws.write(r, c, value)
+        wb.save(str(path))
+    return str(path)
+
+
+def test_columns_are_found_by_header_in_every_format(tmp_path):
+    results = {}
+    for ext in (".csv", ".xlsx", ".xls"):
+        path = _write(tmp_path / f"roster{ext}", HEADER, ROWS)
+        results[ext] = [(r[2], r[3], r[4], r[5], r[6]) for r in iter_student_rows(path)]
+    expected = [("U001", "张三", 90.5, "A", "电信"), ("U002", "李四", 88.0, "C", "电信")]
+    assert results[".csv"] == results[".xlsx"] == results[".xls"] == expected
+    # 序号 falls back to the rank column when absent.
+    assert next(iter_student_rows(str(tmp_path / "roster.xlsx")))[:2] == (1, 1)
+
+
+def test_missing_required_column_and_unknown_format():
+    with pytest.raises(ValueError, match="志愿选择"):
+        map_headers(["学号", "分数", "姓名"])
+    with pytest.raises(ValueError, match="不支持"):
+        get_reader("roster.pdf")
+
+
+def test_ingest_folder_merges_and_deduplicates(tmp_path, monkeypatch):
+    # Called from a GUI worker thread: no child processes.
+    monkeypatch.setattr("concurrent.futures.ProcessPoolExecutor", None)
+    _write(tmp_path / "1班.csv", HEADER, ROWS)
+    _write(tmp_path / "2班.xlsx", HEADER, [["王五", "U003", "E", 85.0, 3, "电信"], ROWS[0]])
+    _write(tmp_path / "3班.xls", HEADER, [["李四", "U002", "D", 88.0, 2, "电信"]])
+    _write(tmp_path / "坏文件.csv", ["姓名", "学号"], [["赵六", "U004"]])
+    (tmp_path / "说明.txt").write_text("ignored", encoding="utf-8")
+
+    table, report = ingest_folder(str(tmp_path), max_workers=2)
+
+    assert table.column("学号").tolist() == ["U001", "U002", "U003"]
+    assert table[1]["志愿选择"] == "C"  # the first file wins
+    assert sorted(d[0] for d in report.duplicates) == ["U001", "U002"]
+    assert [d[0] for d in report.conflicts] == ["U002"]
+    assert list(report.errors) == [str(tmp_path / "坏文件.csv")]
+    assert sum(report.files.values()) == 5
+    # Ranks are recomputed over the merged cohort; 序号 is renumbered.
+    assert table.column("排名").tolist() == [1, 2, 3]
+    assert table.column("序号").tolist() == [1, 2, 3]
+
+
+def test_merged_folder_is_admitted_by_score_not_class_rank(tmp_path, capsys):
+    header = ["序号", "学号", "姓名", "分数", "志愿选择"]
+    _write(tmp_path / "A班.csv", header, [[1, "A1", "甲", 60, "A"], [2, "A2", "乙", 50, "E"]])
+    _write(tmp_path / "B班.csv", header, [[1, "B1", "丙", 99, "E"], [2, "B2", "丁", 98, "A"]])
+    table, _ = ingest_folder(str(tmp_path), max_workers=1)
+    assert table.column("排名").tolist() == [3, 4, 1, 2]
+
+    out = tmp_path / "out.jsonl"
+    argv = [str(tmp_path), "-q", "电子信息工程=1", "-q", "通信工程=1", "-o", str(out), "--no-summary"]
+    assert main(argv) == 0
+    rows = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    admitted = {r["学号"]: r["录取专业"] for r in rows}
+    assert admitted["B1"] == "通信工程" and admitted["B2"] == "电子信息工程"
+    assert admitted["A1"] == admitted["A2"] == "未分配"
+
+
+def test_gbk_csv_chunked_reader_matches_row_reader(tmp_path):
+    path = tmp_path / "gbk.csv"
+    lines = ["名次,学号,学生姓名,成绩,选课选项,备注", "1,0001,张三,90.5,a,", "2,0002,李四,88", ",,,,,",
+             "3,0003,王五,85,e,多余,列", "4,0004,赵六,80,B,"]
+    path.write_bytes(("\r\n".join(lines) + "\r\n").encode("gbk"))
+    assert detect_encoding(str(path)) == "gb18030"
+
+    progress = []
+    fast = read_csv_students(str(path), chunk_size=2, progress=lambda done, _: progress.append(done))
+    slow = table_from_rows(iter_student_rows(str(path)))
+    for column in fast.columns:
+        assert fast.column(column).tolist() == slow.column(column).tolist(), column
+    assert fast.column("学号").tolist() == ["0001", "0002", "0003", "0004"]
+    assert fast.column("排名").dtype.kind == "i" and fast.column("分数").dtype.kind == "f"
+    assert fast.codes("志愿选择")[1] == ["A", "", "E", "B"]
+    assert progress == [2, 3, 4]
+
+
+def test_chunked_reader_rejects_blank_score(tmp_path):
+    path = tmp_path / "bad.csv"
+    path.write_text("学号,分数,志愿选择\nU1,90,A\nU2,,B\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="第 3 行"):
+        read_csv_students(str(path))
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import csv
+
+import pytest
+from openpyxl import load_workbook
+
+from src.bench.synthetic import CohortProfile, cohort_quotas, generate_cohort
+from src.core.preferences import PREFERENCE_MAPPING
+from src.core.result_diff import (
+    ADDED,
+    MISSING_ID,
+    MOVED,
+    NEWLY_ADMITTED,
+    NEWLY_UNASSIGNED,
+    REMOVED,
+    STATUS_CHANGED,
+    ResultIndex,
+    diff_results,
+)
+from src.core.vectorized import assign_admissions_vectorized
+from src.utils.student_io import export_diff, export_results, read_results
+
+
+def test_changes_are_classified_by_student_id():
+    before = [
+        {"学号": 1001.0, "姓名": "甲", "录取专业": "通信工程"},
+        {"学号": "1002", "姓名": "乙", "录取专业": "未分配"},
+        {"学号": "1003", "姓名": "丙", "录取专业": "电子信息工程"},
+        {"学号": "1004", "姓名": "丁", "录取专业": "通信工程"},
+        {"学号": "1005", "姓名": "戊", "录取专业": "未分配"},
+        {"学号": "1006", "姓名": "己", "录取专业": "通信工程"},
+        {"学号": "1007", "姓名": "庚", "录取专业": "通信工程"},
+    ]
+    after = [
+        {"学号": " 1001 ", "姓名": "甲", "录取专业": "通信工程(调剂)"},
+        {"学号": "1002", "姓名": "乙", "录取专业": "电子信息工程"},
+        {"学号": "1003", "姓名": "丙", "录取专业": "未分配"},
+        {"学号": "1005", "姓名": "戊", "录取专业": "无效志愿"},
+        {"学号": "1006", "姓名": "己", "录取专业": "通信工程"},
+        {"学号": "1007", "姓名": "庚", "录取专业": "电子信息工程"},
+        {"学号": "1008", "姓名": "辛", "录取专业": "电子信息工程"},
+    ]
+    diff = diff_results(before, after)
+    assert diff.moved == ["1001", "1007"]
+    assert diff.newly_admitted == ["1002"] and diff.newly_unassigned == ["1003"]
+    assert diff.ids(STATUS_CHANGED) == ["1005"]
+    assert diff.ids(ADDED) == ["1008"] and diff.ids(REMOVED) == ["1004"]
+    assert diff.unchanged == 1
+    assert diff.major_counts == {"通信工程": (4, 2), "电子信息工程": (1, 3)}
+    assert diff.major_deltas == {"通信工程": -2, "电子信息工程": 2}
+    assert ("1004", "丁", REMOVED, "通信工程", "") in list(diff.rows())
+    assert ("1002", "乙", NEWLY_ADMITTED, "未分配", "电子信息工程") in list(diff.rows())
+    assert "新录取：1 人" in diff.summary()
+
+
+def test_rows_without_student_id_are_listed_apart():
+    before = [
+        {"学号": "", "姓名": "甲", "录取专业": "通信工程"},
+        {"学号": "1002", "姓名": "乙", "录取专业": "未分配"},
+        {"学号": None, "姓名": "丙", "录取专业": "未分配"},
+    ]
+    after = [
+        {"学号": " ", "姓名": "丁", "录取专业": "电子信息工程"},
+        {"学号": "1002", "姓名": "乙", "录取专业": "未分配"},
+        {"学号": float("nan"), "姓名": "戊", "录取专业": "通信工程"},
+    ]
+    diff = diff_results(before, after)
+    # Not matched to each other, so neither a move nor an added/removed student.
+    assert diff.counts()[MISSING_ID] == 4 and len(diff) == 4
+    assert diff.unchanged == 1
+    assert [row[1:] for row in diff.rows()] == [
+        ("丁", MISSING_ID, "", "电子信息工程"),
+        ("戊", MISSING_ID, "", "通信工程"),
+        ("甲", MISSING_ID, "通信工程", ""),
+        ("丙", MISSING_ID, "未分配", ""),
+    ]
+    assert diff.major_counts == {"通信工程": (1, 1), "电子信息工程": (0, 1)}
+
+
+def test_saved_baseline_diffs_against_later_runs(tmp_path):
+    profile = CohortProfile(n=3000, seed=2)
+    table = generate_cohort(profile)
+    quotas = cohort_quotas(profile)
+    kwargs = dict(score_key="排名", sort_desc=False)
+    first = assign_admissions_vectorized(table, quotas, PREFERENCE_MAPPING, **kwargs)
+    tighter = {m: q - 100 for m, q in quotas.items()}
+    second = assign_admissions_vectorized(table, tighter, PREFERENCE_MAPPING, **kwargs)
+    expected = diff_results(first, second)
+    assert len(expected.newly_unassigned) + len(expected.moved) > 0
+    assert sum(expected.major_deltas.values()) == -300
+
+    for ext in (".xlsx", ".csv"):
+        path = str(tmp_path / f"baseline{ext}")
+        export_results(first.students, path)
+        baseline = ResultIndex(read_results(path))
+        diff = baseline.diff(second)
+        assert list(diff.rows()) == list(expected.rows())
+        assert baseline.diff(first).unchanged == len(table)
+
+    out = tmp_path / "diff.xlsx"
+    export_diff(expected, str(out))
+    wb = load_workbook(out, read_only=True)
+    assert wb.sheetnames == ["结果对比", "专业人数"]
+    assert sum(1 for _ in wb["结果对比"].iter_rows()) == len(expected) + 1
+    wb.close()
+    export_diff(expected, str(tmp_path / "diff.csv"))
+    with open(tmp_path / "diff.csv", encoding="utf-8-sig", newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["学号", "姓名", "变动", "原结果", "新结果"] and len(rows) == len(expected) + 1
+    assert {r[2] for r in rows[1:]} <= {MOVED, NEWLY_UNASSIGNED, NEWLY_ADMITTED}
+
+
+def test_reading_a_roster_as_results_is_rejected(tmp_path):
+    path = tmp_path / "roster.csv"
+    path.write_text("学号,姓名,分数,志愿选择\n1,甲,90,A\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="录取专业"):
+        read_results(str(path))
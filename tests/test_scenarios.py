@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import random
+
+from src.core.admission import (
+    ADJUST_SUFFIX,
+    INVALID_CHOICE_LABEL,
+    TIE_BREAK_KEYS,
+    UNASSIGNED_LABEL,
+    assign_admissions,
+)
+from src.core.preferences import PREFERENCE_MAPPING
+from src.core.scenarios import sweep_quotas
+
+MAJORS = ["电子信息工程", "通信工程", "电磁场与无线技术"]
+
+
+def test_sweep_matches_individual_runs():
+    rng = random.Random(11)
+    students = [
+        {"分数": rng.randint(0, 100), "志愿选择": rng.choice(list("ABCDEF") + ["", "Z"])}
+        for _ in range(300)
+    ]
+    vectors = [{m: rng.randint(0, 120) for m in MAJORS} for _ in range(12)]
+    summaries = sweep_quotas(students, vectors, PREFERENCE_MAPPING, max_workers=2)
+
+    assert [s.quotas for s in summaries] == vectors
+    for quotas, summary in zip(vectors, summaries):
+        _check(summary, assign_admissions(students, quotas, PREFERENCE_MAPPING).students)
+
+
+def test_sweep_breaks_rank_ties_like_a_real_run():
+    rng = random.Random(12)
+    students = [
+        {
+            "学号": f"U{rng.randint(0, 999):03d}",
+            "排名": rng.randint(1, 30),
+            "分数": rng.randint(60, 70),
+            "志愿选择": rng.choice("ABCDEF"),
+        }
+        for _ in range(200)
+    ]
+    vectors = [{m: rng.randint(10, 80) for m in MAJORS} for _ in range(6)]
+    kwargs = dict(score_key="排名", sort_desc=False)
+    summaries = sweep_quotas(students, vectors, PREFERENCE_MAPPING, max_workers=2, **kwargs)
+    for quotas, summary in zip(vectors, summaries):
+        ref = assign_admissions(students, quotas, PREFERENCE_MAPPING, tie_break=TIE_BREAK_KEYS, **kwargs)
+        _check(summary, ref.students)
+
+
+def _check(summary, ref):
+    labels = [s["录取专业"] for s in ref]
+    assert summary.unassigned == labels.count(UNASSIGNED_LABEL)
+    assert summary.invalid == labels.count(INVALID_CHOICE_LABEL)
+    for m in MAJORS:
+        assert summary.admitted[m] == labels.count(m)
+        assert summary.adjusted[m] == labels.count(m + ADJUST_SUFFIX)
+        placed = [i + 1 for i, label in enumerate(labels) if label in (m, m + ADJUST_SUFFIX)]
+        assert summary.cutoff_ranks[m] == (placed[-1] if placed else None)
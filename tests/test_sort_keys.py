@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import random
+
+import numpy as np
+
+from src.core.admission import TIE_BREAK_KEYS, assign_admissions
+from src.core.preferences import PREFERENCE_MAPPING
+from src.core.sort_keys import prepare_sort_keys, sort_order
+from src.core.student_table import StudentTable
+from src.core.vectorized import assign_admissions_vectorized
+
+
+def test_sort_order_is_a_stable_sort_for_every_key_shape():
+    rng = np.random.default_rng(5)
+    cases = [
+        rng.permutation(5000).astype(np.float64),  # distinct ranks: counting sort
+        rng.integers(0, 300, 5000).astype(np.float64),  # tied ranks: radix sort
+        rng.integers(-(10**8), 10**8, 5000).astype(np.float64),  # wide range, two radix passes
+        np.round(rng.normal(80, 5, 5000), 1),  # fractional scores: comparison sort
+        np.empty(0),
+    ]
+    for keys in cases:
+        for desc in (False, True):
+            expected = sorted(range(len(keys)), key=keys.tolist().__getitem__, reverse=desc)
+            assert sort_order(keys, sort_desc=desc).tolist() == expected
+
+
+def test_ties_broken_by_score_then_student_id():
+    table = StudentTable.from_columns(
+        {
+            "学号": np.array(["s3", "s1", " s2", "s4", "s0"], dtype=object),
+            "排名": np.array([2, 2, 2, 1, 2]),
+            "分数": np.array([90.0, 90.0, 90.0, 50.0, 95.0]),
+            "志愿选择": np.array(["A"] * 5, dtype=object),
+        }
+    )
+    keys = prepare_sort_keys(table, score_key="排名", sort_desc=False, tie_break=TIE_BREAK_KEYS)
+    assert table.column("学号")[keys.order()].tolist() == ["s4", "s0", "s1", " s2", "s3"]
+    # Without tie-breakers equal ranks keep their input order.
+    plain = prepare_sort_keys(table, score_key="排名", sort_desc=False)
+    assert plain.order().tolist() == [3, 0, 1, 2, 4]
+
+
+def test_engines_agree_with_tie_breakers():
+    rng = random.Random(11)
+    for _ in range(100):
+        n = rng.randint(0, 80)
+        students = [
+            {
+                "学号": rng.choice([str(rng.randint(0, 40)), rng.randint(0, 40), float(rng.randint(0, 40)), None]),
+                "排名": rng.randint(1, 10),
+                "分数": rng.choice([rng.randint(60, 63), "x", None]),
+                "志愿选择": rng.choice("ABCDEF"),
+            }
+            for _ in range(n)
+        ]
+        quotas = {"电子信息工程": rng.randint(0, 20), "通信工程": rng.randint(0, 20), "电磁场与无线技术": 10}
+        kwargs = dict(score_key="排名", sort_desc=False, tie_break=TIE_BREAK_KEYS)
+        expected = assign_admissions(students, quotas, PREFERENCE_MAPPING, **kwargs)
+        assert assign_admissions_vectorized(students, quotas, PREFERENCE_MAPPING, **kwargs) == expected
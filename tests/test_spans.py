@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import json
+import logging
+
+import numpy as np
+import pytest
+
+from src.core import spans
+from src.core.admission import assign_admissions
+from src.core.preferences import PREFERENCE_MAPPING
+from src.core.spans import span
+from src.utils.log_queue import span_file_handler, start_queue_logging
+
+
+@pytest.fixture(autouse=True)
+def _spans_disabled_afterwards():
+    yield
+    spans.disable()
+
+
+def test_disabled_spans_are_shared_no_ops():
+    assert spans.get_recorder() is None
+    with span("import") as s:
+        s.set_rows(10)
+    assert span("a") is span("b")
+
+
+def test_spans_record_rows_and_nested_peak_memory():
+    recorder = spans.enable(trace_memory=True)
+    with span("outer") as outer:
+        with span("inner", rows=3):
+            block = np.ones(1 << 20)  # 8 MB
+            del block
+        outer.set_rows(5)
+    inner, outer = recorder.latest("inner"), recorder.latest("outer")
+    assert inner.rows == 3 and outer.rows == 5
+    assert inner.peak_bytes >= 8 << 20 and outer.peak_bytes >= inner.peak_bytes
+    assert outer.seconds >= inner.seconds > 0
+
+    students = [{"学号": str(i), "分数": i, "志愿选择": "A"} for i in range(20)]
+    assign_admissions(students, {"电子信息工程": 5}, PREFERENCE_MAPPING)
+    assert recorder.latest("sort").rows == 20 and recorder.latest("assign").rows == 20
+
+
+def test_span_records_reach_json_lines_log_through_queue(tmp_path):
+    root = logging.getLogger()
+    saved = (root.handlers[:], root.level)
+    path = tmp_path / "spans.jsonl"
+    listener = start_queue_logging([span_file_handler(str(path))])
+    try:
+        spans.enable()
+        logging.info("not a span")
+        with span("export", rows=7):
+            pass
+    finally:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+        root.handlers[:], root.level = saved
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 1
+    record = json.loads(lines[0])
+    assert record["name"] == "export" and record["rows"] == 7 and record["peak_bytes"] is None
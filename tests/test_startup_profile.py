@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+from src.utils.startup_profile import ImportTimer
+
+
+def test_timer_records_first_import_only():
+    sys.modules.pop("xml.dom.minidom", None)
+    timer = ImportTimer().install()
+    try:
+        import xml.dom.minidom  # noqa: F401
+        import xml.dom.minidom  # noqa: F401,F811
+    finally:
+        timer.uninstall()
+    timer.mark("done")
+    assert "xml.dom.minidom" in timer.records
+    cumulative, own = timer.records["xml.dom.minidom"]
+    assert cumulative >= own > 0
+    report = timer.report()
+    assert "xml.dom.minidom" in report and "done:" in report
+
+
+def test_gui_module_defers_heavy_imports():
+    code = (
+        "import sys, src.gui.simple_main; "
+        "print([m for m in ('numpy', 'PIL', 'openpyxl', 'xlrd') if m in sys.modules])"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
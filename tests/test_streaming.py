@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import os
+import random
+
+from src.core.admission import TIE_BREAK_KEYS, assign_admissions
+from src.core.preferences import PREFERENCE_MAPPING
+from src.core.streaming import assign_admissions_stream, external_sort
+
+QUOTAS = {"电子信息工程": 40, "通信工程": 35, "电磁场与无线技术": 30}
+
+
+def _students(n: int):
+    rng = random.Random(9)
+    return [
+        {"学号": str(i), "分数": rng.randint(0, 30), "志愿选择": rng.choice("ABCDEF ")}
+        for i in range(n)
+    ]
+
+
+def test_external_sort_spills_and_matches_reference(tmp_path):
+    students = _students(250)
+    expected = assign_admissions(students, QUOTAS, PREFERENCE_MAPPING)
+
+    stream = assign_admissions_stream(
+        iter(students), QUOTAS, PREFERENCE_MAPPING, chunk_size=16, spill_dir=str(tmp_path)
+    )
+    assert list(stream) == expected.students
+    assert stream.remaining_quotas == expected.remaining_quotas
+    assert stream.metrics == expected.metrics
+    assert os.listdir(tmp_path) == []
+
+
+def test_presorted_input_is_consumed_lazily():
+    students = sorted(_students(50), key=lambda s: -s["分数"])
+    consumed = []
+
+    def source():
+        for s in students:
+            consumed.append(s["学号"])
+            yield s
+
+    stream = iter(assign_admissions_stream(source(), QUOTAS, PREFERENCE_MAPPING, presorted=True))
+    first = next(stream)
+    assert first["学号"] == students[0]["学号"]
+    assert len(consumed) == 1
+
+
+def test_external_sort_ascending_is_stable():
+    rows = [{"排名": r, "id": i} for i, r in enumerate([3, 1, 2, 1, 3])]
+    ordered = list(external_sort(rows, score_key="排名", sort_desc=False, chunk_size=2))
+    assert [r["id"] for r in ordered] == [1, 3, 2, 0, 4]
+
+
+def test_external_sort_applies_tie_breakers_across_spills(tmp_path):
+    rng = random.Random(4)
+    students = [
+        {
+            "学号": rng.choice([str(rng.randint(0, 99)), rng.randint(0, 99), float(rng.randint(0, 99))]),
+            "排名": rng.randint(1, 20),
+            "分数": rng.choice([rng.randint(60, 62), None]),
+            "志愿选择": rng.choice("ABCDEF"),
+        }
+        for _ in range(300)
+    ]
+    for tie_break in (TIE_BREAK_KEYS, (("分数", False), ("学号", True))):
+        kwargs = dict(score_key="排名", sort_desc=False, tie_break=tie_break)
+        expected = assign_admissions(students, QUOTAS, PREFERENCE_MAPPING, **kwargs)
+        stream = assign_admissions_stream(
+            iter(students), QUOTAS, PREFERENCE_MAPPING, chunk_size=16, spill_dir=str(tmp_path), **kwargs
+        )
+        assert list(stream) == expected.students
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import os
+import random
+import sys
+
+import numpy as np
+
+from src.core.admission import assign_admissions
+from src.core.preferences import PREFERENCE_MAPPING
+from src.core.student_table import StudentTable
+from src.core.vectorized import assign_admissions_vectorized
+from src.utils.student_io import read_students
+
+HERE = os.path.dirname(__file__)
+
+
+def _records(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [
+        {
+            "序号": i + 1,
+            "学号": f"U2023{i:06d}",
+            "姓名": f"学生{i}",
+            "分数": round(rng.uniform(60, 100), 1),
+            "志愿选择": rng.choice("ABCDEFZ"),
+            "专业": "电子信息类",
+        }
+        for i in range(n)
+    ]
+
+
+def test_rows_behave_like_records():
+    records = _records(20)
+    table = StudentTable.from_records(records)
+    assert len(table) == 20
+    assert table.to_records() == records
+    assert dict(table[3]) == records[3]
+    assert table[-1]["学号"] == records[-1]["学号"]
+    assert table[0].get("录取专业") is None
+
+
+def test_engine_accepts_table_directly():
+    records = _records(300, seed=4)
+    table = StudentTable.from_records(records)
+    quotas = {"电子信息工程": 90, "通信工程": 80, "电磁场与无线技术": 70}
+    expected = assign_admissions(records, quotas, PREFERENCE_MAPPING)
+    # Rows are mappings, so the reference engine still accepts a table ...
+    assert assign_admissions(table, quotas, PREFERENCE_MAPPING) == expected
+    # ... and the array engine reads the columns without per-row objects.
+    result = assign_admissions_vectorized(table, quotas, PREFERENCE_MAPPING)
+    assert isinstance(result.students, StudentTable)
+    assert result.students.to_records() == expected.students
+    assert result.remaining_quotas == expected.remaining_quotas
+
+
+def test_table_is_several_times_smaller_than_dicts():
+    records = _records(20000)
+    dict_bytes = sum(
+        sys.getsizeof(r) + sum(sys.getsizeof(v) for v in r.values()) for r in records
+    )
+    assert StudentTable.from_records(records).nbytes() * 2.5 < dict_bytes
+
+
+def test_read_csv_into_table():
+    table = read_students(os.path.join(HERE, "test_sample.csv"))
+    assert table.is_categorical("志愿选择")
+    assert table[0]["学号"] == "U202314001"
+    assert table[0]["分数"] == 94.5
+    assert table[0]["排名"] == 1
+    assert table.column("排名").dtype == np.int64
+
+
+def test_read_xlsx_streams_in_chunks(tmp_path):
+    from openpyxl import Workbook
+
+    from src.utils.student_io import iter_student_chunks
+
+    path = str(tmp_path / "students.xlsx")
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(["排名", "学号", "姓名", "班级", "成绩", "是否选课", "选课选项", "最终结果"])
+    for i in range(25):
+        ws.append([i + 1, f"U{i:04d}", f"学生{i}", "电信2307", 90 - i, 1, "abcdef"[i % 6], "电信"])
+    ws.append([None] * 8)  # trailing blank row left by Excel formatting
+    wb.save(path)
+
+    chunks = list(iter_student_chunks(path, chunk_size=10))
+    assert [len(c) for c in chunks] == [10, 10, 5]
+    assert chunks[0][1] == (2, 2, "U0001", "学生1", 89.0, "B", "电信")
+    table = read_students(path)
+    assert len(table) == 25 and table[24]["志愿选择"] == "A"
+
+
+def test_streamed_xlsx_export_sizes_columns(tmp_path):
+    from openpyxl import load_workbook
+
+    from src.utils.student_io import EXPORT_HEADERS, export_results_xlsx, write_rows_xlsx
+
+    table = StudentTable.from_records(_records(50, seed=2))
+    table.set_column("录取专业", ["通信工程(调剂)"] * 49 + ["电磁场与无线技术"])
+    export_results_xlsx(table, str(tmp_path / "table.xlsx"))
+    # A one-shot generator goes through the spill-and-replay path.
+    rows = (tuple(r.get(h, "") for h in EXPORT_HEADERS) for r in table)
+    write_rows_xlsx(rows, str(tmp_path / "rows.xlsx"))
+
+    for name in ("table.xlsx", "rows.xlsx"):
+        ws = load_workbook(tmp_path / name).active
+        assert ws.max_row == 51
+        assert [c.value for c in ws[51]][-1] == "电磁场与无线技术"
+        assert ws.column_dimensions["B"].width == len("U2023000049") + 2
+        assert ws.column_dimensions["F"].width == len("电磁场与无线技术") + 2
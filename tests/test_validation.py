@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import csv
+import queue
+
+import pytest
+
+from src.cli import main
+from src.core.preferences import PREFERENCE_MAPPING
+from src.core.validation import ERROR, REPORT_HEADERS, WARNING, has_values, validate_table
+from src.gui.simple_main import admission_job, load_students_job
+from src.gui.workers import Job
+from src.utils.student_io import (
+    LENIENT_COLUMNS,
+    export_validation_report,
+    iter_student_rows,
+    read_csv_students,
+    read_students,
+    table_from_rows,
+)
+
+# Header is line 1; a blank line (5) is skipped but keeps the numbering.
+MESSY = [
+    "序号,学号,姓名,分数,排名,志愿选择",
+    "1,U001,张三,90,1,A",
+    "2,U002,,85,2,Z",
+    "3,U001,王五,abc,3,b",
+    "",
+    "5,,赵六,,x,",
+]
+
+EXPECTED = {
+    (3, "志愿代码无效", WARNING),
+    (3, "缺少姓名", WARNING),
+    (4, "学号重复", ERROR),
+    (4, "分数不是数字", ERROR),
+    (6, "缺少学号", ERROR),
+    (6, "缺少分数", ERROR),
+    (6, "排名不是数字", ERROR),
+    (6, "未填志愿（只参加调剂）", WARNING),
+}
+
+
+@pytest.fixture
+def messy_csv(tmp_path):
+    path = tmp_path / "messy.csv"
+    path.write_text("\n".join(MESSY) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def _found(report):
+    return {(i.row, i.problem, i.severity) for i in report.issues}
+
+
+def test_reports_every_problem_with_source_lines(messy_csv):
+    with pytest.raises(ValueError, match="第 4 行"):
+        read_students(messy_csv)
+
+    report = validate_table(read_students(messy_csv, strict=False), PREFERENCE_MAPPING)
+    assert _found(report) == EXPECTED
+    assert not report.ok and len(report.errors) == 5
+    duplicate = next(i for i in report.issues if i.problem == "学号重复")
+    assert duplicate.value == "U001" and duplicate.note == "首次出现于第 2 行"
+    assert "共 4 行：5 个错误，3 条提示" in report.summary()
+
+
+def test_fast_csv_and_row_reader_agree(messy_csv):
+    fast = validate_table(read_csv_students(messy_csv, strict=False), PREFERENCE_MAPPING)
+    rows = table_from_rows(iter_student_rows(messy_csv, strict=False), columns=LENIENT_COLUMNS)
+    slow = validate_table(rows, PREFERENCE_MAPPING)
+    assert fast.issues == slow.issues
+
+
+def test_clean_file_is_ok():
+    report = validate_table(read_students("tests/test_sample.csv", strict=False), PREFERENCE_MAPPING)
+    assert report.ok and report.issues == ()
+
+
+def test_export_and_cli_check(messy_csv, tmp_path, capsys):
+    out = tmp_path / "report.csv"
+    report = validate_table(read_students(messy_csv, strict=False), PREFERENCE_MAPPING)
+    export_validation_report(report, str(out))
+    with open(out, encoding="utf-8-sig") as f:
+        rows = list(csv.reader(f))
+    assert tuple(rows[0]) == REPORT_HEADERS and len(rows) == len(EXPECTED) + 1
+
+    xlsx = tmp_path / "report.xlsx"
+    assert main([messy_csv, "--check", "--report", str(xlsx)]) == 1
+    assert xlsx.exists() and "学号重复" in capsys.readouterr().err
+    # Errors stop the admission run before quotas are even needed.
+    assert main([messy_csv, "--report", str(xlsx), "-q", "通信工程=1"]) == 1
+    assert main(["tests/test_sample.csv", "--check"]) == 0
+
+
+def test_roster_without_rank_column_is_valid_and_ranked_by_score(tmp_path):
+    path = tmp_path / "unranked.csv"
+    path.write_text("学号,姓名,分数,志愿选择\nU1,甲,80,A\nU2,乙,95,A\nU3,丙,70,E\n", encoding="utf-8")
+    job = Job("导入", queue.Queue())
+    table, report = load_students_job(job, str(path))
+    assert report.ok and report.issues == ()
+    rows = table_from_rows(iter_student_rows(str(path), strict=False), columns=LENIENT_COLUMNS)
+    assert validate_table(rows, PREFERENCE_MAPPING).ok
+    assert main([str(path), "--check"]) == 0
+
+    # The importers add an all-blank 排名 column; admission sorts by 分数.
+    assert "排名" in table and not has_values(table, "排名")
+    quotas = {"电子信息工程": 1, "通信工程": 1, "电磁场与无线技术": 0}
+    result, _, metrics = admission_job(job, table, None, quotas, PREFERENCE_MAPPING)
+    assert result.column("学号").tolist() == ["U2", "U1", "U3"]
+    assert metrics.cutoffs["电子信息工程"][0] == 95.0
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import random
+
+from src.core.admission import assign_admissions
+from src.core.preferences import PREFERENCE_MAPPING
+from src.core.vectorized import (
+    OUTCOME_INVALID,
+    OUTCOME_UNASSIGNED,
+    assign_admissions_vectorized,
+    assign_encoded,
+    encode_students,
+)
+
+
+def _random_students(rng: random.Random, n: int):
+    choices = list("ABCDEF") + ["a", " b ", "", None, "Z", "AB"]
+    scores = [None, "x", "", "88.5", " 70 "]
+    students = []
+    for i in range(n):
+        score = rng.choice(scores) if rng.random() < 0.1 else rng.randint(0, 20)
+        students.append({"学号": str(i), "分数": score, "志愿选择": rng.choice(choices)})
+    return students
+
+
+def test_matches_reference_engine_on_random_cohorts():
+    rng = random.Random(7)
+    for _ in range(200):
+        students = _random_students(rng, rng.randint(0, 60))
+        quotas = {
+            "电子信息工程": rng.randint(-1, 15),
+            "通信工程": rng.randint(0, 15),
+            "电磁场与无线技术": rng.randint(0, 15),
+        }
+        for sort_desc in (True, False):
+            expected = assign_admissions(students, quotas, PREFERENCE_MAPPING, sort_desc=sort_desc)
+            actual = assign_admissions_vectorized(
+                students, quotas, PREFERENCE_MAPPING, sort_desc=sort_desc
+            )
+            assert actual == expected
+
+
+def test_bucket_and_scan_methods_agree():
+    rng = random.Random(21)
+    for _ in range(100):
+        students = _random_students(rng, rng.randint(0, 200))
+        cohort = encode_students(students, PREFERENCE_MAPPING)
+        quotas = {m: rng.randint(0, 80) for m in ("通信工程", "电子信息工程", "电磁场与无线技术")}
+        buckets = assign_encoded(cohort, quotas, method="buckets")
+        scan = assign_encoded(cohort, quotas, method="scan")
+        assert buckets.assigned.tolist() == scan.assigned.tolist()
+        assert buckets.remaining_quotas == scan.remaining_quotas
+
+
+def test_extra_quota_major_only_reachable_by_adjustment():
+    students = [{"学号": str(i), "分数": 10 - i, "志愿选择": "A"} for i in range(3)]
+    quotas = {"其他专业": 5, "电子信息工程": 1, "通信工程": 0}
+    expected = assign_admissions(students, quotas, PREFERENCE_MAPPING)
+    assert assign_admissions_vectorized(students, quotas, PREFERENCE_MAPPING) == expected
+    assert expected.students[1]["录取专业"] == "其他专业(调剂)"
+
+
+def test_encoded_outcome_codes():
+    students = [
+        {"分数": 3, "志愿选择": "A"},
+        {"分数": 2, "志愿选择": "Q"},
+        {"分数": 1, "志愿选择": "A"},
+    ]
+    cohort = encode_students(students, PREFERENCE_MAPPING)
+    outcome = assign_encoded(cohort, {"电子信息工程": 1, "通信工程": 0, "电磁场与无线技术": 0})
+    assert outcome.assigned.tolist() == [0, OUTCOME_INVALID, OUTCOME_UNASSIGNED]
+    assert outcome.remaining_quotas == {"电子信息工程": 0, "通信工程": 0, "电磁场与无线技术": 0}
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from src.core.student_table import StudentTable
+from src.gui.virtual_table import TableModel, column_order
+
+COLUMNS = ("序号", "学号", "分数", "录取专业")
+
+
+def _table():
+    table = StudentTable.from_columns(
+        {
+            "序号": ["1", "2", "10", "3"],
+            "学号": ["U3", "U1", "U4", "U2"],
+            "分数": [80.0, 95.5, 80.0, 60.0],
+        }
+    )
+    table.set_categorical("录取专业", [1, 0, 1, 2], ["通信工程", "电子信息工程", "未分配"])
+    return table
+
+
+def test_window_rows_follow_sort_order():
+    model = TableModel(COLUMNS)
+    model.set_table(_table())
+    assert model.rows(1, 3) == [("2", "U1", 95.5, "通信工程"), ("10", "U4", 80.0, "电子信息工程")]
+    assert model.rows(3, 50) == [("3", "U2", 60.0, "未分配")]
+
+    # Numeric strings sort by value, not lexicographically.
+    model.sort("序号")
+    assert [r[0] for r in model.rows(0, 4)] == ["1", "2", "3", "10"]
+    # Descending keeps ties in table order.
+    model.sort("分数", descending=True)
+    assert [r[1] for r in model.rows(0, 4)] == ["U1", "U3", "U4", "U2"]
+    model.sort("录取专业")
+    assert [r[3] for r in model.rows(0, 4)] == ["未分配", "电子信息工程", "电子信息工程", "通信工程"]
+
+
+def test_new_results_keep_current_sort():
+    model = TableModel(COLUMNS)
+    model.set_table(_table())
+    model.sort("学号", descending=True)
+    updated = _table()
+    updated.set_categorical("录取专业", [0, 0, 0, 0], ["通信工程"])
+    model.set_table(updated)
+    assert model.sort_column == "学号" and model.sort_desc
+    assert model.rows(0, 1) == [("10", "U4", 80.0, "通信工程")]
+    model.set_table(None)
+    assert len(model) == 0 and model.rows(0, 10) == []
+
+
+def test_orders_are_cached_per_column_data():
+    model = TableModel(COLUMNS)
+    table = _table()
+    model.set_table(table)
+    model.sort("学号")
+    ascending = model.order
+    model.sort("学号", descending=True)
+    assert [r[1] for r in model.rows(0, 4)] == ["U4", "U3", "U2", "U1"]
+    model.sort("学号")
+    assert model.order is ascending
+
+    # New results sharing the 学号 array keep its cached orders.
+    updated = table.take(range(4))
+    updated.set_column("学号", table.column("学号"))
+    updated.set_categorical("录取专业", [0, 0, 1, 1], ["未分配", "通信工程"])
+    model.set_table(updated)
+    assert model.order is ascending
+    assert model.cached_order("录取专业", False) is None
+
+    # An order computed for data that has since been replaced is not used.
+    source, ranks = model.sort_input("分数")
+    assert ranks is None
+    ranks, order = column_order(source, True)
+    rescored = _table()
+    rescored.set_column("分数", [60.0, 80.0, 95.5, 80.0])
+    model.set_table(rescored)
+    model.apply_order("分数", True, source, ranks, order)
+    assert model.sort_column == "分数" and model.sort_desc
+    assert [r[1] for r in model.rows(0, 4)] == ["U4", "U1", "U2", "U3"]
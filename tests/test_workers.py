@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from src.core.preferences import PREFERENCE_MAPPING
+from src.core.student_table import StudentTable
+from src.gui.simple_main import admission_job
+from src.gui.workers import BackgroundRunner
+
+
+class FakeRoot:
+    """Stands in for ``tk.Tk``: collects ``after`` callbacks for the test to pump."""
+
+    def __init__(self):
+        self.pending = []
+
+    def after(self, ms, callback):
+        self.pending.append(callback)
+
+    def pump(self, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while self.pending:
+            assert time.monotonic() < deadline, "job did not finish"
+            callback = self.pending.pop(0)
+            callback()
+            time.sleep(0.001)
+
+
+def test_job_reports_progress_and_result_on_poll():
+    root, busy, events = FakeRoot(), [], []
+    runner = BackgroundRunner(root, on_busy=busy.append)
+
+    def work(job, n):
+        for i in range(n):
+            job.report(i + 1, n, f"{i + 1}/{n}")
+        return n * 2
+
+    runner.submit(
+        "double", work, 3,
+        on_done=lambda result: events.append(("done", result)),
+        on_progress=lambda done, total, message: events.append(("progress", done, total)),
+    )
+    assert runner.busy
+    with pytest.raises(RuntimeError):
+        runner.submit("second", work, 1)
+    root.pump()
+    assert events[-1] == ("done", 6)
+    assert all(e[0] == "progress" for e in events[:-1])
+    assert busy == [True, False] and not runner.busy
+
+
+def test_cancel_and_error_reach_main_thread_callbacks():
+    root, events = FakeRoot(), []
+    runner = BackgroundRunner(root)
+    started = threading.Event()
+
+    def slow(job):
+        started.set()
+        while True:
+            job.check_cancelled()
+            time.sleep(0.001)
+
+    runner.submit("slow", slow, on_cancel=lambda: events.append("cancelled"))
+    started.wait(5)
+    runner.cancel()
+    root.pump()
+
+    def broken(job):
+        raise ValueError("bad file")
+
+    runner.submit("broken", broken, on_error=lambda exc, tb: events.append(str(exc)))
+    root.pump()
+    assert events == ["cancelled", "bad file"]
+
+
+def test_quota_rerun_leaves_the_displayed_table_untouched():
+    root = FakeRoot()
+    runner = BackgroundRunner(root)
+    table = StudentTable.from_records(
+        [{"学号": f"s{i}", "排名": i + 1, "志愿选择": "ABCDEF"[i % 6]} for i in range(30)]
+    )
+    results = []
+
+    def admit(data, engine, seats):
+        quotas = dict.fromkeys(["电子信息工程", "通信工程", "电磁场与无线技术"], seats)
+        runner.submit("录取", admission_job, data, engine, quotas, PREFERENCE_MAPPING, on_done=results.append)
+        root.pump()
+        return results[-1]
+
+    shown, engine, _ = admit(table, None, 10)
+    labels = shown.column("录取专业").tolist()
+    rerun, _, metrics = admit(shown, engine, 5)
+    # The worker labels a copy; the table the view renders keeps its labels.
+    assert rerun is not shown and shown.column("录取专业").tolist() == labels
+    assert rerun.column("学号") is shown.column("学号")
+    assert rerun.column("录取专业").tolist().count("未分配") == metrics.unassigned == 15